@@ -0,0 +1,171 @@
+"""Admission control for the web app's scoring routes.
+
+Preprocessing and vectorization cost grows with the text, and the Flask
+server starts a thread per request, so without limits a burst of requests
+or one huge paste can pin every worker and queue latency grows without
+bound. The pieces here keep tail latency bounded under overload:
+
+- `TokenBucketLimiter` rate-limits each client (HTTP 429 with Retry-After).
+- `ConcurrencyLimiter` caps requests computing at once and how many may
+  wait for a slot; the rest are turned away at once (HTTP 503) instead of
+  queueing.
+- `Deadline` tracks a request's compute budget, so work that can no longer
+  finish in time is cut short with a partial or timeout response.
+- `split_text` and `combine_chunk_results` score very long articles as a
+  bounded number of chunks and aggregate their probabilities.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+_TRAILING_WORD = re.compile(r'\S*\Z')
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilled at `rate` tokens per second up to `burst`"""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._clock = clock
+        # client -> (tokens, last refill time); least recently seen first
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def acquire(self, client: Hashable, cost: float = 1) -> float:
+        """Take `cost` tokens; returns 0 if allowed, else seconds until they are available"""
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+                self.allowed += 1
+            else:
+                wait = (cost - tokens) / self.rate
+                self.rejected += 1
+            self._buckets[client] = (tokens, now)
+            # Forgotten clients come back with a full bucket, which only errs towards allowing
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {'allowed': self.allowed, 'rejected': self.rejected, 'clients': len(self._buckets)}
+
+
+class ConcurrencyLimiter:
+    """Admit at most `max_active` requests at once, with up to `max_waiting` queued"""
+
+    def __init__(self, max_active: int, max_waiting: int = 0):
+        if max_active <= 0 or max_waiting < 0:
+            raise ValueError("max_active must be positive and max_waiting non-negative")
+
+        self.max_active = max_active
+        self.max_waiting = max_waiting
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take a slot, waiting up to `timeout` seconds; False if the request must be shed"""
+        with self._condition:
+            if self.active < self.max_active:
+                self.active += 1
+                return True
+            if self.waiting >= self.max_waiting:
+                self.rejected += 1
+                return False
+
+            self.waiting += 1
+            try:
+                if not self._condition.wait_for(lambda: self.active < self.max_active, timeout):
+                    self.timed_out += 1
+                    return False
+                self.active += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                'active': self.active,
+                'waiting': self.waiting,
+                'max_active': self.max_active,
+                'max_waiting': self.max_waiting,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+            }
+
+
+class Deadline:
+    """A point in time by which a request's work should be done; None means no deadline"""
+
+    __slots__ = ('expires_at', '_clock')
+
+    def __init__(self, seconds: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and self._clock() >= self.expires_at
+
+
+def split_text(text: str, chunk_chars: int, max_chunks: int) -> Tuple[List[str], bool]:
+    """Split a text into chunks of at most chunk_chars, breaking between words.
+
+    Returns at most max_chunks chunks and whether the rest was truncated.
+    """
+    chunks = []
+    start = 0
+    while start < len(text) and len(chunks) < max_chunks:
+        end = start + chunk_chars
+        if end < len(text) and not text[end].isspace():
+            # Back up to the start of the word that straddles the boundary
+            word = _TRAILING_WORD.search(text, start, end)
+            if word.start() > start:
+                end = word.start()
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    truncated = bool(text[start:].strip())
+    return chunks, truncated
+
+
+def combine_chunk_results(results: Sequence[Dict[str, any]], weights: Sequence[float]) -> Dict[str, any]:
+    """Aggregate chunk predictions into one, averaging probabilities weighted by chunk length"""
+    total = float(sum(weights))
+    probability_fake = sum(result['probability_fake'] * weight for result, weight in zip(results, weights)) / total
+    combined = dict(results[0])
+    combined.update({
+        'is_fake': probability_fake > 0.5,
+        'confidence': max(probability_fake, 1.0 - probability_fake),
+        'probability_fake': probability_fake,
+        'probability_real': 1.0 - probability_fake
+    })
+    return combined
@@ -0,0 +1,228 @@
+import itertools
+import json
+import random
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Sample news database for fallback
+SAMPLE_NEWS = [
+    {"title": "Climate Change: New Report Shows Rising Sea Levels", "description": "Scientists warn about accelerating climate change impacts on coastal regions", "source": "Climate News"},
+    {"title": "Tech Giants Report Record Quarterly Earnings", "description": "Major technology companies exceed analyst expectations", "source": "Business News"},
+    {"title": "World Health Organization Updates Health Guidelines", "description": "New recommendations for public health safety", "source": "Health News"},
+    {"title": "Scientists Discover New Deep Sea Species", "description": "Marine biologists find previously unknown fish species in Pacific Ocean", "source": "Science Daily"},
+    {"title": "Global Markets React to Economic Policy Changes", "description": "Stock markets show mixed reactions to new policies", "source": "Financial Times"},
+    {"title": "BREAKING: Scientists Find Miracle Cure for Cancer", "description": "Revolutionary treatment discovered in common household item", "source": "Unknown Source"},
+    {"title": "Aliens Have Landed in Major City", "description": "Government officials confirm extraterrestrial contact", "source": "Unverified News"},
+    {"title": "Government Admits to Secret Weather Control Program", "description": "Documents reveal hidden weather manipulation project", "source": "Conspiracy News"},
+    {"title": "New Study Proves Eating Chocolate Makes You Smarter", "description": "Researchers claim chocolate improves cognitive function", "source": "Health Blog"},
+    {"title": "Time Travel Now Possible Say Scientists", "description": "Quantum physics breakthrough enables time travel", "source": "Tech Speculation"},
+    {"title": "International Space Station Conducts New Experiments", "description": "Astronauts work on cutting-edge research in microgravity", "source": "NASA News"},
+    {"title": "Local School District Implements New Education Program", "description": "STEM curriculum to be introduced in elementary schools", "source": "Education News"},
+]
+
+MAX_SEARCH_RESULTS = 12
+
+# /explain returns this many contributing n-grams by default, at most MAX_EXPLAIN_TERMS
+DEFAULT_EXPLAIN_TERMS = 10
+MAX_EXPLAIN_TERMS = 100
+
+# /batch-analyze is limited by request body size, not by number of texts
+MAX_BATCH_BYTES = 16 * 1024 * 1024
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+class RequestError(Exception):
+    """Invalid client request, reported as {'error': message} with a 4xx status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def parse_analyze_request(data) -> str:
+    """Validate an /analyze payload and return the text to score"""
+    if not data or 'text' not in data:
+        raise RequestError('No text provided')
+
+    text = data['text'].strip()
+
+    if not text:
+        raise RequestError('Empty text provided')
+
+    if len(text) < 10:
+        raise RequestError('Text is too short for analysis (minimum 10 characters)')
+
+    return text
+
+
+def parse_explain_request(data) -> Tuple[str, int]:
+    """Validate an /explain payload and return the text and number of terms"""
+    text = parse_analyze_request(data)
+    top_k = data.get('top_k', DEFAULT_EXPLAIN_TERMS)
+
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_EXPLAIN_TERMS:
+        raise RequestError(f'top_k must be an integer between 1 and {MAX_EXPLAIN_TERMS}')
+
+    return text, top_k
+
+
+def parse_search_request(data) -> str:
+    """Validate a /search-news payload and return the normalized query"""
+    if not data or 'query' not in data:
+        raise RequestError('No search query provided')
+
+    query = data['query'].strip().lower()
+
+    if not query:
+        raise RequestError('Empty search query')
+
+    return query
+
+
+def parse_batch_request(data) -> List[str]:
+    """Validate a /batch-analyze payload and return the non-blank texts"""
+    if not data or 'texts' not in data:
+        raise RequestError('No texts provided')
+
+    texts = data['texts']
+
+    if not isinstance(texts, list):
+        raise RequestError('Texts must be a list')
+
+    if not all(isinstance(text, str) for text in texts):
+        raise RequestError('Texts must be strings')
+
+    return [text for text in texts if text.strip()]
+
+
+def check_batch_size(content_length: Optional[int], max_bytes: int = MAX_BATCH_BYTES):
+    """Reject a /batch-analyze body that declares more than max_bytes"""
+    if content_length is not None and content_length > max_bytes:
+        raise RequestError(f'Request body exceeds {max_bytes} bytes', 413)
+
+
+def iter_ndjson_texts(stream: BinaryIO, max_bytes: int = MAX_BATCH_BYTES) -> Iterator[Tuple[Optional[str], str]]:
+    """Lazily parse an NDJSON /batch-analyze body into (id, text) pairs.
+
+    Each line is a JSON string or an object with a 'text' and an optional
+    'id' that is echoed back. Blank lines and blank texts are skipped.
+    Lines are read with a bounded readline(), so at most max_bytes + 1
+    bytes are buffered even if the body has no newlines.
+    """
+    total = 0
+    for number in itertools.count(1):
+        line = stream.readline(max_bytes - total + 1)
+        if not line:
+            return
+        total += len(line)
+        if total > max_bytes:
+            raise RequestError(f'Request body exceeds {max_bytes} bytes', 413)
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise RequestError(f'Line {number} is not valid JSON') from None
+        if isinstance(record, dict):
+            record_id, text = record.get('id'), record.get('text')
+        else:
+            record_id, text = None, record
+        if not isinstance(text, str):
+            raise RequestError(f"Line {number} has no 'text' string")
+
+        if text.strip():
+            yield record_id, text
+
+
+def select_news(query: str, results: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Fall back to sample news when upstream found nothing, then dedupe"""
+    # If no results from upstream, use sample news filtered by query
+    if not results:
+        for news in SAMPLE_NEWS:
+            if query in news['title'].lower() or query in news['description'].lower():
+                results.append({
+                    'title': news['title'],
+                    'description': news['description'],
+                    'url': '#',
+                    'source': news['source'],
+                    'published_at': ''
+                })
+
+        # If still no matches, return random sample news
+        if not results:
+            results = [
+                dict(news, url='#')
+                for news in random.sample(SAMPLE_NEWS, min(6, len(SAMPLE_NEWS)))
+            ]
+
+    # Remove duplicates
+    seen = set()
+    unique_results = []
+    for item in results:
+        title_lower = item['title'].lower().strip()
+        if title_lower and title_lower not in seen:
+            seen.add(title_lower)
+            unique_results.append(item)
+
+    return unique_results[:MAX_SEARCH_RESULTS]
+
+
+def sample_news_items() -> List[Dict[str, str]]:
+    """SAMPLE_NEWS in the shape of upstream news items"""
+    return [dict(news, url='#', published_at='') for news in SAMPLE_NEWS]
+
+
+def news_item_text(item: Dict[str, str]) -> str:
+    """Text scored for a news item"""
+    return f"{item['title']} {item.get('description', '')}"
+
+
+def format_analysis(result: Dict[str, any]) -> Dict[str, any]:
+    """Format a detector prediction for the /analyze response"""
+    return {
+        'is_fake': result['is_fake'],
+        'label': 'FAKE NEWS' if result['is_fake'] else 'REAL NEWS',
+        'confidence': round(result['confidence'] * 100, 2),
+        'probability_fake': round(result['probability_fake'] * 100, 2),
+        'probability_real': round(result['probability_real'] * 100, 2)
+    }
+
+
+def format_explanation(result: Dict[str, any]) -> Dict[str, any]:
+    """Format a detector explanation for the /explain response"""
+    return {
+        **format_analysis(result),
+        'intercept': round(result['intercept'], 6),
+        # Positive contributions push towards FAKE NEWS, negative towards REAL NEWS
+        'top_terms': [
+            {
+                'term': item['term'],
+                'tfidf': round(item['tfidf'], 6),
+                'contribution': round(item['contribution'], 6)
+            }
+            for item in result['contributions']
+        ]
+    }
+
+
+def format_news_item(item: Dict[str, str], prediction: Dict[str, any]) -> Dict[str, any]:
+    """Format a scored news item for the /search-news response"""
+    return {
+        'title': item['title'],
+        'description': item.get('description', ''),
+        'source': item['source'],
+        'url': item['url'],
+        'published_at': item.get('published_at', ''),
+        **format_analysis(prediction)
+    }
+
+
+def format_batch_item(text: str, result: Dict[str, any]) -> Dict[str, any]:
+    """Format a scored text for the /batch-analyze response"""
+    return {
+        'text': text[:100] + '...' if len(text) > 100 else text,
+        'is_fake': result['is_fake'],
+        'label': 'FAKE NEWS' if result['is_fake'] else 'REAL NEWS',
+        'confidence': round(result['confidence'] * 100, 2)
+    }
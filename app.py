@@ -1,44 +1,392 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import hmac
+import json
+import math
 import sys
 import os
-import requests
-from urllib.parse import quote_plus
 import time
-import random
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from api_common import (
+    MAX_BATCH_BYTES, MAX_SEARCH_RESULTS, NDJSON_MIMETYPE, RequestError, check_batch_size,
+    format_analysis, format_batch_item, format_explanation, format_news_item,
+    iter_ndjson_texts, news_item_text, parse_analyze_request, parse_batch_request,
+    parse_explain_request, parse_search_request, sample_news_items, select_news
+)
+from admission import ConcurrencyLimiter, Deadline, TokenBucketLimiter, combine_chunk_results, split_text
+from corpus_io import chunked
 from fake_news_detector import FakeNewsDetector
+from metrics import CONTENT_TYPE, SIZE_BUCKETS, MetricFamily, MetricsRegistry
+from micro_batching import MicroBatcher, QueueFullError
+from model_registry import ModelRegistry
+from near_duplicates import NearDuplicateIndex
+from news_sources import FixtureNewsSource, HackerNewsSource, NewsFetcher
+from trending import TrendingRefresher, TrendingStore
 
 app = Flask(__name__)
 
-# Sample news database for fallback
-SAMPLE_NEWS = [
-    {"title": "Climate Change: New Report Shows Rising Sea Levels", "description": "Scientists warn about accelerating climate change impacts on coastal regions", "source": "Climate News"},
-    {"title": "Tech Giants Report Record Quarterly Earnings", "description": "Major technology companies exceed analyst expectations", "source": "Business News"},
-    {"title": "World Health Organization Updates Health Guidelines", "description": "New recommendations for public health safety", "source": "Health News"},
-    {"title": "Scientists Discover New Deep Sea Species", "description": "Marine biologists find previously unknown fish species in Pacific Ocean", "source": "Science Daily"},
-    {"title": "Global Markets React to Economic Policy Changes", "description": "Stock markets show mixed reactions to new policies", "source": "Financial Times"},
-    {"title": "BREAKING: Scientists Find Miracle Cure for Cancer", "description": "Revolutionary treatment discovered in common household item", "source": "Unknown Source"},
-    {"title": "Aliens Have Landed in Major City", "description": "Government officials confirm extraterrestrial contact", "source": "Unverified News"},
-    {"title": "Government Admits to Secret Weather Control Program", "description": "Documents reveal hidden weather manipulation project", "source": "Conspiracy News"},
-    {"title": "New Study Proves Eating Chocolate Makes You Smarter", "description": "Researchers claim chocolate improves cognitive function", "source": "Health Blog"},
-    {"title": "Time Travel Now Possible Say Scientists", "description": "Quantum physics breakthrough enables time travel", "source": "Tech Speculation"},
-    {"title": "International Space Station Conducts New Experiments", "description": "Astronauts work on cutting-edge research in microgravity", "source": "NASA News"},
-    {"title": "Local School District Implements New Education Program", "description": "STEM curriculum to be introduced in elementary schools", "source": "Education News"},
-]
-
-# Initialize the fake news detector with pre-trained model
-detector = FakeNewsDetector()
+# Request, stage and batch-size metrics for GET /metrics; METRICS_ENABLED=0
+# turns off the timing hooks (scrape-time collectors cost nothing anyway)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+metrics = MetricsRegistry()
+request_count = metrics.counter(
+    'fake_news_http_requests_total', 'HTTP requests by route, method and status', ('route', 'method', 'status')
+)
+request_latency = metrics.histogram(
+    'fake_news_http_request_duration_seconds', 'HTTP request latency by route', ('route',)
+)
+stage_latency = metrics.histogram(
+    'fake_news_stage_duration_seconds',
+    'Latency of preprocess, cache_lookup, transform, predict_proba, explain, upstream_fetch and serialize',
+    ('stage',)
+)
+rejected_requests = metrics.counter(
+    'fake_news_rejected_requests_total',
+    'Requests turned away by admission control (too_large, rate_limited, busy, deadline)', ('reason',)
+)
+batch_sizes = metrics.histogram(
+    'fake_news_batch_size', 'Texts per detector predict_batch call', buckets=SIZE_BUCKETS
+)
+stage_observer = (lambda stage, seconds: stage_latency.observe(seconds, stage)) if METRICS_ENABLED else None
+
+# Model artifacts; the memory-mapped bundle is preferred when present
+# (compiled artifacts skip sklearn entirely)
+COMPILED_MODEL_PATH = os.environ.get('COMPILED_MODEL_PATH')
+MODEL_BUNDLE_PATH = os.environ.get('MODEL_BUNDLE_PATH', 'fake_news_model.bundle')
+VECTORIZER_PATH = os.environ.get('VECTORIZER_PATH', 'vectorizer.pkl')
+MODEL_PATH = os.environ.get('MODEL_PATH', 'fake_news_model.pkl')
+
+
+def new_detector() -> FakeNewsDetector:
+    detector = FakeNewsDetector(
+        cache_size=int(os.environ.get('PREDICTION_CACHE_SIZE', 4096)),
+        cache_ttl=float(os.environ['PREDICTION_CACHE_TTL']) if os.environ.get('PREDICTION_CACHE_TTL') else None
+    )
+    detector.stage_observer = stage_observer
+    return detector
+
+
+def load_detector() -> FakeNewsDetector:
+    """Build a detector from the configured model artifacts"""
+    detector = new_detector()
+    if COMPILED_MODEL_PATH:
+        detector.load_compiled(COMPILED_MODEL_PATH)
+    elif os.path.isdir(MODEL_BUNDLE_PATH):
+        detector.load_model(MODEL_BUNDLE_PATH)
+    else:
+        detector.load_model(VECTORIZER_PATH, MODEL_PATH)
+    return detector
+
+
+# The registry owns the active detector and hot-swaps it when the artifacts
+# change (polled every MODEL_WATCH_INTERVAL seconds) or on POST /admin/reload
+model_registry = ModelRegistry(
+    load_detector,
+    # The pickle pair is watched as a unit so a deploy that copies one file
+    # at a time never pairs a new vectorizer with the old model
+    watch_paths=[paths for paths in (
+        COMPILED_MODEL_PATH, os.path.join(MODEL_BUNDLE_PATH, 'manifest.json'), (VECTORIZER_PATH, MODEL_PATH)
+    ) if paths],
+    poll_interval=float(os.environ.get('MODEL_WATCH_INTERVAL', 5)),
+    initial=new_detector()
+)
 
 # Load the pre-trained model
 try:
-    detector.load_model('vectorizer.pkl', 'fake_news_model.pkl')
+    model_registry.load()
     print("Model loaded successfully!")
 except Exception as e:
     print(f"Warning: Could not load pre-trained model: {e}")
     print("Using untrained model - predictions may not be accurate")
+model_registry.start_watching()
+
+
+def score_texts(texts, preprocessed=False):
+    """Score texts on the active model, tagging each result with its version"""
+    detector = model_registry.current
+    if METRICS_ENABLED:
+        batch_sizes.observe(len(texts))
+    results = detector.predict_processed(texts) if preprocessed else detector.predict_batch(texts)
+    for result in results:
+        result['model_version'] = detector.model_version
+    return results
+
+
+# Near-duplicate news items (syndicated copies with small edits) reuse the
+# verdict of the first copy scored; NEAR_DUPLICATE_MAX_ENTRIES=0 disables it
+NEAR_DUPLICATE_MAX_ENTRIES = int(os.environ.get('NEAR_DUPLICATE_MAX_ENTRIES', 10000))
+near_duplicates = NearDuplicateIndex(
+    max_entries=NEAR_DUPLICATE_MAX_ENTRIES,
+    threshold=float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0.7))
+) if NEAR_DUPLICATE_MAX_ENTRIES > 0 else None
+
+
+def score_news(texts):
+    """Score texts once per near-duplicate cluster, reusing earlier verdicts"""
+    if near_duplicates is None:
+        return score_texts(texts)
+    
+    detector = model_registry.current
+    processed_texts = list(detector.preprocess_many(texts))
+    return near_duplicates.score(processed_texts, lambda batch: score_texts(batch, preprocessed=True),
+                                 detector.model_version)
+
+
+# Upstream news sources for /search-news
+news_fetcher = NewsFetcher(
+    [HackerNewsSource(os.environ.get('HN_SEARCH_URL', 'https://hn.algolia.com/api/v1/search'))],
+    deadline=float(os.environ.get('NEWS_FETCH_DEADLINE', 5)),
+    cache_ttl=float(os.environ.get('NEWS_CACHE_TTL', 300))
+)
+
+# Trending stories (and the sample fallback news) are fetched and scored in
+# the background every TRENDING_REFRESH_INTERVAL seconds, so searches for
+# trending topics skip upstream calls and inference. Off by default so that
+# importing the app starts no threads and makes no network calls.
+# TRENDING_FIXTURE replaces the upstream with a local JSON list of items.
+TRENDING_REFRESH_INTERVAL = float(os.environ.get('TRENDING_REFRESH_INTERVAL', 0))
+trending_store = TrendingStore(
+    max_items=int(os.environ.get('TRENDING_MAX_ITEMS', 1000)),
+    max_age=float(os.environ.get('TRENDING_MAX_AGE', 900))
+)
+trending_fetcher = NewsFetcher(
+    [FixtureNewsSource(os.environ['TRENDING_FIXTURE'])], cache_size=0
+) if os.environ.get('TRENDING_FIXTURE') else news_fetcher
+trending_refresher = TrendingRefresher(
+    trending_fetcher.fetch_trending,
+    lambda items: score_news([news_item_text(item) for item in items]),
+    trending_store,
+    interval=TRENDING_REFRESH_INTERVAL,
+    fallback_items=sample_news_items()
+)
+trending_refresher.start()
+
+
+def score_news_items(items):
+    """Score news items, reusing verdicts precomputed for the same titles"""
+    model_version = model_registry.model_version
+    predictions = [trending_store.lookup(item['title'], model_version) for item in items]
+    missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+    if missing:
+        scored = score_news([news_item_text(items[i]) for i in missing])
+        for i, prediction in zip(missing, scored):
+            predictions[i] = prediction
+    return predictions
+
+
+# /batch-analyze limits: total request bytes, and texts scored per streamed chunk
+BATCH_MAX_BYTES = int(os.environ.get('BATCH_MAX_BYTES', MAX_BATCH_BYTES))
+BATCH_CHUNK_SIZE = int(os.environ.get('BATCH_CHUNK_SIZE', 128))
+
+# Optional micro-batching of concurrent /analyze requests
+micro_batcher = None
+if os.environ.get('MICROBATCH_ENABLED', '').lower() in ('1', 'true', 'yes'):
+    micro_batcher = MicroBatcher(
+        score_texts,
+        max_wait_ms=float(os.environ.get('MICROBATCH_MAX_WAIT_MS', 5)),
+        max_batch_size=int(os.environ.get('MICROBATCH_MAX_BATCH_SIZE', 32)),
+        max_queue=int(os.environ.get('MICROBATCH_MAX_QUEUE', 1024))
+    )
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that records response serialization time"""
+    
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            stage_latency.observe(time.perf_counter() - start, 'serialize')
+
+
+if METRICS_ENABLED:
+    app.json = TimedJSONProvider(app)
+    
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+    
+    @app.after_request
+    def record_request(response):
+        # Label by route pattern, not raw path, to keep label cardinality bounded
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(time.perf_counter() - g.request_start, route)
+        request_count.inc(route, request.method, str(response.status_code))
+        return response
+
+
+# Admission control for the scoring routes, so overload sheds requests
+# instead of growing queues: body size limits, chunked scoring of long
+# texts, per-client token buckets (RATE_LIMIT_PER_SEC=0 disables), a cap on
+# concurrently computing requests (MAX_CONCURRENT_REQUESTS=0 disables) and a
+# per-request compute deadline (REQUEST_DEADLINE_MS=0 disables)
+ADMITTED_ENDPOINTS = {'analyze', 'explain', 'search_news', 'batch_analyze'}
+MAX_REQUEST_BYTES = int(os.environ.get('MAX_REQUEST_BYTES', 1024 * 1024))
+TEXT_CHUNK_CHARS = int(os.environ.get('TEXT_CHUNK_CHARS', 10000))
+MAX_TEXT_CHUNKS = int(os.environ.get('MAX_TEXT_CHUNKS', 8))
+MAX_TEXT_CHARS = TEXT_CHUNK_CHARS * MAX_TEXT_CHUNKS
+REQUEST_DEADLINE = float(os.environ.get('REQUEST_DEADLINE_MS', 10000)) / 1000.0
+RATE_LIMIT_CLIENT_HEADER = os.environ.get('RATE_LIMIT_CLIENT_HEADER')
+
+rate_limiter = TokenBucketLimiter(
+    rate=float(os.environ['RATE_LIMIT_PER_SEC']),
+    burst=float(os.environ.get('RATE_LIMIT_BURST', 20))
+) if float(os.environ.get('RATE_LIMIT_PER_SEC', 0)) > 0 else None
+
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('MAX_CONCURRENT_REQUESTS', 2 * (os.cpu_count() or 1)))
+concurrency_limiter = ConcurrencyLimiter(
+    MAX_CONCURRENT_REQUESTS, int(os.environ.get('MAX_QUEUED_REQUESTS', 32))
+) if MAX_CONCURRENT_REQUESTS > 0 else None
+
+
+def reject(reason, message, status, retry_after=None):
+    rejected_requests.inc(reason)
+    response = jsonify({'error': message})
+    response.status_code = status
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+@app.before_request
+def admit_request():
+    """Apply size limits, rate limits and the concurrency cap to scoring routes"""
+    if request.endpoint not in ADMITTED_ENDPOINTS:
+        return None
+    
+    # /batch-analyze enforces BATCH_MAX_BYTES itself while streaming; other
+    # bodies are read here so oversized ones fail before any work is done.
+    # Werkzeug truncates bodies without a Content-Length at the limit instead
+    # of raising, so read one byte past it and check
+    if request.endpoint != 'batch_analyze':
+        request.max_content_length = MAX_REQUEST_BYTES + 1
+        if len(request.get_data(cache=True)) > MAX_REQUEST_BYTES:
+            return request_too_large(None)
+    
+    if rate_limiter is not None:
+        client = request.headers.get(RATE_LIMIT_CLIENT_HEADER) if RATE_LIMIT_CLIENT_HEADER else None
+        wait = rate_limiter.acquire(client or request.remote_addr)
+        if wait:
+            return reject('rate_limited', 'Rate limit exceeded, please retry later', 429, wait)
+    
+    g.deadline = Deadline(REQUEST_DEADLINE)
+    if concurrency_limiter is not None:
+        if not concurrency_limiter.acquire(timeout=g.deadline.remaining()):
+            return reject('busy', 'Server is busy, please retry shortly', 503, 1)
+        g.admitted = True
+    return None
+
+
+@app.teardown_request
+def release_admission(exc):
+    if g.pop('admitted', False):
+        concurrency_limiter.release()
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return reject('too_large', f'Request body exceeds {MAX_REQUEST_BYTES} bytes', 413)
+
+
+def check_deadline():
+    """Give up on a request whose compute deadline has passed"""
+    deadline = g.get('deadline')
+    if deadline is not None and deadline.expired():
+        rejected_requests.inc('deadline')
+        raise RequestError('Request deadline exceeded', 503)
+
+
+def deadline_remaining():
+    deadline = g.get('deadline')
+    return deadline.remaining() if deadline is not None else None
+
+
+def score_long_text(text):
+    """Score a text, splitting long ones into at most MAX_TEXT_CHUNKS chunks.
+
+    Returns the prediction and the number of chunks scored; chunk
+    probabilities are averaged, weighted by chunk length.
+    """
+    chunks, truncated = split_text(text, TEXT_CHUNK_CHARS, MAX_TEXT_CHUNKS)
+    check_deadline()
+    if len(chunks) == 1:
+        if micro_batcher is not None:
+            try:
+                result = micro_batcher.predict(chunks[0], timeout=deadline_remaining())
+            except FutureTimeoutError:
+                rejected_requests.inc('deadline')
+                raise RequestError('Request deadline exceeded', 503) from None
+        else:
+            result, = score_texts(chunks)
+    else:
+        result = combine_chunk_results(score_texts(chunks), [len(chunk) for chunk in chunks])
+    return result, len(chunks), truncated
+
+
+def collect_component_metrics():
+    """Read cache, upstream, batching and reload counters at scrape time"""
+    families = []
+    caches = [('prediction', model_registry.current.cache_stats())]
+    if near_duplicates is not None:
+        caches.append(('near_duplicate', near_duplicates.stats()))
+    if TRENDING_REFRESH_INTERVAL:
+        caches.append(('trending', trending_store.stats()))
+    if news_fetcher.cache is not None:
+        caches.append(('news', news_fetcher.cache.stats()))
+    for name, kind, help_text in (
+        ('hits', 'counter', 'Cache hits'),
+        ('misses', 'counter', 'Cache misses'),
+        ('evictions', 'counter', 'Cache evictions'),
+        ('size', 'gauge', 'Cached entries'),
+        ('hit_rate', 'gauge', 'Cache hit rate since start or last model load'),
+    ):
+        suffix = '_total' if kind == 'counter' else ''
+        families.append(MetricFamily(
+            f'fake_news_cache_{name}{suffix}', kind, help_text,
+            [({'cache': cache}, stats[name]) for cache, stats in caches if name in stats]
+        ))
+    
+    families.append(MetricFamily(
+        'fake_news_upstream_errors_total', 'counter', 'Failed or timed-out upstream news fetches',
+        [({'source': source}, count) for source, count in sorted(news_fetcher.errors.items())]
+    ))
+    
+    registry_stats = model_registry.stats()
+    families.append(MetricFamily('fake_news_model_reloads_total', 'counter', 'Successful model loads',
+                                 [({}, registry_stats['reloads'])]))
+    families.append(MetricFamily('fake_news_model_reload_errors_total', 'counter', 'Failed model loads',
+                                 [({}, registry_stats['reload_errors'])]))
+    
+    if TRENDING_REFRESH_INTERVAL:
+        families.append(MetricFamily('fake_news_trending_refreshes_total', 'counter',
+                                     'Completed trending story refreshes', [({}, trending_refresher.refreshes)]))
+        families.append(MetricFamily('fake_news_trending_refresh_errors_total', 'counter',
+                                     'Failed trending story refreshes', [({}, trending_refresher.refresh_errors)]))
+    
+    if concurrency_limiter is not None:
+        admission = concurrency_limiter.stats()
+        families.append(MetricFamily('fake_news_active_requests', 'gauge', 'Admitted requests being computed',
+                                     [({}, admission['active'])]))
+        families.append(MetricFamily('fake_news_waiting_requests', 'gauge', 'Requests waiting for a compute slot',
+                                     [({}, admission['waiting'])]))
+    
+    if micro_batcher is not None:
+        batching = micro_batcher.stats()
+        families.append(MetricFamily('fake_news_microbatch_queue_depth', 'gauge', 'Texts waiting to be batched',
+                                     [({}, batching['queue_depth'])]))
+        families.append(MetricFamily('fake_news_microbatch_rejected_total', 'counter',
+                                     'Requests rejected because the queue was full',
+                                     [({}, batching['rejected'])]))
+    return families
+
+
+metrics.register_collector(collect_component_metrics)
 
 
 @app.route('/')
@@ -47,40 +395,96 @@ def index():
     return render_template('index.html')
 
 
+@app.route('/stats')
+def stats():
+    """Report the active model version and prediction cache counters"""
+    return jsonify({
+        'model_version': model_registry.model_version,
+        'model_registry': model_registry.stats(),
+        'prediction_cache': model_registry.current.cache_stats(),
+        'near_duplicates': near_duplicates.stats() if near_duplicates is not None else None,
+        'trending': trending_refresher.stats() if TRENDING_REFRESH_INTERVAL else None,
+        'micro_batching': micro_batcher.stats() if micro_batcher is not None else None,
+        'admission': {
+            'rate_limit': rate_limiter.stats() if rate_limiter is not None else None,
+            'concurrency': concurrency_limiter.stats() if concurrency_limiter is not None else None
+        },
+        'latency': {
+            'requests': request_latency.summary(),
+            'stages': stage_latency.summary(),
+            'batch_size': batch_sizes.summary()
+        }
+    })
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Expose metrics in the Prometheus text format"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Load the model artifacts again in the background and swap them in"""
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    if not admin_token or not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'),
+                                                  admin_token.encode('utf-8')):
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    model_registry.reload_in_background()
+    return jsonify({
+        'success': True,
+        'status': 'reloading',
+        'model_version': model_registry.model_version
+    }), 202
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """Analyze text for fake news"""
     try:
-        data = request.get_json()
-        
-        if not data or 'text' not in data:
-            return jsonify({'error': 'No text provided'}), 400
+        text = parse_analyze_request(request.get_json())
         
-        text = data['text'].strip()
+        # Make prediction; long articles are scored as bounded chunks
+        result, chunks, truncated = score_long_text(text)
         
-        if not text:
-            return jsonify({'error': 'Empty text provided'}), 400
-        
-        if len(text) < 10:
-            return jsonify({'error': 'Text is too short for analysis (minimum 10 characters)'}), 400
+        return jsonify({
+            'success': True,
+            'model_version': result['model_version'],
+            'chunks': chunks,
+            'truncated': truncated,
+            'result': format_analysis(result)
+        })
+    
+    except RequestError as e:
+        return jsonify({'error': e.message}), e.status
+    except QueueFullError:
+        return jsonify({'error': 'Server is busy, please retry shortly'}), 429
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/explain', methods=['POST'])
+def explain():
+    """Analyze text and report the n-grams that drove the verdict"""
+    try:
+        text, top_k = parse_explain_request(request.get_json())
+        truncated = len(text) > MAX_TEXT_CHARS
+        check_deadline()
         
-        # Make prediction
-        result = detector.predict(text)
+        # Explanations are computed alongside the prediction, never cached
+        detector = model_registry.current
+        result = detector.explain(text[:MAX_TEXT_CHARS], top_k)
         
-        # Format response
-        response = {
+        return jsonify({
             'success': True,
-            'result': {
-                'is_fake': result['is_fake'],
-                'label': 'FAKE NEWS' if result['is_fake'] else 'REAL NEWS',
-                'confidence': round(result['confidence'] * 100, 2),
-                'probability_fake': round(result['probability_fake'] * 100, 2),
-                'probability_real': round(result['probability_real'] * 100, 2)
-            }
-        }
-        
-        return jsonify(response)
+            'model_version': detector.model_version,
+            'truncated': truncated,
+            'result': format_explanation(result)
+        })
     
+    except RequestError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -89,132 +493,117 @@ def analyze():
 def search_news():
     """Search news from multiple sources with fallback"""
     try:
-        data = request.get_json()
-        
-        if not data or 'query' not in data:
-            return jsonify({'error': 'No search query provided'}), 400
-        
-        query = data['query'].strip().lower()
-        
-        if not query:
-            return jsonify({'error': 'Empty search query'}), 400
-        
-        # Search results list
-        results = []
-        
-        # Try Hacker News API first (most reliable)
-        try:
-            url = f"https://hn.algolia.com/api/v1/search?query={quote_plus(query)}&tags=story&hitsPerPage=10"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers, timeout=5)
-            
-            if response.status_code == 200:
-                json_data = response.json()
-                hits = json_data.get('hits', [])
-                
-                for hit in hits:
-                    results.append({
-                        'title': hit.get('title', '')[:200],
-                        'description': f"Points: {hit.get('points', 0)} | By: {hit.get('author', 'unknown')}",
-                        'url': hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"),
-                        'source': 'Hacker News',
-                        'published_at': ''
-                    })
-        except Exception as e:
-            print(f"HN Error: {e}")
+        query = parse_search_request(request.get_json())
         
-        # If no results from HN, use sample news filtered by query
-        if not results:
-            for news in SAMPLE_NEWS:
-                if query in news['title'].lower() or query in news['description'].lower():
-                    results.append({
-                        'title': news['title'],
-                        'description': news['description'],
-                        'url': '#',
-                        'source': news['source'],
-                        'published_at': ''
-                    })
+        # Trending topics are answered from verdicts precomputed in the background
+        precomputed = trending_store.search(query, model_registry.model_version, MAX_SEARCH_RESULTS) \
+            if TRENDING_REFRESH_INTERVAL else []
+        if precomputed:
+            items, predictions = zip(*precomputed)
+        else:
+            # Query all upstream sources concurrently (pooled and cached)
+            fetch_start = time.perf_counter()
+            results = news_fetcher.fetch(query)
+            if METRICS_ENABLED:
+                stage_latency.observe(time.perf_counter() - fetch_start, 'upstream_fetch')
             
-            # If still no matches, return random sample news
-            if not results:
-                results = random.sample(SAMPLE_NEWS, min(6, len(SAMPLE_NEWS)))
-                for r in results:
-                    r['url'] = '#'
+            # Fall back to sample news, dedupe and analyze all items in one batch;
+            # precomputed and near-duplicate stories reuse their verdict
+            items = select_news(query, results)
+            check_deadline()
+            predictions = score_news_items(items)
         
-        # Remove duplicates
-        seen = set()
-        unique_results = []
-        for item in results:
-            title_lower = item['title'].lower().strip()
-            if title_lower and title_lower not in seen:
-                seen.add(title_lower)
-                unique_results.append(item)
-        
-        # Analyze each news item
-        analyzed_results = []
-        for item in unique_results[:12]:
-            full_text = f"{item['title']} {item.get('description', '')}"
-            prediction = detector.predict(full_text)
-            
-            analyzed_results.append({
-                'title': item['title'],
-                'description': item.get('description', ''),
-                'source': item['source'],
-                'url': item['url'],
-                'published_at': item.get('published_at', ''),
-                'is_fake': prediction['is_fake'],
-                'label': 'FAKE NEWS' if prediction['is_fake'] else 'REAL NEWS',
-                'confidence': round(prediction['confidence'] * 100, 2),
-                'probability_fake': round(prediction['probability_fake'] * 100, 2),
-                'probability_real': round(prediction['probability_real'] * 100, 2)
-            })
+        analyzed_results = [
+            format_news_item(item, prediction)
+            for item, prediction in zip(items, predictions)
+        ]
         
         return jsonify({
             'success': True,
+            'model_version': predictions[0]['model_version'] if predictions else model_registry.model_version,
             'query': query,
+            'precomputed': bool(precomputed),
             'total_results': len(analyzed_results),
             'results': analyzed_results
         })
     
+    except RequestError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def stream_batch(records):
+    """Score (id, text) pairs in chunks and stream one NDJSON line per text"""
+    def generate():
+        index = 0
+        try:
+            for chunk in chunked(records, BATCH_CHUNK_SIZE):
+                check_deadline()
+                predictions = score_texts([text[:MAX_TEXT_CHARS].strip() for _, text in chunk])
+                lines = []
+                for (record_id, text), result in zip(chunk, predictions):
+                    item = {'index': index, **format_batch_item(text, result),
+                            'model_version': result['model_version']}
+                    if record_id is not None:
+                        item['id'] = record_id
+                    lines.append(json.dumps(item) + '\n')
+                    index += 1
+                yield ''.join(lines)
+        except RequestError as e:
+            # Headers are already sent, so errors arrive as a final line
+            yield json.dumps({'error': e.message, 'status': e.status}) + '\n'
+        except Exception as e:
+            yield json.dumps({'error': str(e), 'status': 500}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
 @app.route('/batch-analyze', methods=['POST'])
 def batch_analyze():
-    """Analyze multiple texts for fake news"""
+    """Analyze multiple texts for fake news.
+    
+    Accepts {"texts": [...]} or an NDJSON body (one text or {"text", "id"}
+    object per line). NDJSON bodies, and JSON requests that accept
+    application/x-ndjson, get results streamed back chunk by chunk.
+    """
     try:
-        data = request.get_json()
+        check_batch_size(request.content_length, BATCH_MAX_BYTES)
+        if request.mimetype == NDJSON_MIMETYPE:
+            return stream_batch(iter_ndjson_texts(request.stream, BATCH_MAX_BYTES))
         
-        if not data or 'texts' not in data:
-            return jsonify({'error': 'No texts provided'}), 400
+        # Bodies sent without a Content-Length are read at most one byte past the limit
+        request.max_content_length = BATCH_MAX_BYTES + 1
+        check_batch_size(len(request.get_data(cache=True)), BATCH_MAX_BYTES)
+        texts = parse_batch_request(request.get_json())
+        if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+            return stream_batch((None, text) for text in texts)
         
-        texts = data['texts']
+        # Score in chunks so a batch that runs past its deadline returns the
+        # texts scored so far instead of nothing
+        predictions = []
+        partial = False
+        for chunk in chunked(texts, BATCH_CHUNK_SIZE):
+            try:
+                check_deadline()
+            except RequestError:
+                if not predictions:
+                    raise
+                partial = True
+                break
+            predictions.extend(score_texts([text[:MAX_TEXT_CHARS].strip() for text in chunk]))
         
-        if not isinstance(texts, list):
-            return jsonify({'error': 'Texts must be a list'}), 400
-        
-        if len(texts) > 10:
-            return jsonify({'error': 'Maximum 10 texts allowed at once'}), 400
-        
-        results = []
-        for text in texts:
-            if not text.strip():
-                continue
-            
-            result = detector.predict(text.strip())
-            results.append({
-                'text': text[:100] + '...' if len(text) > 100 else text,
-                'is_fake': result['is_fake'],
-                'label': 'FAKE NEWS' if result['is_fake'] else 'REAL NEWS',
-                'confidence': round(result['confidence'] * 100, 2)
-            })
-        
-        return jsonify({
+        response = {
             'success': True,
-            'results': results
-        })
+            'model_version': predictions[0]['model_version'] if predictions else model_registry.model_version,
+            'results': [format_batch_item(text, result) for text, result in zip(texts, predictions)]
+        }
+        if partial:
+            response.update({'partial': True, 'error': 'Request deadline exceeded', 'total': len(texts)})
+        return jsonify(response)
     
+    except RequestError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,217 @@
+"""ASGI entry point serving /analyze, /search-news and /batch-analyze.
+
+Model inference runs in a process pool (INFERENCE_WORKERS processes, default
+one per core), each loading the model once, while request handling and
+upstream news fetches stay on the event loop. Run with:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+
+Request parsing, response formatting and long-text chunking are shared with
+the Flask app (api_common, admission), as are the body size limits. Rate
+limiting, concurrency admission, request deadlines, /explain and NDJSON
+streaming are only served by the Flask app.
+"""
+import asyncio
+import json
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_common import (
+    MAX_BATCH_BYTES, RequestError, format_analysis, format_batch_item, format_news_item,
+    news_item_text, parse_analyze_request, parse_batch_request,
+    parse_search_request, select_news
+)
+from admission import combine_chunk_results, split_text
+from inference_pool import InferencePool
+from news_sources import HackerNewsSource, NewsFetcher
+
+
+class InferenceApp:
+    """Minimal ASGI application with the same contracts as the Flask app"""
+
+    def __init__(self, vectorizer_path: str = 'vectorizer.pkl', model_path: Optional[str] = 'fake_news_model.pkl',
+                 workers: Optional[int] = None, news_fetcher: Optional[NewsFetcher] = None,
+                 max_body_bytes: int = MAX_BATCH_BYTES, batch_chunk_size: int = 128,
+                 max_request_bytes: int = 1024 * 1024, text_chunk_chars: int = 10000, max_text_chunks: int = 8):
+        self.vectorizer_path = vectorizer_path
+        self.model_path = model_path
+        self.workers = workers
+        self.news_fetcher = news_fetcher
+        self.max_body_bytes = max_body_bytes
+        self.batch_chunk_size = batch_chunk_size
+        self.max_request_bytes = max_request_bytes
+        self.text_chunk_chars = text_chunk_chars
+        self.max_text_chunks = max_text_chunks
+        self.pool = None
+        self.model_version = None
+        self._startup_lock = asyncio.Lock()
+        self.routes = {
+            ('POST', '/analyze'): self.analyze,
+            ('POST', '/search-news'): self.search_news,
+            ('POST', '/batch-analyze'): self.batch_analyze,
+        }
+
+    def startup(self):
+        """Start the inference workers and the upstream fetcher"""
+        if self.pool is None:
+            self.pool = InferencePool(self.vectorizer_path, self.model_path, self.workers)
+            self.model_version = self.pool.warm_up()[0]['model_version']
+        if self.news_fetcher is None:
+            self.news_fetcher = NewsFetcher(
+                [HackerNewsSource(os.environ.get('HN_SEARCH_URL', 'https://hn.algolia.com/api/v1/search'))],
+                deadline=float(os.environ.get('NEWS_FETCH_DEADLINE', 5)),
+                cache_ttl=float(os.environ.get('NEWS_CACHE_TTL', 300))
+            )
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.news_fetcher is not None:
+            self.news_fetcher.close()
+            self.news_fetcher = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await loop.run_in_executor(None, self.startup)
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await loop.run_in_executor(None, self.shutdown)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        handler = self.routes.get((scope['method'], scope['path']))
+        if handler is None:
+            await _send_json(send, {'error': 'Not found'}, 404)
+            return
+
+        # Only /batch-analyze takes large bodies, as in the Flask app
+        max_bytes = self.max_body_bytes if handler == self.batch_analyze else self.max_request_bytes
+        parts = []
+        size = 0
+        while True:
+            message = await receive()
+            part = message.get('body', b'')
+            size += len(part)
+            if size > max_bytes:
+                await _send_json(send, {'error': f'Request body exceeds {max_bytes} bytes'}, 413)
+                return
+            parts.append(part)
+            if not message.get('more_body'):
+                break
+        body = b''.join(parts)
+
+        if self.pool is None:
+            # Servers without lifespan support start the app on first request
+            async with self._startup_lock:
+                await asyncio.get_running_loop().run_in_executor(None, self.startup)
+
+        try:
+            payload, status = await handler(json.loads(body))
+        except RequestError as e:
+            payload, status = {'error': e.message}, e.status
+        except Exception as e:
+            payload, status = {'error': str(e)}, 500
+        await _send_json(send, payload, status)
+
+    async def analyze(self, data) -> Tuple[Dict, int]:
+        """Analyze text for fake news"""
+        text = parse_analyze_request(data)
+
+        # Long articles are scored as bounded chunks
+        chunks, truncated = split_text(text, self.text_chunk_chars, self.max_text_chunks)
+        results = await self.pool.predict_batch(chunks)
+        result = combine_chunk_results(results, [len(chunk) for chunk in chunks]) if len(chunks) > 1 else results[0]
+        return {
+            'success': True,
+            'model_version': result['model_version'],
+            'chunks': len(chunks),
+            'truncated': truncated,
+            'result': format_analysis(result)
+        }, 200
+
+    async def search_news(self, data) -> Tuple[Dict, int]:
+        """Search news from multiple sources with fallback"""
+        query = parse_search_request(data)
+        results = await asyncio.get_running_loop().run_in_executor(None, self.news_fetcher.fetch, query)
+
+        items = select_news(query, results)
+        predictions = await self.pool.predict_batch([news_item_text(item) for item in items])
+        analyzed_results = [
+            format_news_item(item, prediction)
+            for item, prediction in zip(items, predictions)
+        ]
+
+        return {
+            'success': True,
+            'model_version': predictions[0]['model_version'] if predictions else self.model_version,
+            'query': query,
+            'total_results': len(analyzed_results),
+            'results': analyzed_results
+        }, 200
+
+    async def batch_analyze(self, data) -> Tuple[Dict, int]:
+        """Analyze multiple texts for fake news"""
+        texts = parse_batch_request(data)
+        # Large batches are split so every worker process scores a share
+        max_chars = self.text_chunk_chars * self.max_text_chunks
+        stripped = [text[:max_chars].strip() for text in texts]
+        chunks = await asyncio.gather(*[
+            self.pool.predict_batch(stripped[i:i + self.batch_chunk_size])
+            for i in range(0, len(stripped), self.batch_chunk_size)
+        ])
+        predictions = [result for chunk in chunks for result in chunk]
+        return {
+            'success': True,
+            'model_version': predictions[0]['model_version'] if predictions else self.model_version,
+            'results': [format_batch_item(text, result) for text, result in zip(texts, predictions)]
+        }, 200
+
+
+async def _send_json(send, payload, status: int):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+# MODEL_BUNDLE_PATH selects a memory-mapped bundle shared by all workers
+app = InferenceApp(
+    vectorizer_path=os.environ.get('MODEL_BUNDLE_PATH') or os.environ.get('VECTORIZER_PATH', 'vectorizer.pkl'),
+    model_path=None if os.environ.get('MODEL_BUNDLE_PATH') else os.environ.get('MODEL_PATH', 'fake_news_model.pkl'),
+    workers=int(os.environ['INFERENCE_WORKERS']) if os.environ.get('INFERENCE_WORKERS') else None,
+    max_body_bytes=int(os.environ.get('BATCH_MAX_BYTES', MAX_BATCH_BYTES)),
+    batch_chunk_size=int(os.environ.get('BATCH_CHUNK_SIZE', 128)),
+    max_request_bytes=int(os.environ.get('MAX_REQUEST_BYTES', 1024 * 1024)),
+    text_chunk_chars=int(os.environ.get('TEXT_CHUNK_CHARS', 10000)),
+    max_text_chunks=int(os.environ.get('MAX_TEXT_CHUNKS', 8))
+)
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("The ASGI server needs uvicorn: pip install uvicorn")
+    uvicorn.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', 8000)))
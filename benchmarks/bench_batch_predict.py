@@ -0,0 +1,53 @@
+"""Benchmark single-text vs. batched prediction throughput.
+
+Usage:
+    python benchmarks/bench_batch_predict.py [--sizes 1 10 100 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+
+
+def make_corpus(size):
+    """Build a corpus of `size` texts by cycling through the sample dataset"""
+    texts, _ = create_sample_dataset()
+    return [f"{texts[i % len(texts)]} item {i}" for i in range(size)]
+
+
+def time_call(func, repeat):
+    """Return the best wall time of `repeat` calls to func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    detector = FakeNewsDetector()
+    texts, labels = create_sample_dataset()
+    detector.train(texts, labels)
+
+    print(f"{'batch size':>10}  {'loop docs/s':>12}  {'batch docs/s':>12}  {'speedup':>8}")
+    for size in args.sizes:
+        corpus = make_corpus(size)
+        loop_time = time_call(lambda: [detector.predict(text) for text in corpus], args.repeat)
+        batch_time = time_call(lambda: detector.predict_batch(corpus), args.repeat)
+        print(f"{size:>10}  {size / loop_time:>12,.0f}  {size / batch_time:>12,.0f}  "
+              f"{loop_time / batch_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
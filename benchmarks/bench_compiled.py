@@ -0,0 +1,97 @@
+"""Compare the pickled sklearn model with the compiled NumPy scorer.
+
+Reports per-batch scoring latency (vectorize + predict_proba) and the
+resident memory of a fresh process after loading each artifact.
+
+Usage:
+    python benchmarks/bench_compiled.py [--sizes 1 10 100 1000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from compiled_model import export_compiled
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+
+LOAD_SNIPPET = """
+import sys
+sys.path.insert(0, {root!r})
+from fake_news_detector import FakeNewsDetector
+
+def rss_kib():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmRSS'))
+
+before = rss_kib()
+detector = FakeNewsDetector()
+{load}
+detector.predict('warm up')
+print(before, rss_kib(), 'sklearn' in sys.modules)
+"""
+
+
+def load_footprint(load):
+    """RSS growth (KiB) of a fresh interpreter running `load` (Linux only)"""
+    code = LOAD_SNIPPET.format(root=REPO_ROOT, load=load)
+    output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, check=True,
+                            capture_output=True, text=True).stdout.split()
+    return int(output[1]) - int(output[0]), output[2] == 'True'
+
+
+def time_call(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        compiled_path = os.path.join(directory, 'model.npz')
+        export_compiled(os.path.join(REPO_ROOT, 'vectorizer.pkl'),
+                        os.path.join(REPO_ROOT, 'fake_news_model.pkl'), compiled_path)
+
+        sklearn_detector = FakeNewsDetector()
+        sklearn_detector.load_model(os.path.join(REPO_ROOT, 'vectorizer.pkl'),
+                                    os.path.join(REPO_ROOT, 'fake_news_model.pkl'))
+        compiled_detector = FakeNewsDetector()
+        compiled_detector.load_compiled(compiled_path)
+
+        texts, _ = create_sample_dataset()
+        print(f"{'batch':>6} {'sklearn ms':>11} {'compiled ms':>12} {'speedup':>8}")
+        for size in args.sizes:
+            batch = list(sklearn_detector.preprocess_many(
+                f"{texts[i % len(texts)]} {i}" for i in range(size)
+            ))
+            timings = []
+            for detector in (sklearn_detector, compiled_detector):
+                timings.append(time_call(
+                    lambda: detector.model.predict_proba(detector.vectorizer.transform(batch)), args.repeat
+                ))
+            print(f"{size:>6} {timings[0] * 1000:>11.3f} {timings[1] * 1000:>12.3f} {timings[0] / timings[1]:>7.1f}x")
+
+        print()
+        print(f"{'artifact':<10} {'load RSS KiB':>13} {'imports sklearn':>16}")
+        for name, load in (
+            ('pickle', "detector.load_model('vectorizer.pkl', 'fake_news_model.pkl')"),
+            ('compiled', f"detector.load_compiled({compiled_path!r})"),
+        ):
+            rss, imports_sklearn = load_footprint(load)
+            print(f"{name:<10} {rss:>13,} {str(imports_sklearn):>16}")
+
+
+if __name__ == '__main__':
+    main()
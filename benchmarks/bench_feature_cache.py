@@ -0,0 +1,63 @@
+"""Benchmark repeat training runs with and without the feature cache.
+
+A hyperparameter sweep retrains on the same documents many times. This
+trains once without a cache, then twice through a fresh FeatureCache (a
+cold run that fills it and a warm run that loads the memory-mapped TF-IDF
+matrices) and reports the wall time of each.
+
+Usage:
+    python benchmarks/bench_feature_cache.py [--docs 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from feature_cache import FeatureCache
+
+
+def make_corpus(size, seed=0):
+    """Build distinct article-sized documents from the sample dataset"""
+    rng = random.Random(seed)
+    texts, labels = create_sample_dataset()
+    corpus, corpus_labels = [], []
+    for i in range(size):
+        picks = rng.sample(range(len(texts)), 8)
+        corpus.append(' '.join(texts[j] for j in picks) + f" http://example.com/{i}")
+        corpus_labels.append(labels[picks[0]])
+    return corpus, corpus_labels
+
+
+def timed_train(texts, labels, feature_cache=None):
+    start = time.perf_counter()
+    FakeNewsDetector(cache_size=0).train(texts, labels, feature_cache=feature_cache)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=20000)
+    args = parser.parse_args()
+
+    texts, labels = make_corpus(args.docs)
+    uncached = timed_train(texts, labels)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = FeatureCache(directory)
+        cold = timed_train(texts, labels, cache)
+        warm = timed_train(texts, labels, cache)
+        cache.close()
+
+    print(f"{args.docs:,} documents")
+    print(f"  no cache:   {uncached:.2f}s")
+    print(f"  cold cache: {cold:.2f}s")
+    print(f"  warm cache: {warm:.2f}s ({uncached / warm:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
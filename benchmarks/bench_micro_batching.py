@@ -0,0 +1,86 @@
+"""Benchmark /analyze-style single-text scoring with and without micro-batching.
+
+Concurrent client threads each score distinct texts in a closed loop, either
+calling detector.predict directly or going through a MicroBatcher.
+Throughput and p50/p99 latency are reported for each configuration.
+
+Usage:
+    python benchmarks/bench_micro_batching.py [--clients 32] [--duration 5]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from micro_batching import MicroBatcher
+
+
+def run_clients(predict, clients, duration):
+    """Run closed-loop clients for `duration` seconds and return sorted latencies"""
+    texts, _ = create_sample_dataset()
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(client_id):
+        n = 0
+        local = []
+        while time.perf_counter() < deadline:
+            text = f"{texts[n % len(texts)]} client {client_id} request {n}"
+            n += 1
+            start = time.perf_counter()
+            predict(text)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies)
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--max-wait-ms', type=float, nargs='+', default=[1, 5, 10])
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    detector = FakeNewsDetector(cache_size=0)
+    texts, labels = create_sample_dataset()
+    detector.train(texts, labels)
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per run")
+    print(f"{'mode':<24} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10}")
+
+    latencies = run_clients(detector.predict, args.clients, args.duration)
+    print(f"{'direct':<24} {len(latencies) / args.duration:>10.0f} "
+          f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} {1:>10.1f}")
+
+    for max_wait_ms in args.max_wait_ms:
+        batcher = MicroBatcher(detector.predict_batch, max_wait_ms=max_wait_ms,
+                               max_batch_size=args.max_batch_size, max_queue=args.clients * 4)
+        latencies = run_clients(batcher.predict, args.clients, args.duration)
+        stats = batcher.stats()
+        batcher.close()
+        label = f"batched wait={max_wait_ms:g}ms"
+        print(f"{label:<24} {len(latencies) / args.duration:>10.0f} "
+              f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} "
+              f"{stats['mean_batch_size']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark model load time and per-worker memory: pickles vs. model bundle.
+
+Starts N worker processes that each load the model and stay alive together,
+then reports the mean load time, RSS and PSS per worker. PSS (proportional
+set size) splits shared pages between the processes mapping them, so it
+shows the saving from memory-mapping the bundle. Linux only.
+
+Usage:
+    python benchmarks/bench_model_load.py [--workers 4] [--synthetic-features 1000000]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fake_news_detector import FakeNewsDetector
+
+
+def memory_kib():
+    """Return (RSS, PSS) of the current process in KiB"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0]] = int(parts[1])
+    return values['Rss:'], values['Pss:']
+
+
+def worker(vectorizer_path, model_path, loaded, release, results):
+    start = time.perf_counter()
+    detector = FakeNewsDetector(cache_size=0)
+    detector.load_model(vectorizer_path, model_path)
+    detector.predict('warm up the scoring path')
+    # Touch every weight page, as scoring a varied corpus eventually would
+    float(detector.model.coef_.sum())
+    load_time = time.perf_counter() - start
+
+    loaded.wait()
+    rss, pss = memory_kib()
+    results.put((load_time, rss, pss))
+    release.wait()
+
+
+def measure(vectorizer_path, model_path, workers):
+    context = multiprocessing.get_context('spawn')
+    loaded = context.Barrier(workers + 1)
+    release = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(vectorizer_path, model_path, loaded, release, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    loaded.wait()
+    samples = [results.get() for _ in range(workers)]
+    release.wait()
+    for process in processes:
+        process.join()
+    return [statistics.mean(values) for values in zip(*samples)]
+
+
+def make_synthetic_model(directory, n_features):
+    """Write pickles and a bundle for a random model with n_features terms"""
+    import joblib
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+    vectorizer.vocabulary_ = {f"term{i:08d}": i for i in range(n_features)}
+    vectorizer.idf_ = rng.uniform(1, 10, n_features)
+    model = LogisticRegression()
+    model.coef_ = rng.normal(size=(1, n_features))
+    model.intercept_ = np.zeros(1)
+    model.classes_ = np.array([0, 1])
+
+    paths = [os.path.join(directory, 'vectorizer.pkl'), os.path.join(directory, 'model.pkl')]
+    joblib.dump(vectorizer, paths[0])
+    joblib.dump(model, paths[1])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--synthetic-features', type=int, default=0,
+                        help='benchmark a random model of this size instead of the shipped one')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.synthetic_features:
+            vectorizer_path, model_path = make_synthetic_model(directory, args.synthetic_features)
+        else:
+            vectorizer_path = os.path.join(REPO_ROOT, 'vectorizer.pkl')
+            model_path = os.path.join(REPO_ROOT, 'fake_news_model.pkl')
+
+        bundle_path = os.path.join(directory, 'model.bundle')
+        detector = FakeNewsDetector(cache_size=0)
+        detector.load_model(vectorizer_path, model_path)
+        detector.save_model(bundle_path)
+
+        print(f"{args.workers} concurrent workers, "
+              f"{detector.model.coef_.shape[1]:,} features")
+        print(f"{'artifact':<10} {'load ms':>9} {'RSS KiB':>10} {'PSS KiB':>10}")
+        for name, paths in (('pickle', (vectorizer_path, model_path)), ('bundle', (bundle_path, None))):
+            load_time, rss, pss = measure(*paths, args.workers)
+            print(f"{name:<10} {load_time * 1000:>9.1f} {rss:>10,.0f} {pss:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark near-duplicate verdict reuse on a syndicated news stream.
+
+Builds a stream of headlines where each story arrives as several lightly
+edited copies (wire prefixes, source suffixes, case changes), then scores it
+with plain predict_batch and through a NearDuplicateIndex that scores one
+copy per cluster. Reports texts sent to the model, wall time and how often a
+reused verdict disagrees with scoring the copy itself.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--stories 2000] [--copies 5] [--batch 12]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from near_duplicates import NearDuplicateIndex
+
+PREFIXES = ['', 'UPDATE 1-', 'BREAKING: ', 'EXCLUSIVE-']
+SUFFIXES = ['', ' - Reuters', ' | AP News', ' (video)', ' - report']
+
+
+def make_stream(stories, copies, words_per_story=(12, 30), seed=0):
+    rng = random.Random(seed)
+    texts, _ = create_sample_dataset()
+    words = ' '.join(texts).split()
+    stream = []
+    for _ in range(stories):
+        story = ' '.join(rng.choice(words) for _ in range(rng.randint(*words_per_story)))
+        for _ in range(copies):
+            copy = rng.choice(PREFIXES) + story + rng.choice(SUFFIXES)
+            stream.append(copy.upper() if rng.random() < 0.1 else copy)
+    rng.shuffle(stream)
+    return stream
+
+
+def score_with_index(detector, index, texts):
+    """Score a batch like the app's score_news; returns results and texts sent to the model"""
+    sent = []
+
+    def score_batch(batch):
+        sent.append(len(batch))
+        return detector.predict_processed(batch)
+
+    results = index.score(list(detector.preprocess_many(texts)), score_batch, detector.model_version)
+    return results, sum(sent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stories', type=int, default=2000)
+    parser.add_argument('--copies', type=int, default=5)
+    parser.add_argument('--words', type=int, nargs=2, default=[12, 30], metavar=('MIN', 'MAX'),
+                        help='words per story (headline + description by default)')
+    parser.add_argument('--batch', type=int, default=12, help='texts per request, like /search-news')
+    parser.add_argument('--threshold', type=float, default=0.7)
+    args = parser.parse_args()
+
+    detector = FakeNewsDetector(cache_size=0)
+    detector.load_model(os.path.join(REPO_ROOT, 'vectorizer.pkl'), os.path.join(REPO_ROOT, 'fake_news_model.pkl'))
+    stream = make_stream(args.stories, args.copies, args.words)
+    batches = [stream[i:i + args.batch] for i in range(0, len(stream), args.batch)]
+
+    start = time.perf_counter()
+    baseline = [result for batch in batches for result in detector.predict_batch(batch)]
+    baseline_seconds = time.perf_counter() - start
+
+    index = NearDuplicateIndex(max_entries=10000, threshold=args.threshold)
+    start = time.perf_counter()
+    reused, scored = [], 0
+    for batch in batches:
+        results, count = score_with_index(detector, index, batch)
+        reused.extend(results)
+        scored += count
+    index_seconds = time.perf_counter() - start
+
+    flipped = sum(a['is_fake'] != b['is_fake'] for a, b in zip(baseline, reused))
+    print(f"{len(stream):,} texts ({args.stories:,} stories x {args.copies} copies), batches of {args.batch}")
+    print(f"{'mode':<16} {'scored':>8} {'seconds':>9}")
+    print(f"{'predict_batch':<16} {len(stream):>8,} {baseline_seconds:>9.2f}")
+    print(f"{'near-duplicate':<16} {scored:>8,} {index_seconds:>9.2f}")
+    print(f"Model calls avoided: {1 - scored / len(stream):.1%}; verdicts differing from direct scoring: {flipped}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark preprocessing throughput of the NLTK and fast tokenizers.
+
+Usage:
+    python benchmarks/bench_preprocess.py [--docs 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+
+
+def make_corpus(size):
+    """Build article-sized documents from the sample dataset"""
+    texts, _ = create_sample_dataset()
+    return [
+        ' '.join(texts[(i + j) % len(texts)] for j in range(8)) + f" http://example.com/{i} 2024"
+        for i in range(size)
+    ]
+
+
+def time_call(func, repeat):
+    """Return the best wall time of `repeat` calls to func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs)
+    total_chars = sum(len(text) for text in corpus)
+
+    nltk_detector = FakeNewsDetector(tokenizer='nltk')
+    fast_detector = FakeNewsDetector(tokenizer='fast')
+
+    runs = [
+        ('nltk preprocess_text', lambda: [nltk_detector.preprocess_text(t) for t in corpus]),
+        ('fast preprocess_text', lambda: [fast_detector.preprocess_text(t) for t in corpus]),
+        ('fast preprocess_many', lambda: list(fast_detector.preprocess_many(corpus))),
+    ]
+
+    print(f"{args.docs} docs, {total_chars:,} chars")
+    baseline = None
+    for name, func in runs:
+        elapsed = time_call(func, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<22} {total_chars / elapsed:>14,.0f} chars/s  {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
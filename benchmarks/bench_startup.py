@@ -0,0 +1,54 @@
+"""Benchmark cold-start time of the detector module and the Flask app.
+
+Each measurement runs in a fresh interpreter so nothing is cached in-process.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    'import fake_news_detector': (
+        "import time; t = time.perf_counter(); import fake_news_detector; "
+        "print(time.perf_counter() - t)"
+    ),
+    'detector.load_model': (
+        "import time; from fake_news_detector import FakeNewsDetector; "
+        "t = time.perf_counter(); FakeNewsDetector().load_model('vectorizer.pkl', 'fake_news_model.pkl'); "
+        "print(time.perf_counter() - t)"
+    ),
+    'import app (incl. model load)': (
+        "import time; t = time.perf_counter(); import app; "
+        "print(time.perf_counter() - t)"
+    ),
+}
+
+
+def measure(snippet):
+    """Run snippet in a fresh interpreter and return the time it reports"""
+    output = subprocess.run(
+        [sys.executable, '-c', snippet], cwd=REPO_ROOT, check=True,
+        capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'stage':<32} {'median ms':>10} {'min ms':>8}")
+    for name, snippet in SNIPPETS.items():
+        timings = [measure(snippet) * 1000 for _ in range(args.runs)]
+        print(f"{name:<32} {statistics.median(timings):>10.1f} {min(timings):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
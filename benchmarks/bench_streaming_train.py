@@ -0,0 +1,102 @@
+"""Benchmark in-memory train() against out-of-core train_streaming().
+
+Writes synthetic labelled JSONL corpora of each size, then trains in a fresh
+process per run and reports wall time, the process's peak RSS (VmHWM) and
+held-out F1. Streaming runs keep one chunk per worker in memory, so their
+peak stays flat as the corpus grows. Linux only (reads /proc).
+
+Usage:
+    python benchmarks/bench_streaming_train.py [--sizes 10000 100000 1000000] [--workers 0]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def peak_rss_kib():
+    """Return the peak resident set size of this process in KiB"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+
+
+def write_corpus(path, size, words_per_doc=60, seed=0):
+    """Write `size` labelled documents whose word mix depends on the label"""
+    rng = random.Random(seed)
+    # Alphabetic words only; preprocessing strips digits
+    vocabulary = sorted({''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=7)) for _ in range(20000)})
+    fake_words, real_words = vocabulary[:2000], vocabulary[2000:4000]
+    with open(path, 'w') as f:
+        for i in range(size):
+            label = rng.random() < 0.5
+            signal = fake_words if label else real_words
+            words = [rng.choice(signal) if rng.random() < 0.1 else rng.choice(vocabulary)
+                     for _ in range(words_per_doc)]
+            f.write(json.dumps({'id': i, 'text': ' '.join(words), 'label': int(label)}) + '\n')
+
+
+def run(mode, path, workers, results):
+    from fake_news_detector import FakeNewsDetector
+    detector = FakeNewsDetector(cache_size=0)
+    start = time.perf_counter()
+    if mode == 'in-memory':
+        texts, labels = [], []
+        with open(path) as f:
+            for line in f:
+                row = json.loads(line)
+                texts.append(row['text'])
+                labels.append(row['label'])
+        metrics = detector.train(texts, labels)
+    else:
+        metrics = detector.train_streaming(path, workers=workers, log=open(os.devnull, 'w'))
+    results.put((time.perf_counter() - start, peak_rss_kib(), metrics['f1_score']))
+
+
+def measure(mode, path, workers):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run, args=(mode, path, workers, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        return None
+    return results.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--workers', type=int, default=None,
+                        help='streaming preprocessing processes (default: one per core; 0 in-process)')
+    parser.add_argument('--skip-in-memory-above', type=int, default=None,
+                        help='skip in-memory training for corpora larger than this')
+    args = parser.parse_args()
+
+    print(f"{'docs':>9} {'mode':<10} {'seconds':>9} {'peak RSS MiB':>13} {'F1':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"corpus-{size}.jsonl")
+            write_corpus(path, size)
+            for mode in ('in-memory', 'streaming'):
+                if mode == 'in-memory' and args.skip_in_memory_above and size > args.skip_in_memory_above:
+                    continue
+                result = measure(mode, path, args.workers)
+                if result is None:
+                    print(f"{size:>9,} {mode:<10} {'failed (out of memory?)':>31}")
+                    continue
+                seconds, peak, f1 = result
+                print(f"{size:>9,} {mode:<10} {seconds:>9.1f} {peak / 1024:>13,.0f} {f1:>7.3f}")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
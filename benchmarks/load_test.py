@@ -0,0 +1,161 @@
+"""Load-test the ASGI server and report requests/sec per inference worker count.
+
+For each worker count the script starts `uvicorn asgi_app:app` with
+INFERENCE_WORKERS set, drives it with concurrent clients for a fixed
+duration and reports throughput and latency percentiles. Every request
+uses distinct text so the per-worker prediction cache does not skew results.
+
+Usage:
+    python benchmarks/load_test.py [--workers 1 2 4] [--duration 10] [--concurrency 32]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000   # test a running server
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fake_news_detector import create_sample_dataset
+
+
+def make_payload(endpoint, n):
+    """Build a distinct, article-sized request body"""
+    texts, _ = create_sample_dataset()
+    article = ' '.join(texts[(n + j) % len(texts)] for j in range(20)) + f" ref {n}"
+    if endpoint == '/batch-analyze':
+        return {'texts': [f"{article} part {i}" for i in range(10)]}
+    return {'text': article}
+
+
+def client_worker(url, endpoint, threads, duration, offset):
+    """Run `threads` closed-loop clients for `duration` seconds; return latencies"""
+    parsed = urlparse(url)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def run(thread_id):
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+        n = offset + thread_id * 10_000_000
+        while time.perf_counter() < deadline:
+            body = json.dumps(make_payload(endpoint, n))
+            n += 1
+            start = time.perf_counter()
+            try:
+                connection.request('POST', endpoint, body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies, errors[0]
+
+
+def run_load(url, endpoint, concurrency, duration, client_procs):
+    """Drive the server from several client processes and aggregate results"""
+    threads = max(1, concurrency // client_procs)
+    with multiprocessing.Pool(client_procs) as pool:
+        outcomes = pool.starmap(client_worker, [
+            (url, endpoint, threads, duration, proc * 100_000_000) for proc in range(client_procs)
+        ])
+    latencies = sorted(latency for result, _ in outcomes for latency in result)
+    errors = sum(error for _, error in outcomes)
+    return latencies, errors
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, port):
+    """Start uvicorn with `workers` inference processes and wait until it accepts requests"""
+    env = dict(os.environ, INFERENCE_WORKERS=str(workers))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=REPO_ROOT, env=env
+    )
+    for _ in range(600):
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('POST', '/analyze', json.dumps({'text': 'warm up request text'}))
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"Server with {workers} workers did not start")
+
+
+def report(label, latencies, errors, duration):
+    print(f"{label:>8}  {len(latencies) / duration:>10.1f}  {percentile(latencies, 0.5) * 1000:>8.1f}  "
+          f"{percentile(latencies, 0.99) * 1000:>8.1f}  {errors:>6}")
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, *(2 ** i for i in range(1, cpus.bit_length()) if 2 ** i <= cpus), cpus})
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='test an already running server instead of starting one')
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--endpoint', default='/analyze', choices=['/analyze', '/batch-analyze'])
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--client-procs', type=int, default=max(1, min(4, cpus // 2)))
+    args = parser.parse_args()
+
+    print(f"{args.endpoint}, concurrency {args.concurrency}, {args.duration:.0f}s per run, {cpus} cores")
+    print(f"{'workers':>8}  {'req/s':>10}  {'p50 ms':>8}  {'p99 ms':>8}  {'errors':>6}")
+
+    if args.url:
+        latencies, errors = run_load(args.url, args.endpoint, args.concurrency, args.duration, args.client_procs)
+        report('-', latencies, errors, args.duration)
+        return
+
+    for workers in args.workers:
+        port = free_port()
+        server = start_server(workers, port)
+        try:
+            latencies, errors = run_load(f"http://127.0.0.1:{port}", args.endpoint,
+                                         args.concurrency, args.duration, args.client_procs)
+        finally:
+            server.terminate()
+            server.wait()
+        report(str(workers), latencies, errors, args.duration)
+
+
+if __name__ == '__main__':
+    main()
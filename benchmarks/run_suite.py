@@ -0,0 +1,261 @@
+"""Reproducible benchmark suite with JSON results and baseline comparison.
+
+Builds seeded synthetic corpora from create_sample_dataset at each scale and
+measures preprocessing throughput, single and batch prediction, training
+time and peak traced memory, model load time, app start-up, and end-to-end
+/analyze, /batch-analyze and /search-news latency (live and precomputed
+trending) through the Flask test client (the Hacker News upstream is a
+local stub server).
+
+Usage:
+    python benchmarks/run_suite.py --output results.json
+    python benchmarks/run_suite.py --output new.json --compare results.json --threshold 0.2
+
+With --compare, exits with status 1 if any metric is worse than the
+baseline by more than the threshold (a fraction, 0.2 = 20%).
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+
+VECTORIZER_PATH = os.path.join(REPO_ROOT, 'vectorizer.pkl')
+MODEL_PATH = os.path.join(REPO_ROOT, 'fake_news_model.pkl')
+
+
+def make_corpus(size, seed=0):
+    """Seeded, distinct article-sized documents and labels"""
+    rng = random.Random(seed)
+    texts, labels = create_sample_dataset()
+    corpus, corpus_labels = [], []
+    for i in range(size):
+        picks = rng.sample(range(len(texts)), 6)
+        corpus.append(' '.join(texts[j] for j in picks) + f" http://example.com/{i} item {i}")
+        corpus_labels.append(labels[picks[0]])
+    return corpus, corpus_labels
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def best_of(func, repeat=5):
+    """Best wall time of `repeat` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def latency_percentiles_ms(func, args, rounds=3):
+    """Median over `rounds` of the per-call p50 and p95 latency, in ms"""
+    p50s, p95s = [], []
+    for _ in range(rounds):
+        samples = []
+        for arg in args:
+            start = time.perf_counter()
+            func(arg)
+            samples.append((time.perf_counter() - start) * 1000)
+        p50s.append(percentile(samples, 0.5))
+        p95s.append(percentile(samples, 0.95))
+    return statistics.median(p50s), statistics.median(p95s)
+
+
+def loaded_detector():
+    detector = FakeNewsDetector(cache_size=0)
+    detector.load_model(VECTORIZER_PATH, MODEL_PATH)
+    return detector
+
+
+def bench_detector(scales, record):
+    detector = loaded_detector()
+    for scale in scales:
+        corpus, labels = make_corpus(scale)
+        seconds = best_of(lambda: list(detector.preprocess_many(corpus)))
+        record(f"preprocess_docs_per_sec@{scale}", scale / seconds, 'docs/s', True)
+
+        seconds = best_of(lambda: [detector.predict_batch(corpus[i:i + 256]) for i in range(0, scale, 256)])
+        record(f"predict_batch_docs_per_sec@{scale}", scale / seconds, 'docs/s', True)
+
+        trainee = FakeNewsDetector(cache_size=0)
+        start = time.perf_counter()
+        trainee.train(corpus, labels)
+        record(f"train_seconds@{scale}", time.perf_counter() - start, 's', False)
+
+        tracemalloc.start()
+        FakeNewsDetector(cache_size=0).train(corpus, labels)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        record(f"train_peak_mib@{scale}", peak / 2 ** 20, 'MiB', False)
+
+    corpus, _ = make_corpus(500, seed=1)
+    detector.predict(corpus[0])
+    p50, p95 = latency_percentiles_ms(detector.predict, corpus)
+    record('predict_single_p50_ms', p50, 'ms', False)
+    record('predict_single_p95_ms', p95, 'ms', False)
+
+
+def bench_model_load(record):
+    record('load_pickle_ms', best_of(loaded_detector) * 1000, 'ms', False)
+    with tempfile.TemporaryDirectory() as directory:
+        bundle_path = os.path.join(directory, 'model.bundle')
+        loaded_detector().save_model(bundle_path)
+
+        def load_bundle():
+            FakeNewsDetector(cache_size=0).load_model(bundle_path)
+
+        record('load_bundle_ms', best_of(load_bundle) * 1000, 'ms', False)
+
+
+def bench_startup(record):
+    def start_app():
+        subprocess.run([sys.executable, '-c', 'import app'], cwd=REPO_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       env=dict(os.environ, MODEL_WATCH_INTERVAL='0', TRENDING_REFRESH_INTERVAL='0'))
+
+    record('app_startup_seconds', best_of(start_app), 's', False)
+
+
+class StubHackerNews(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query).get('query', [''])[0]
+        body = json.dumps({'hits': [
+            {'title': f"{query} story {i}", 'points': i, 'author': 'stub', 'objectID': str(i)}
+            for i in range(10)
+        ]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_http(requests, record):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHackerNews)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.update({
+        'HN_SEARCH_URL': f"http://127.0.0.1:{server.server_address[1]}/",
+        'PREDICTION_CACHE_SIZE': '0',
+        'MODEL_WATCH_INTERVAL': '0',
+        # Refreshed once below, not in the background during measurements
+        'TRENDING_REFRESH_INTERVAL': '86400',
+    })
+    os.chdir(REPO_ROOT)
+    import app
+    app.trending_refresher.refresh()
+    client = app.app.test_client()
+
+    corpus, _ = make_corpus(requests * 10, seed=2)
+    queries = itertools.count()
+    endpoints = {
+        'analyze': lambda i: client.post('/analyze', json={'text': corpus[i]}),
+        'batch_analyze': lambda i: client.post('/batch-analyze', json={'texts': corpus[i * 10:i * 10 + 10]}),
+        # A distinct query per request so the news cache never answers
+        'search_news': lambda i: client.post('/search-news', json={'query': f"election {next(queries)}"}),
+        # Matches the stub's trending stories, so it is answered from precomputed verdicts
+        'search_news_trending': lambda i: client.post('/search-news', json={'query': 'story'}),
+    }
+    try:
+        for name, call in endpoints.items():
+            response = call(0)
+            if response.status_code != 200:
+                raise RuntimeError(f"{name} returned {response.status_code}: {response.get_data(as_text=True)}")
+            p50, p95 = latency_percentiles_ms(call, range(requests))
+            record(f"http_{name}_p50_ms", p50, 'ms', False)
+            record(f"http_{name}_p95_ms", p95, 'ms', False)
+    finally:
+        app.trending_refresher.stop()
+        app.news_fetcher.close()
+        server.shutdown()
+        server.server_close()
+
+
+def compare(results, baseline, threshold):
+    """Print per-metric changes and return the names of regressed metrics"""
+    regressions = []
+    print(f"\n{'metric':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, current in sorted(results['metrics'].items()):
+        previous = baseline['metrics'].get(name)
+        if previous is None:
+            print(f"{name:<36} {'-':>12} {current['value']:>12.4g}   (new)")
+            continue
+        change = (current['value'] - previous['value']) / previous['value'] if previous['value'] else 0.0
+        worse = -change if current['higher_is_better'] else change
+        flag = '  REGRESSION' if worse > threshold else ''
+        if flag:
+            regressions.append(name)
+        print(f"{name:<36} {previous['value']:>12.4g} {current['value']:>12.4g} {change:>+8.1%}{flag}")
+    for name in sorted(set(baseline['metrics']) - set(results['metrics'])):
+        print(f"{name:<36} (missing from this run)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--http-requests', type=int, default=200)
+    parser.add_argument('--output', help='write results JSON to this path')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative slowdown before a metric counts as a regression')
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scales': args.scales,
+        },
+        'metrics': {},
+    }
+
+    def record(name, value, unit, higher_is_better):
+        results['metrics'][name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f"{name:<36} {value:>12.4g} {unit}")
+
+    bench_detector(args.scales, record)
+    bench_model_load(record)
+    bench_startup(record)
+    bench_http(args.http_requests, record)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""Command-line tools for the fake news detector.
+
+`score` streams a JSONL, CSV or TSV corpus of any size through the model in
+fixed-size chunks, fanned out across a process pool, and writes one JSON
+result per input record, in input order:
+
+    python cli.py score articles.jsonl scores.jsonl --workers 4
+    python cli.py score articles.csv scores.jsonl --resume
+
+A checkpoint (`OUTPUT.checkpoint`) is written after every chunk, so an
+interrupted run continues where it stopped when re-run with --resume.
+
+`train` fits a model out-of-core on a labelled corpus (see
+streaming_training.py) and saves it as pickles:
+
+    python cli.py train labelled.jsonl --workers 4 --epochs 2
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from corpus_io import FORMATS, chunked, detect_format, read_corpus
+from fake_news_detector import FakeNewsDetector
+from inference_pool import InferencePool
+
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+
+class LocalScorer:
+    """Score chunks in the calling process (--workers 0)"""
+
+    def __init__(self, vectorizer_path: str, model_path: Optional[str]):
+        self.detector = FakeNewsDetector(cache_size=0)
+        self.detector.load_model(vectorizer_path, model_path)
+
+    def submit_batch(self, texts: List[str]) -> Future:
+        future = Future()
+        future.set_result(self.detector.predict_batch(texts))
+        return future
+
+    def warm_up(self) -> List[Dict[str, any]]:
+        return [{'pid': os.getpid(), 'model_version': self.detector.model_version}]
+
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+def read_checkpoint(output_path: str) -> Optional[Dict[str, any]]:
+    try:
+        with open(output_path + CHECKPOINT_SUFFIX) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(output_path: str, checkpoint: Dict[str, any]):
+    # Write then rename, so a crash never leaves a half-written checkpoint
+    path = output_path + CHECKPOINT_SUFFIX
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
+
+
+def format_results(chunk, predictions, model_version: Optional[str]) -> str:
+    """Render one chunk as JSONL, merging predictions back in record order"""
+    predictions = iter(predictions)
+    lines = []
+    for record in chunk:
+        row = {'index': record.index, 'id': record.id}
+        if record.error is not None:
+            row['error'] = record.error
+        else:
+            row.update(next(predictions))
+            row['model_version'] = model_version
+        lines.append(json.dumps(row) + '\n')
+    return ''.join(lines)
+
+
+def score_corpus(input_path: str, output_path: str, vectorizer_path: str, model_path: Optional[str] = None,
+                 fmt: Optional[str] = None, text_field: str = 'text', id_field: Optional[str] = 'id',
+                 chunk_size: int = 1000, workers: Optional[int] = None, resume: bool = False,
+                 progress_interval: float = 5.0, log=sys.stderr) -> Dict[str, any]:
+    """Score a corpus file into JSONL; returns record counts and throughput"""
+    fmt = fmt or detect_format(input_path)
+    input_size = os.path.getsize(input_path)
+
+    checkpoint = read_checkpoint(output_path) if resume else None
+    if checkpoint is not None:
+        if checkpoint['input'] != os.path.abspath(input_path) or checkpoint['input_size'] != input_size:
+            raise ValueError(f"Checkpoint for {output_path} was written for a different input")
+        if not os.path.exists(output_path):
+            print(f"{output_path} is missing, starting over", file=log)
+            checkpoint = None
+    if checkpoint is not None:
+        done, output_bytes = checkpoint['records'], checkpoint['output_bytes']
+        print(f"Resuming after {done:,} records", file=log)
+    else:
+        done, output_bytes = 0, 0
+
+    if workers == 0:
+        scorer = LocalScorer(vectorizer_path, model_path)
+    else:
+        scorer = InferencePool(vectorizer_path, model_path, workers, cache_size=0)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+
+    stats = {'records': done, 'scored': 0, 'errors': 0}
+    start = last_report = time.perf_counter()
+    try:
+        model_version = scorer.warm_up()[0]['model_version']
+        with open(input_path, newline='' if fmt != 'jsonl' else None, encoding='utf-8') as source, \
+                open(output_path, 'r+b' if output_bytes else 'wb') as sink:
+            # Drop anything written after the last checkpoint
+            sink.seek(output_bytes)
+            sink.truncate()
+
+            records = read_corpus(source, fmt, text_field, id_field, skip=done)
+
+            # Keep a bounded window of chunks in flight and write them back in order
+            pending = collections.deque()
+            chunks = chunked(records, chunk_size)
+            while True:
+                while len(pending) < max_in_flight:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    texts = [record.text for record in chunk if record.error is None]
+                    pending.append((chunk, scorer.submit_batch(texts)))
+                if not pending:
+                    break
+
+                chunk, future = pending.popleft()
+                sink.write(format_results(chunk, future.result(), model_version).encode('utf-8'))
+                sink.flush()
+                os.fsync(sink.fileno())
+
+                errors = sum(record.error is not None for record in chunk)
+                stats['records'] += len(chunk)
+                stats['scored'] += len(chunk) - errors
+                stats['errors'] += errors
+                write_checkpoint(output_path, {
+                    'input': os.path.abspath(input_path),
+                    'input_size': input_size,
+                    'records': stats['records'],
+                    'output_bytes': sink.tell(),
+                })
+
+                now = time.perf_counter()
+                if now - last_report >= progress_interval:
+                    last_report = now
+                    rate = (stats['records'] - done) / (now - start)
+                    print(f"Scored {stats['records']:,} records ({rate:,.0f} docs/sec)", file=log)
+    finally:
+        scorer.shutdown()
+
+    # A finished run leaves no checkpoint behind
+    if os.path.exists(output_path + CHECKPOINT_SUFFIX):
+        os.remove(output_path + CHECKPOINT_SUFFIX)
+    stats['elapsed'] = time.perf_counter() - start
+    stats['docs_per_sec'] = (stats['records'] - done) / stats['elapsed'] if stats['elapsed'] else 0.0
+    print(f"Done: {stats['records']:,} records, {stats['errors']:,} errors, "
+          f"{stats['docs_per_sec']:,.0f} docs/sec", file=log)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fake news detector command-line tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help='score a JSONL, CSV or TSV corpus into JSONL')
+    score.add_argument('input', help='JSONL, CSV or TSV file of articles')
+    score.add_argument('output', help='JSONL file to write results to')
+    score.add_argument('--format', choices=FORMATS, help='input format (default: from extension)')
+    score.add_argument('--text-field', default='text')
+    score.add_argument('--id-field', default='id')
+    score.add_argument('--chunk-size', type=int, default=1000)
+    score.add_argument('--workers', type=int, default=None,
+                       help='scoring processes (default: one per core; 0 scores in-process)')
+    score.add_argument('--resume', action='store_true', help='continue from the last checkpoint')
+    score.add_argument('--progress-interval', type=float, default=5.0, help='seconds between progress lines')
+    score.add_argument('--model-bundle', default='fake_news_model.bundle')
+    score.add_argument('--vectorizer', default='vectorizer.pkl')
+    score.add_argument('--model', default='fake_news_model.pkl')
+
+    train = commands.add_parser('train', help='train out-of-core on a labelled JSONL, CSV or TSV corpus')
+    train.add_argument('input', help='JSONL, CSV or TSV file with text and label (0 real, 1 fake) fields')
+    train.add_argument('--format', choices=FORMATS, help='input format (default: from extension)')
+    train.add_argument('--text-field', default='text')
+    train.add_argument('--label-field', default='label')
+    train.add_argument('--chunk-size', type=int, default=10000)
+    train.add_argument('--epochs', type=int, default=1)
+    train.add_argument('--workers', type=int, default=None,
+                       help='preprocessing processes (default: one per core; 0 runs in-process)')
+    train.add_argument('--vectorizer', default='vectorizer.pkl', help='where to save the vectorizer')
+    train.add_argument('--model', default='fake_news_model.pkl', help='where to save the model')
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        detector = FakeNewsDetector()
+        metrics = detector.train_streaming(
+            args.input, fmt=args.format, text_field=args.text_field, label_field=args.label_field,
+            chunk_size=args.chunk_size, epochs=args.epochs, workers=args.workers
+        )
+        print("Training Metrics:")
+        for metric, value in metrics.items():
+            print(f"  {metric}: {value:.4f}")
+        detector.save_model(args.vectorizer, args.model)
+        return
+
+    # Prefer the memory-mapped bundle when present, like the web app
+    if os.path.isdir(args.model_bundle):
+        model_paths = (args.model_bundle, None)
+    else:
+        model_paths = (args.vectorizer, args.model)
+
+    score_corpus(
+        args.input, args.output, *model_paths, fmt=args.format, text_field=args.text_field,
+        id_field=args.id_field or None, chunk_size=args.chunk_size, workers=args.workers,
+        resume=args.resume, progress_interval=args.progress_interval
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Lean, sklearn-free inference for TF-IDF + logistic regression models.
+
+`compile_model` turns a fitted TfidfVectorizer and binary LogisticRegression
+into plain NumPy arrays: a sorted UTF-8 term table (looked up with
+np.searchsorted instead of a Python dict), idf weights and coefficients.
+The compiled pair mirrors the sklearn attributes the detector relies on
+(`transform`, `predict_proba`, `classes_`, `coef_`, ...), so it can stand in
+for the originals. Export the pickled artifacts with:
+
+    python compiled_model.py vectorizer.pkl fake_news_model.pkl fake_news_model.npz
+"""
+import json
+import re
+import sys
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# CSR-style rows; exposes the same attributes as a scipy csr_matrix
+SparseRows = namedtuple('SparseRows', ['data', 'indices', 'indptr', 'shape'])
+
+
+class CompiledVectorizer:
+    """NumPy reimplementation of a fitted TfidfVectorizer's transform"""
+
+    def __init__(self, terms: np.ndarray, idf: Optional[np.ndarray], token_pattern: str,
+                 ngram_range: Tuple[int, int] = (1, 1), lowercase: bool = True,
+                 norm: Optional[str] = 'l2', sublinear_tf: bool = False, binary: bool = False):
+        if norm not in ('l1', 'l2', None):
+            raise ValueError(f"Unsupported norm {norm!r}")
+        if len(terms) and not np.all(terms[:-1] < terms[1:]):
+            raise ValueError("terms must be sorted and unique")
+
+        self.terms = terms
+        self.idf_ = idf
+        self.token_pattern = token_pattern
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self._findall = re.compile(token_pattern).findall
+
+    @property
+    def n_features(self) -> int:
+        return len(self.terms)
+
+    def get_feature_names_out(self) -> np.ndarray:
+        return np.array([term.decode('utf-8') for term in self.terms], dtype=object)
+
+    def get_params(self) -> Dict[str, any]:
+        return {
+            'token_pattern': self.token_pattern, 'ngram_range': self.ngram_range,
+            'lowercase': self.lowercase, 'norm': self.norm,
+            'sublinear_tf': self.sublinear_tf, 'binary': self.binary
+        }
+
+    def _ngrams(self, tokens: List[str]) -> List[str]:
+        # Same n-gram order as sklearn's _word_ngrams
+        min_n, max_n = self.ngram_range
+        grams = list(tokens) if min_n == 1 else []
+        space_join = ' '.join
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            grams.extend(space_join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform(self, texts: List[str]) -> SparseRows:
+        """Vectorize raw texts into L2-normalized TF-IDF rows"""
+        n_docs = len(texts)
+        grams = []
+        lengths = np.empty(n_docs, dtype=np.int64)
+        for i, text in enumerate(texts):
+            if self.lowercase:
+                text = text.lower()
+            doc_grams = self._ngrams(self._findall(text))
+            lengths[i] = len(doc_grams)
+            grams.extend(doc_grams)
+
+        rows = np.empty(0, dtype=np.int64)
+        cols = np.empty(0, dtype=np.int64)
+        data = np.empty(0, dtype=np.float64)
+        if grams and self.n_features:
+            # Binary search in the sorted term table replaces the vocabulary dict.
+            # Grams longer than the longest term cannot match; they are blanked
+            # so the array stays as wide as the term table, not the longest token
+            width = self.terms.dtype.itemsize
+            encoded = [gram.encode('utf-8') for gram in grams]
+            fits = np.fromiter((len(gram) <= width for gram in encoded), dtype=bool, count=len(encoded))
+            encoded = np.array([gram if fits[i] else b'' for i, gram in enumerate(encoded)], dtype=self.terms.dtype)
+            positions = np.minimum(np.searchsorted(self.terms, encoded), self.n_features - 1)
+            found = (self.terms[positions] == encoded) & fits
+
+            doc_ids = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)[found]
+            keys = doc_ids * self.n_features + positions[found]
+            keys, counts = np.unique(keys, return_counts=True)
+            rows, cols = np.divmod(keys, self.n_features)
+            data = counts.astype(np.float64)
+
+        if self.binary:
+            data[:] = 1.0
+        if self.sublinear_tf:
+            data = np.log(data) + 1.0
+        if self.idf_ is not None:
+            data = data * self.idf_[cols]
+        if self.norm is not None:
+            weights = data * data if self.norm == 'l2' else np.abs(data)
+            norms = np.bincount(rows, weights=weights, minlength=n_docs)
+            if self.norm == 'l2':
+                norms = np.sqrt(norms)
+            norms[norms == 0.0] = 1.0
+            data = data / norms[rows]
+
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_docs), out=indptr[1:])
+        return SparseRows(data, cols.astype(np.int32), indptr, (n_docs, self.n_features))
+
+
+class CompiledClassifier:
+    """NumPy reimplementation of a binary LogisticRegression's predict_proba"""
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray):
+        if coef.shape[0] != 1 or len(classes) != 2:
+            raise ValueError("Only binary classifiers can be compiled")
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+
+    def decision_function(self, X) -> np.ndarray:
+        """Linear scores for CSR-style rows (SparseRows or scipy csr)"""
+        n_docs = X.shape[0]
+        rows = np.repeat(np.arange(n_docs), np.diff(X.indptr))
+        contributions = X.data * self.coef_[0][X.indices]
+        return np.bincount(rows, weights=contributions, minlength=n_docs) + self.intercept_[0]
+
+    def predict_proba(self, X) -> np.ndarray:
+        probability_fake = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - probability_fake, probability_fake])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def compile_model(vectorizer, model) -> Tuple[CompiledVectorizer, CompiledClassifier]:
+    """Compile a fitted TfidfVectorizer and binary LogisticRegression"""
+    unsupported = {
+        'analyzer': 'word', 'preprocessor': None, 'tokenizer': None,
+        'stop_words': None, 'strip_accents': None
+    }
+    if not hasattr(vectorizer, 'vocabulary_'):
+        raise ValueError(f"Cannot compile a {type(vectorizer).__name__} without a fitted vocabulary")
+    params = vectorizer.get_params()
+    for name, default in unsupported.items():
+        if params.get(name, default) != default:
+            raise ValueError(f"Cannot compile a vectorizer with {name}={params[name]!r}")
+
+    names = vectorizer.get_feature_names_out()
+    terms = np.array([name.encode('utf-8') for name in names])
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    idf = np.asarray(vectorizer.idf_, dtype=np.float64) if getattr(vectorizer, 'use_idf', False) else None
+
+    # sklearn assigns indices in sorted order, but don't rely on it
+    order = np.argsort(terms, kind='stable')
+    terms, coef = terms[order], coef[:, order]
+    if idf is not None:
+        idf = idf[order]
+
+    compiled_vectorizer = CompiledVectorizer(
+        terms, idf, params['token_pattern'], params['ngram_range'], params['lowercase'],
+        params['norm'], params['sublinear_tf'], params['binary']
+    )
+    compiled_model = CompiledClassifier(
+        coef, np.asarray(model.intercept_, dtype=np.float64), np.asarray(model.classes_)
+    )
+    return compiled_vectorizer, compiled_model
+
+
+def ensure_compiled(vectorizer, model) -> Tuple[CompiledVectorizer, CompiledClassifier]:
+    """Compile sklearn objects; already compiled ones are returned as-is"""
+    if isinstance(vectorizer, CompiledVectorizer) and isinstance(model, CompiledClassifier):
+        return vectorizer, model
+    return compile_model(vectorizer, model)
+
+
+def save_compiled(path: str, vectorizer: CompiledVectorizer, model: CompiledClassifier):
+    """Write the compiled arrays to a single .npz file (no pickles)"""
+    config = dict(vectorizer.get_params(), format_version=FORMAT_VERSION)
+    arrays = {
+        'terms': vectorizer.terms,
+        'coef': model.coef_,
+        'intercept': model.intercept_,
+        'classes': model.classes_,
+        'config': np.array(json.dumps(config)),
+    }
+    if vectorizer.idf_ is not None:
+        arrays['idf'] = vectorizer.idf_
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def load_compiled(path: str) -> Tuple[CompiledVectorizer, CompiledClassifier]:
+    """Read a file written by save_compiled"""
+    with np.load(path, allow_pickle=False) as arrays:
+        config = json.loads(str(arrays['config']))
+        if config.pop('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format in {path}")
+        vectorizer = CompiledVectorizer(
+            arrays['terms'], arrays['idf'] if 'idf' in arrays else None, **config
+        )
+        model = CompiledClassifier(arrays['coef'], arrays['intercept'], arrays['classes'])
+    return vectorizer, model
+
+
+def export_compiled(vectorizer_path: str, model_path: str, output_path: str):
+    """Compile pickled sklearn artifacts into a lean .npz artifact"""
+    import joblib
+    save_compiled(output_path, *compile_model(joblib.load(vectorizer_path), joblib.load(model_path)))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        sys.exit(f"usage: {sys.argv[0]} VECTORIZER_PKL MODEL_PKL OUTPUT_NPZ")
+    export_compiled(*sys.argv[1:])
+    print(f"Compiled model written to {sys.argv[3]}")
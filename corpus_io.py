@@ -0,0 +1,135 @@
+"""Streaming readers for JSONL, CSV and TSV article corpora.
+
+Records are yielded one at a time, so files of any size can be processed
+with bounded memory. Each record is an `(index, id, text, error, label)`
+tuple; unreadable rows yield an error instead of stopping the whole run.
+Labels are only read when a `label_field` is given (training corpora).
+"""
+import csv
+import itertools
+import json
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+
+class CorpusRecord(NamedTuple):
+    index: int
+    id: Optional[str]
+    text: Optional[str]
+    error: Optional[str] = None
+    label: Optional[int] = None
+
+
+FORMATS = ('jsonl', 'csv', 'tsv')
+
+# Article bodies can exceed the csv module's default 128 KiB field limit
+MAX_CSV_FIELD_CHARS = 64 * 1024 * 1024
+
+
+def detect_format(path: str) -> str:
+    """Guess the corpus format from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    if extension == '.csv':
+        return 'csv'
+    if extension == '.tsv':
+        return 'tsv'
+    raise ValueError(f"Cannot detect the format of {path}; pass --format jsonl, csv or tsv")
+
+
+def _field(row: dict, name: Optional[str]) -> Optional[str]:
+    if name is None or row.get(name) is None:
+        return None
+    return str(row[name])
+
+
+def _record(index: int, row: dict, text_field: str, id_field: Optional[str],
+            label_field: Optional[str]) -> CorpusRecord:
+    record_id = _field(row, id_field)
+    text = row.get(text_field)
+    if not isinstance(text, str):
+        return CorpusRecord(index, record_id, None, f"missing '{text_field}' field")
+    if label_field is None:
+        return CorpusRecord(index, record_id, text)
+    label = _label(row.get(label_field))
+    if label is None:
+        return CorpusRecord(index, record_id, None, f"missing or invalid '{label_field}' field (expected 0 or 1)")
+    return CorpusRecord(index, record_id, text, label=label)
+
+
+def _label(value) -> Optional[int]:
+    """Parse a 0/1 label, also written as a float ("1.0"); None if invalid"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number in (0, 1) else None
+
+
+def read_jsonl(f, text_field: str = 'text', id_field: Optional[str] = 'id',
+               label_field: Optional[str] = None, skip: int = 0) -> Iterator[CorpusRecord]:
+    """Yield records from a file of one JSON object per line, after the first `skip`"""
+    index = 0
+    for line in f:
+        if not line.strip():
+            continue
+        if index < skip:
+            # Skipped records are counted, not parsed
+            index += 1
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield CorpusRecord(index, None, None, f"invalid JSON: {e}")
+        else:
+            if not isinstance(row, dict):
+                yield CorpusRecord(index, None, None, 'record is not a JSON object')
+            else:
+                yield _record(index, row, text_field, id_field, label_field)
+        index += 1
+
+
+def read_csv(f, text_field: str = 'text', id_field: Optional[str] = 'id',
+             label_field: Optional[str] = None, delimiter: str = ',', skip: int = 0) -> Iterator[CorpusRecord]:
+    """Yield records from a CSV file with a header row, after the first `skip`"""
+    if csv.field_size_limit() < MAX_CSV_FIELD_CHARS:
+        csv.field_size_limit(MAX_CSV_FIELD_CHARS)
+    reader = csv.DictReader(f, delimiter=delimiter)
+    if reader.fieldnames is not None and text_field not in reader.fieldnames:
+        raise ValueError(f"CSV header has no '{text_field}' column")
+    for index, row in enumerate(itertools.islice(reader, skip, None), skip):
+        yield _record(index, row, text_field, id_field, label_field)
+
+
+def read_corpus(f, fmt: str, text_field: str = 'text', id_field: Optional[str] = 'id',
+                label_field: Optional[str] = None, skip: int = 0) -> Iterator[CorpusRecord]:
+    """Yield records from an open JSONL, CSV or TSV file, after the first `skip`"""
+    if fmt == 'jsonl':
+        return read_jsonl(f, text_field, id_field, label_field, skip)
+    if fmt in ('csv', 'tsv'):
+        return read_csv(f, text_field, id_field, label_field, '\t' if fmt == 'tsv' else ',', skip)
+    raise ValueError(f"Unknown corpus format {fmt!r}")
+
+
+def chunked(records: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most `size` items.
+
+    If the iterable raises, the items read so far are yielded as a final
+    chunk before the error propagates.
+    """
+    iterator = iter(records)
+    while True:
+        chunk = []
+        try:
+            for item in iterator:
+                chunk.append(item)
+                if len(chunk) == size:
+                    break
+        except Exception:
+            if chunk:
+                yield chunk
+            raise
+        if not chunk:
+            return
+        yield chunk
@@ -1,72 +1,226 @@
+import hashlib
 import os
-import ssl
 import re
 import string
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import joblib
-
-# Fix SSL certificate verification for NLTK downloads
-import ssl
-if (not os.environ.get('PYTHONHTTPSVERIFY', '') and
-    getattr(ssl, '_create_unverified_context', None)): 
-    ssl._create_default_https_context = ssl._create_unverified_context
-
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
+
+from metrics import StageTimer
+from prediction_cache import PredictionCache
+
+# NLTK data shipped with the repository, so no download is ever needed
+BUNDLED_NLTK_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+
+
+@lru_cache(maxsize=None)
+def load_stop_words(language: str = 'english') -> FrozenSet[str]:
+    """Resolve a stopword list without touching the network.
+
+    The copy bundled under ``nltk_data/`` is used when present; otherwise
+    the list is looked up in NLTK's local data directories (``NLTK_DATA``,
+    ``~/nltk_data``, ...). Nothing is ever downloaded.
+    """
+    bundled_path = os.path.join(BUNDLED_NLTK_DATA, 'corpora', 'stopwords', language)
+    if os.path.exists(bundled_path):
+        with open(bundled_path, encoding='utf-8') as f:
+            return frozenset(line.strip() for line in f if line.strip())
+    
+    import nltk
+    try:
+        path = nltk.data.find(f'corpora/stopwords/{language}')
+    except LookupError:
+        raise LookupError(
+            f"Stopwords for {language!r} not found in {BUNDLED_NLTK_DATA} or the "
+            f"NLTK data path; install them with nltk.download('stopwords')"
+        ) from None
+    with open(path, encoding='utf-8') as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+
+# Precompiled patterns for the fast preprocessing path
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]+')
+
+# Patterns and tokenizer options of the reference NLTK path
+NLTK_URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+NLTK_EMAIL_PATTERN = re.compile(r'\S+@\S+')
+NLTK_NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+NLTK_TOKENIZE_OPTIONS = {'preserve_line': True}
+
+# Whole words that NLTK's word_tokenize splits in two (MacIntyre contractions).
+# The fast path expands them so both tokenizers produce identical output.
+TOKENIZER_CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+TOKENIZERS = ('fast', 'nltk')
+
+# Bump whenever preprocessing output changes, so cached features are rebuilt
+PREPROCESSING_VERSION = 1
+
+
+def build_word_table(stop_words: Iterable[str]) -> Dict[str, str]:
+    """Map each word needing special handling to its preprocessed form.
+
+    Stopwords map to '' and contractions map to their expansion with
+    stopwords removed, so a single dict lookup per token replaces both
+    the contraction split and the stopword filter.
+    """
+    stop_words = set(stop_words)
+    table = {word: '' for word in stop_words}
+    for word, parts in TOKENIZER_CONTRACTIONS.items():
+        table[word] = ' '.join(part for part in parts if part not in stop_words)
+    return table
+
 
 class FakeNewsDetector:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2))
-        self.model = LogisticRegression(max_iter=1000)
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, tokenizer: str = 'fast', cache_size: int = 1024,
+                 cache_ttl: Optional[float] = None):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer {tokenizer!r}, expected one of {TOKENIZERS}")
+        
+        # sklearn is only imported once a model is trained or loaded
+        self.vectorizer = None
+        self.model = None
+        self.model_version = None
+        self.tokenizer = tokenizer
+        self.stop_words = load_stop_words('english')
+        
+        # Predictions keyed on preprocessed text + model version; 0 disables
+        self.cache = PredictionCache(cache_size, cache_ttl) if cache_size else None
+        
+        # Optional timing hook called as stage_observer(stage, seconds) for
+        # each predict_batch and explain stage; None (the default) skips all timing
+        self.stage_observer = None
+        
+        # Feature names of the loaded vocabulary, built on first explain()
+        self._feature_names_out = None
+    
+    @property
+    def stop_words(self) -> set:
+        return self._stop_words
+    
+    @stop_words.setter
+    def stop_words(self, stop_words: Iterable[str]):
+        # Keep the fast path's lookup table in sync with the stopword set
+        self._stop_words = set(stop_words)
+        self._word_table = build_word_table(self._stop_words)
         
     def preprocess_text(self, text: str) -> str:
         """Clean and preprocess text data"""
+        if self.tokenizer == 'fast':
+            return self._preprocess_text_fast(text)
+        return self._preprocess_text_nltk(text)
+    
+    def preprocessing_fingerprint(self) -> str:
+        """Hash everything that determines preprocess_text's output"""
+        digest = hashlib.blake2b(digest_size=16)
+        if self.tokenizer == 'fast':
+            patterns = (URL_PATTERN, EMAIL_PATTERN, NON_ALPHA_PATTERN)
+            steps = sorted(TOKENIZER_CONTRACTIONS.items())
+        else:
+            import nltk
+            patterns = (NLTK_URL_PATTERN, NLTK_EMAIL_PATTERN, NLTK_NON_ALPHA_PATTERN, WHITESPACE_PATTERN)
+            steps = (nltk.__version__, sorted(NLTK_TOKENIZE_OPTIONS.items()))
+        config = (
+            PREPROCESSING_VERSION, self.tokenizer, [(pattern.pattern, pattern.flags) for pattern in patterns],
+            steps, sorted(self.stop_words)
+        )
+        digest.update(repr(config).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def preprocess_many(self, texts: Iterable[str]) -> Iterator[str]:
+        """Lazily preprocess an iterable of texts"""
+        if self.tokenizer == 'fast':
+            preprocess = self._preprocess_text_fast
+        else:
+            preprocess = self._preprocess_text_nltk
+        for text in texts:
+            yield preprocess(text)
+    
+    def _preprocess_text_fast(self, text: str) -> str:
+        """Precompiled, NLTK-free equivalent of _preprocess_text_nltk"""
+        text = text.lower()
+        text = URL_PATTERN.sub('', text)
+        text = EMAIL_PATTERN.sub('', text)
+        text = NON_ALPHA_PATTERN.sub('', text)
+        
+        # Only letters and whitespace are left, so str.split() yields the same
+        # tokens as word_tokenize (both split on Unicode whitespace)
+        words = text.split()
+        table = self._word_table
+        return ' '.join(filter(None, map(table.get, words, words)))
+    
+    def _preprocess_text_nltk(self, text: str) -> str:
+        """Reference preprocessing pipeline using NLTK's word_tokenize"""
         # Convert to lowercase
         text = text.lower()
         
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = NLTK_URL_PATTERN.sub('', text)
         
         # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        text = NLTK_EMAIL_PATTERN.sub('', text)
         
         # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = NLTK_NON_ALPHA_PATTERN.sub('', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
-        # Remove stopwords
-        words = word_tokenize(text)
+        # Remove stopwords. All sentence punctuation is gone by now, so Punkt
+        # sentence splitting is a no-op and its data files are not needed.
+        from nltk.tokenize import word_tokenize
+        words = word_tokenize(text, **NLTK_TOKENIZE_OPTIONS)
         words = [word for word in words if word not in self.stop_words]
         
         return ' '.join(words)
     
-    def train(self, texts: List[str], labels: List[int]) -> Dict[str, float]:
-        """Train the fake news detection model"""
-        # Preprocess texts
-        processed_texts = [self.preprocess_text(text) for text in texts]
+    def train(self, texts: List[str], labels: List[int], feature_cache=None) -> Dict[str, float]:
+        """Train the fake news detection model.
+        
+        `feature_cache` (a FeatureCache or a directory path) reuses
+        preprocessed text and TF-IDF matrices from earlier runs on the same
+        documents; see feature_cache.py.
+        """
+        from sklearn.base import BaseEstimator
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+        from sklearn.model_selection import train_test_split
+        
+        # Loaded sklearn estimators are refit with their own settings; compiled
+        # or bundled models cannot be fit, so they are replaced by fresh ones
+        if not isinstance(self.vectorizer, BaseEstimator):
+            self.vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2))
+        if not isinstance(self.model, BaseEstimator):
+            self.model = LogisticRegression(max_iter=1000)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            processed_texts, labels, test_size=0.2, random_state=42
-        )
+        split = {'test_size': 0.2, 'random_state': 42}
+        train_index, test_index = train_test_split(np.arange(len(texts)), **split)
+        labels = np.asarray(labels)
+        y_train, y_test = labels[train_index], labels[test_index]
         
-        # Vectorize
-        X_train_vec = self.vectorizer.fit_transform(X_train)
-        X_test_vec = self.vectorizer.transform(X_test)
+        # Preprocess and vectorize
+        if feature_cache is None:
+            processed_texts = list(self.preprocess_many(texts))
+            X_train_vec = self.vectorizer.fit_transform([processed_texts[i] for i in train_index])
+            X_test_vec = self.vectorizer.transform([processed_texts[i] for i in test_index])
+        else:
+            X_train_vec, X_test_vec = self._cached_features(feature_cache, texts, train_index, test_index, split)
         
         # Train model
         self.model.fit(X_train_vec, y_train)
+        self._model_changed()
         
         # Evaluate
         y_pred = self.model.predict(X_test_vec)
@@ -79,30 +233,264 @@ class FakeNewsDetector:
         
         return metrics
     
+    def _cached_features(self, feature_cache, texts: List[str], train_index: np.ndarray,
+                         test_index: np.ndarray, split: Dict[str, any]):
+        """Vectorize through the feature cache, fitting the vectorizer only on a miss"""
+        import joblib
+        from feature_cache import FeatureCache, document_hash
+        
+        if not isinstance(feature_cache, FeatureCache):
+            feature_cache = FeatureCache(feature_cache)
+        doc_hashes = [document_hash(text) for text in texts]
+        key = feature_cache.matrix_key(
+            doc_hashes, self.preprocessing_fingerprint(), type(self.vectorizer).__name__,
+            sorted(self.vectorizer.get_params().items()), sorted(split.items())
+        )
+        
+        cached = feature_cache.load_matrices(key)
+        if cached is not None:
+            matrices, path = cached
+            self.vectorizer = joblib.load(os.path.join(path, 'vectorizer.pkl'))
+            return matrices['train'], matrices['test']
+        
+        processed_texts = feature_cache.preprocess(self, texts, doc_hashes)
+        X_train_vec = self.vectorizer.fit_transform([processed_texts[i] for i in train_index])
+        X_test_vec = self.vectorizer.transform([processed_texts[i] for i in test_index])
+        feature_cache.store_matrices(
+            key, {'train': X_train_vec, 'test': X_test_vec},
+            {'vectorizer.pkl': lambda path: joblib.dump(self.vectorizer, path)}
+        )
+        return X_train_vec, X_test_vec
+    
+    def train_streaming(self, corpus_path: str, **options) -> Dict[str, float]:
+        """Train out-of-core on a labelled JSONL/CSV file (see streaming_training.py)"""
+        from streaming_training import train_streaming
+        return train_streaming(self, corpus_path, **options)
+    
     def predict(self, text: str) -> Dict[str, any]:
         """Predict if a text is fake news"""
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+        """Predict fake news for many texts in a single vectorized pass"""
+        if not texts:
+            return []
+        
+        if self.vectorizer is None or self.model is None:
+            raise ValueError("Model is not trained; call train() or load_model() first")
+        
+        timer = StageTimer(self.stage_observer) if self.stage_observer is not None else None
+        processed_texts = list(self.preprocess_many(texts))
+        if timer is not None:
+            timer.mark('preprocess')
+        return self._predict_processed(processed_texts, timer)
+    
+    def predict_processed(self, processed_texts: List[str]) -> List[Dict[str, any]]:
+        """Like predict_batch, for texts already run through preprocess_text"""
+        if not processed_texts:
+            return []
+        
+        if self.vectorizer is None or self.model is None:
+            raise ValueError("Model is not trained; call train() or load_model() first")
+        
+        timer = StageTimer(self.stage_observer) if self.stage_observer is not None else None
+        return self._predict_processed(processed_texts, timer)
+    
+    def _predict_processed(self, processed_texts: List[str],
+                           timer: Optional[StageTimer]) -> List[Dict[str, any]]:
+        cache = self.cache
+        if cache is not None:
+            keys = [self._cache_key(text) for text in processed_texts]
+            results = [cache.get(key) for key in keys]
+            if timer is not None:
+                timer.mark('cache_lookup')
+        else:
+            results = [None] * len(processed_texts)
+        
+        # Score each distinct uncached text once
+        pending = {}
+        for i, (text, result) in enumerate(zip(processed_texts, results)):
+            if result is None:
+                pending.setdefault(text, []).append(i)
+        
+        if pending:
+            scored = self._score_processed(list(pending), timer)
+            for indices, result in zip(pending.values(), scored):
+                for i in indices:
+                    results[i] = result
+                if cache is not None:
+                    cache.put(keys[indices[0]], result)
+        
+        # Hand out copies so callers cannot mutate cached results
+        return [dict(result) for result in results]
+    
+    def _score_processed(self, processed_texts: List[str],
+                         timer: Optional[StageTimer] = None) -> List[Dict[str, any]]:
+        """Vectorize and score already preprocessed texts"""
+        text_vecs = self.vectorizer.transform(processed_texts)
+        if timer is not None:
+            timer.mark('transform')
+        
+        results = self._predict_vectors(text_vecs)
+        if timer is not None:
+            timer.mark('predict_proba')
+        return results
+
+    def _predict_vectors(self, text_vecs) -> List[Dict[str, any]]:
+        """Score vectorized texts"""
+        # One predict_proba call for the whole batch; the label is the
+        # argmax of the probabilities, which is what model.predict returns
+        probabilities = self.model.predict_proba(text_vecs)
+        predictions = self.model.classes_[probabilities.argmax(axis=1)]
+        
+        return [
+            {
+                'is_fake': bool(prediction),
+                'confidence': float(probability.max()),
+                'probability_fake': float(probability[1]),
+                'probability_real': float(probability[0])
+            }
+            for prediction, probability in zip(predictions, probabilities)
+        ]
+    
+    def explain(self, text: str, top_k: int = 10) -> Dict[str, any]:
+        """Predict a text and report the n-grams that contributed most to the score.
+
+        The model is linear over TF-IDF, so each n-gram's contribution to the
+        log-odds of fake news is its TF-IDF weight times its coefficient. The
+        contributions come from the same sparse row as the prediction, at the
+        cost of one extra multiply over the row's nonzeros.
+        """
+        if self.vectorizer is None or self.model is None:
+            raise ValueError("Model is not trained; call train() or load_model() first")
+
+        timer = StageTimer(self.stage_observer) if self.stage_observer is not None else None
         processed_text = self.preprocess_text(text)
+        if timer is not None:
+            timer.mark('preprocess')
         text_vec = self.vectorizer.transform([processed_text])
+        if timer is not None:
+            timer.mark('transform')
+        result, = self._predict_vectors(text_vec)
+        if timer is not None:
+            timer.mark('predict_proba')
+
+        columns = np.asarray(text_vec.indices[text_vec.indptr[0]:text_vec.indptr[1]])
+        weights = np.asarray(text_vec.data[text_vec.indptr[0]:text_vec.indptr[1]])
+        contributions = weights * np.asarray(self.model.coef_[0])[columns]
+        top = np.argsort(-np.abs(contributions), kind='stable')[:max(top_k, 0)]
+        names = self._feature_names(processed_text, columns[top])
+        result['intercept'] = float(self.model.intercept_[0])
+        result['contributions'] = [
+            {'term': names[column], 'tfidf': float(weights[i]), 'contribution': float(contributions[i])}
+            for i, column in zip(top, columns[top])
+        ]
+        if timer is not None:
+            timer.mark('explain')
+        return result
+
+    def _feature_names(self, processed_text: str, columns: np.ndarray) -> Dict[int, str]:
+        """Map feature columns of a transformed text back to their n-grams"""
+        terms = getattr(self.vectorizer, 'terms', None)
+        if terms is not None:
+            # Compiled vectorizer: the column indexes the sorted term table
+            return {int(column): terms[column].decode('utf-8') for column in columns}
+        if hasattr(self.vectorizer, 'vocabulary_'):
+            if self._feature_names_out is None:
+                self._feature_names_out = self.vectorizer.get_feature_names_out()
+            return {int(column): str(self._feature_names_out[column]) for column in columns}
+
+        # Hashing vectorizer: hash this text's own n-grams to find their columns
+        from sklearn.feature_extraction import FeatureHasher
+        grams = sorted(set(self.vectorizer.build_analyzer()(processed_text)))
+        hasher = FeatureHasher(self.vectorizer.n_features, input_type='string', alternate_sign=False)
+        gram_columns = hasher.transform([[gram] for gram in grams]).indices if grams else []
+        names = {}
+        for gram, column in zip(grams, map(int, gram_columns)):
+            # Colliding n-grams share a column and are reported together
+            names[column] = f"{names[column]} | {gram}" if column in names else gram
+        return {int(column): names.get(int(column), '') for column in columns}
+
+    def _cache_key(self, processed_text: str) -> Tuple[str, bytes]:
+        digest = hashlib.blake2b(processed_text.encode('utf-8'), digest_size=16).digest()
+        return self.model_version, digest
+    
+    def _model_changed(self, model_version: Optional[str] = None):
+        """Refresh the model fingerprint and drop predictions of the old model"""
+        self.model_version = model_version or self.compute_model_version()
+        self._feature_names_out = None
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def compute_model_version(self) -> str:
+        """Fingerprint the loaded vectorizer and model from their learned state"""
+        digest = hashlib.blake2b(digest_size=8)
+        for obj in (self.vectorizer, self.model):
+            digest.update(type(obj).__name__.encode('utf-8'))
+            if hasattr(obj, 'get_params'):
+                digest.update(repr(sorted(obj.get_params().items())).encode('utf-8'))
         
-        prediction = self.model.predict(text_vec)[0]
-        probability = self.model.predict_proba(text_vec)[0]
+        for array in (getattr(self.model, 'coef_', None),
+                      getattr(self.model, 'intercept_', None),
+                      getattr(self.vectorizer, 'idf_', None)):
+            if array is not None:
+                digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
         
-        return {
-            'is_fake': bool(prediction),
-            'confidence': max(probability),
-            'probability_fake': probability[1],
-            'probability_real': probability[0]
-        }
+        vocabulary = getattr(self.vectorizer, 'vocabulary_', None)
+        if vocabulary is not None:
+            digest.update('\n'.join(sorted(vocabulary, key=vocabulary.get)).encode('utf-8'))
+        elif getattr(self.vectorizer, 'terms', None) is not None:
+            # Compiled term table; hashed in place so memory-mapped pages stay shared
+            digest.update(np.ascontiguousarray(self.vectorizer.terms).tobytes())
+        
+        return digest.hexdigest()
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """Return prediction cache counters (empty if caching is disabled)"""
+        return self.cache.stats() if self.cache is not None else {}
     
-    def save_model(self, vectorizer_path: str, model_path: str):
-        """Save the trained model and vectorizer"""
+    def save_model(self, vectorizer_path: str, model_path: Optional[str] = None):
+        """Save the trained model and vectorizer.
+        
+        With a single path, a versioned, memory-mappable model bundle
+        directory is written instead of two pickles (see model_bundle.py).
+        """
+        if model_path is None:
+            from model_bundle import write_bundle
+            write_bundle(vectorizer_path, self.vectorizer, self.model, self.model_version)
+            return
+        
+        import joblib
         joblib.dump(self.vectorizer, vectorizer_path)
         joblib.dump(self.model, model_path)
     
-    def load_model(self, vectorizer_path: str, model_path: str):
-        """Load a pre-trained model and vectorizer"""
+    def load_model(self, vectorizer_path: str, model_path: Optional[str] = None):
+        """Load a pre-trained model and vectorizer.
+        
+        With a single path, a model bundle directory is opened with its
+        arrays memory-mapped, so worker processes share the same pages.
+        """
+        if model_path is None:
+            from model_bundle import read_bundle, read_manifest
+            self.vectorizer, self.model = read_bundle(vectorizer_path)
+            self._model_changed(read_manifest(vectorizer_path).get('model_version'))
+            return
+        
+        import joblib
         self.vectorizer = joblib.load(vectorizer_path)
         self.model = joblib.load(model_path)
+        self._model_changed()
+    
+    def save_compiled(self, path: str):
+        """Compile the trained model to NumPy arrays and save it as .npz"""
+        from compiled_model import ensure_compiled, save_compiled
+        save_compiled(path, *ensure_compiled(self.vectorizer, self.model))
+    
+    def load_compiled(self, path: str):
+        """Load a compiled model; inference then runs without sklearn"""
+        from compiled_model import load_compiled
+        self.vectorizer, self.model = load_compiled(path)
+        self._model_changed()
 
 
 def create_sample_dataset() -> Tuple[List[str], List[int]]:
@@ -0,0 +1,159 @@
+"""Content-addressed on-disk cache of preprocessed text and feature matrices.
+
+Two layers, both keyed by content rather than by file name:
+
+- Preprocessed text lives in a SQLite table keyed by a hash of the raw
+  document plus `FakeNewsDetector.preprocessing_fingerprint()` (stopwords,
+  regex pipeline, tokenizer and PREPROCESSING_VERSION), so any change to
+  preprocessing misses the cache instead of serving stale text.
+- The train/test TF-IDF matrices of a `train()` run are stored as CSR
+  ``.npy`` arrays, keyed by the ordered document hashes, the preprocessing
+  fingerprint, the vectorizer parameters and the split. Repeat runs open
+  them with ``np.load(mmap_mode='r')`` and go straight to fitting.
+
+Entries are never evicted; delete the directory (or call `clear()`) to
+reclaim space.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MATRIX_ARRAYS = ('data', 'indices', 'indptr')
+
+# SQLite's default limit on host parameters per statement is 999
+_LOOKUP_BATCH = 500
+
+
+def document_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class FeatureCache:
+    """Cache preprocessing and vectorization results under `directory`"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, 'matrices'), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'texts.sqlite'), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS processed (key BLOB PRIMARY KEY, text TEXT NOT NULL)')
+        self._lock = threading.Lock()
+        self.text_hits = 0
+        self.text_misses = 0
+        self.matrix_hits = 0
+        self.matrix_misses = 0
+
+    def preprocess(self, detector, texts: List[str], doc_hashes: Optional[List[bytes]] = None) -> List[str]:
+        """Return detector.preprocess_text for each text, computing only misses"""
+        if doc_hashes is None:
+            doc_hashes = [document_hash(text) for text in texts]
+        fingerprint = bytes.fromhex(detector.preprocessing_fingerprint())
+        keys = [hashlib.blake2b(fingerprint + doc_hash, digest_size=16).digest() for doc_hash in doc_hashes]
+
+        found = {}
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for start in range(0, len(unique_keys), _LOOKUP_BATCH):
+                batch = unique_keys[start:start + _LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                found.update(self._db.execute(
+                    f'SELECT key, text FROM processed WHERE key IN ({placeholders})', batch
+                ))
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            computed = dict(zip(missing, detector.preprocess_many(missing.values())))
+            with self._lock, self._db:
+                self._db.executemany('INSERT OR IGNORE INTO processed VALUES (?, ?)', computed.items())
+            found.update(computed)
+
+        self.text_misses += sum(key in missing for key in keys)
+        self.text_hits += len(keys) - sum(key in missing for key in keys)
+        return [found[key] for key in keys]
+
+    def matrix_key(self, doc_hashes: Iterable[bytes], *config) -> str:
+        """Key a feature matrix by its documents (in order) and configuration"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(config).encode('utf-8'))
+        for doc_hash in doc_hashes:
+            digest.update(doc_hash)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, 'matrices', key)
+
+    def load_matrices(self, key: str) -> Optional[Tuple[Dict[str, any], str]]:
+        """Memory-map the matrices stored under key; returns (matrices, entry path) or None"""
+        from scipy.sparse import csr_matrix
+
+        path = self._entry_path(key)
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            self.matrix_misses += 1
+            return None
+
+        matrices = {}
+        for name, shape in meta['shapes'].items():
+            arrays = [
+                np.load(os.path.join(path, f"{name}.{array}.npy"), mmap_mode='r', allow_pickle=False)
+                for array in MATRIX_ARRAYS
+            ]
+            matrices[name] = csr_matrix(tuple(arrays), shape=tuple(shape), copy=False)
+        self.matrix_hits += 1
+        return matrices, path
+
+    def store_matrices(self, key: str, matrices: Dict[str, any], extra_files: Dict[str, callable] = None) -> str:
+        """Write CSR matrices (and extra files via writer callbacks) under key"""
+        path = self._entry_path(key)
+        staging = tempfile.mkdtemp(prefix='.entry-', dir=os.path.dirname(path))
+        try:
+            shapes = {}
+            for name, matrix in matrices.items():
+                matrix = matrix.tocsr()
+                for array in MATRIX_ARRAYS:
+                    np.save(os.path.join(staging, f"{name}.{array}.npy"), getattr(matrix, array),
+                            allow_pickle=False)
+                shapes[name] = list(matrix.shape)
+            for filename, write in (extra_files or {}).items():
+                write(os.path.join(staging, filename))
+            # meta.json is written last: its presence marks a complete entry
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump({'shapes': shapes}, f)
+            os.rename(staging, path)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, 'meta.json')):
+                raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return path
+
+    def clear(self):
+        """Drop every cached text and matrix"""
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM processed')
+        shutil.rmtree(os.path.join(self.directory, 'matrices'), ignore_errors=True)
+        os.makedirs(os.path.join(self.directory, 'matrices'), exist_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters for both layers"""
+        return {
+            'text_hits': self.text_hits,
+            'text_misses': self.text_misses,
+            'matrix_hits': self.matrix_hits,
+            'matrix_misses': self.matrix_misses,
+        }
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,63 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from fake_news_detector import FakeNewsDetector
+
+# Per-process detector, loaded once by the pool initializer
+_detector = None
+
+
+def _load_worker_model(vectorizer_path: str, model_path: Optional[str], cache_size: int):
+    global _detector
+    _detector = FakeNewsDetector(cache_size=cache_size)
+    _detector.load_model(vectorizer_path, model_path)
+
+
+def _predict_batch(texts: List[str]) -> List[Dict[str, any]]:
+    results = _detector.predict_batch(texts)
+    for result in results:
+        result['model_version'] = _detector.model_version
+    return results
+
+
+def _worker_info() -> Dict[str, any]:
+    return {'pid': os.getpid(), 'model_version': _detector.model_version}
+
+
+class InferencePool:
+    """Run detector inference in a pool of processes.
+
+    Each worker process loads the vectorizer and model (or, when model_path
+    is None, the model bundle at vectorizer_path) once at start-up, so
+    CPU-bound scoring runs outside the caller's GIL. Workers are started
+    with the 'spawn' method, which is safe to use from threaded servers.
+    """
+
+    def __init__(self, vectorizer_path: str, model_path: Optional[str], workers: Optional[int] = None,
+                 cache_size: int = 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_load_worker_model,
+            initargs=(vectorizer_path, model_path, cache_size)
+        )
+
+    def submit_batch(self, texts: List[str]) -> Future:
+        """Schedule a batch prediction and return its future"""
+        return self._executor.submit(_predict_batch, list(texts))
+
+    async def predict_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+        """Await a batch prediction without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit_batch(texts))
+
+    def warm_up(self) -> List[Dict[str, any]]:
+        """Start every worker and load its model; returns per-worker info"""
+        futures = [self._executor.submit(_worker_info) for _ in range(self.workers)]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when the batching queue is at capacity (maps to HTTP 429)"""
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-text predictions into batched calls.
+
+    Callers submit one text each; a background thread collects queued texts
+    until `max_batch_size` items are waiting or `max_wait_ms` has passed
+    since the first one arrived, scores them with one `predict_batch` call
+    and resolves each caller's future with its own result. At most
+    `max_queue` texts may wait; beyond that `submit` raises QueueFullError.
+    After `close()`, `submit` raises RuntimeError.
+    """
+
+    _STOP = object()
+
+    def __init__(self, predict_batch: Callable[[List[str]], List[Dict[str, any]]],
+                 max_wait_ms: float = 5.0, max_batch_size: int = 32, max_queue: int = 1024):
+        if max_batch_size <= 0 or max_queue <= 0:
+            raise ValueError("max_batch_size and max_queue must be positive")
+
+        self.predict_batch = predict_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.max_queue = max_queue
+        # Unbounded so close() can always enqueue its sentinel; submit()
+        # enforces max_queue under the lock
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for scoring and return a future for its result"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._queue.qsize() >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError("Prediction queue is full")
+            self._queue.put_nowait((text, future))
+        return future
+
+    def predict(self, text: str, timeout: Optional[float] = None) -> Dict[str, any]:
+        """Score one text through the batcher, blocking until it is done.
+
+        On timeout the text is cancelled, so it is dropped if not yet scored.
+        """
+        future = self.submit(text)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._score(batch)
+                    return
+                batch.append(item)
+
+            self._score(batch)
+
+    def _score(self, batch):
+        # Skip texts whose callers gave up waiting
+        live = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        with self._lock:
+            self.cancelled += len(batch) - len(live)
+        if not live:
+            return
+        batch = live
+        futures = [future for _, future in batch]
+        try:
+            results = self.predict_batch([text for text, _ in batch])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future, result in zip(futures, results):
+                future.set_result(result)
+            if len(results) < len(futures):
+                error = RuntimeError(f"predict_batch returned {len(results)} results for {len(futures)} texts")
+                for future in futures[len(results):]:
+                    future.set_exception(error)
+
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+
+    def stats(self) -> Dict[str, float]:
+        """Return batch counters and current queue depth"""
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'rejected': self.rejected,
+                'cancelled': self.cancelled,
+                'queue_depth': self._queue.qsize(),
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0
+            }
+
+    def close(self, timeout: Optional[float] = None):
+        """Finish queued work and stop the background thread"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put_nowait(self._STOP)
+        self._thread.join(timeout)
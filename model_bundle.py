@@ -0,0 +1,182 @@
+"""Versioned, memory-mappable on-disk model bundle.
+
+A bundle is a directory holding a JSON manifest plus one ``.npy`` file per
+array (term table, idf weights, coefficients, ...). The manifest records the
+format version, the vectorizer configuration, the model fingerprint and a
+SHA-256 checksum per array file. Arrays are opened with
+``np.load(mmap_mode='r')``, so every worker process maps the same pages
+instead of unpickling private copies, and no pickle is ever executed.
+
+Each write goes to a fresh versioned directory next to the bundle, and the
+bundle path itself is a symlink that is atomically repointed at it, so a
+reader always sees either the old or the new bundle in full. The previous
+version is kept for readers still opening it; older ones are removed.
+
+Migrate the existing pickles with:
+
+    python model_bundle.py migrate vectorizer.pkl fake_news_model.pkl fake_news_model.bundle
+    python model_bundle.py info fake_news_model.bundle
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from compiled_model import CompiledClassifier, CompiledVectorizer, ensure_compiled
+
+BUNDLE_FORMAT = 'fake-news-model-bundle'
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_bundle(path: str, vectorizer, model, model_version: Optional[str] = None):
+    """Write a bundle directory, replacing any existing bundle at `path`"""
+    vectorizer, model = ensure_compiled(vectorizer, model)
+    arrays = {
+        'terms': vectorizer.terms,
+        'coef': model.coef_,
+        'intercept': model.intercept_,
+        'classes': model.classes_,
+    }
+    if vectorizer.idf_ is not None:
+        arrays['idf'] = vectorizer.idf_
+
+    path = os.path.abspath(path)
+    staging = _new_version_dir(path)
+    try:
+        files = {}
+        for array_name, array in arrays.items():
+            filename = f"{array_name}.npy"
+            np.save(os.path.join(staging, filename), np.ascontiguousarray(array), allow_pickle=False)
+            files[array_name] = {
+                'file': filename,
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'sha256': _sha256(os.path.join(staging, filename)),
+            }
+
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'format_version': BUNDLE_FORMAT_VERSION,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'model_version': model_version,
+            'vectorizer': vectorizer.get_params(),
+            'arrays': files,
+        }
+        with open(os.path.join(staging, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        _publish(path, staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _version_pattern(name: str) -> re.Pattern:
+    """Exact name pattern of a bundle's version directories, so bundles sharing a prefix never match"""
+    return re.compile(rf'\.{re.escape(name)}\.v-[0-9a-f]{{16}}')
+
+
+def _new_version_dir(path: str) -> str:
+    parent, name = os.path.split(path)
+    version_dir = os.path.join(parent, f'.{name}.v-{os.urandom(8).hex()}')
+    os.mkdir(version_dir, 0o755)
+    return version_dir
+
+
+def _publish(path: str, version_dir: str):
+    """Atomically point the `path` symlink at a finished version directory"""
+    parent, name = os.path.split(path)
+    previous = os.path.realpath(path) if os.path.islink(path) else None
+    if os.path.isdir(path) and previous is None:
+        # A bundle written before versioning is a plain directory, which a
+        # symlink cannot atomically replace; move it aside first (one-time gap)
+        previous = _new_version_dir(path)
+        os.rename(path, os.path.join(previous, 'bundle'))
+
+    link = os.path.join(parent, f'.{name}.link-{os.getpid()}')
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(version_dir), link)
+    os.replace(link, path)
+
+    # Keep the new and the previous version; remove the rest
+    keep = {os.path.realpath(version_dir), previous and os.path.realpath(previous)}
+    pattern = _version_pattern(name)
+    for entry in os.listdir(parent):
+        stale = os.path.join(parent, entry)
+        if pattern.fullmatch(entry) and os.path.realpath(stale) not in keep:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def read_manifest(path: str) -> Dict[str, any]:
+    """Read and validate a bundle manifest"""
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"{path} is not a model bundle")
+    if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported bundle format version {manifest.get('format_version')} in {path}"
+        )
+    return manifest
+
+
+def read_bundle(path: str, mmap: bool = True, verify: bool = True) -> Tuple[CompiledVectorizer, CompiledClassifier]:
+    """Open a bundle; arrays are memory-mapped read-only unless mmap=False"""
+    # Resolve the symlink once, so every file comes from the same version
+    path = os.path.realpath(path)
+    manifest = read_manifest(path)
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array_path = os.path.join(path, spec['file'])
+        if verify and _sha256(array_path) != spec['sha256']:
+            raise ValueError(f"Checksum mismatch for {array_path}")
+        array = np.load(array_path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        if array.dtype.str != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise ValueError(f"{array_path} does not match the manifest")
+        arrays[name] = array
+
+    vectorizer = CompiledVectorizer(arrays['terms'], arrays.get('idf'), **manifest['vectorizer'])
+    model = CompiledClassifier(arrays['coef'], arrays['intercept'], np.asarray(arrays['classes']))
+    return vectorizer, model
+
+
+def migrate(vectorizer_path: str, model_path: str, bundle_path: str) -> str:
+    """Convert pickled sklearn artifacts into a bundle; returns the model version"""
+    from fake_news_detector import FakeNewsDetector
+    detector = FakeNewsDetector(cache_size=0)
+    detector.load_model(vectorizer_path, model_path)
+    detector.save_model(bundle_path)
+    return read_manifest(bundle_path)['model_version']
+
+
+def main(argv):
+    if len(argv) == 4 and argv[0] == 'migrate':
+        version = migrate(*argv[1:])
+        print(f"Wrote bundle {argv[3]} (model version {version})")
+    elif len(argv) == 2 and argv[0] == 'info':
+        read_bundle(argv[1])
+        print(json.dumps(read_manifest(argv[1]), indent=2))
+    else:
+        sys.exit("usage: model_bundle.py migrate VECTORIZER_PKL MODEL_PKL BUNDLE_DIR\n"
+                 "       model_bundle.py info BUNDLE_DIR")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
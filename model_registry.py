@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from fake_news_detector import FakeNewsDetector
+
+
+class ModelRegistry:
+    """Hold the active detector and hot-swap it when artifacts change.
+
+    `loader` builds a fully loaded detector. Reloads run in the background
+    and only replace `current` once the new model has loaded successfully,
+    with a single reference assignment. Request handlers read
+    `registry.current` once per request, so in-flight predictions finish on
+    the model they started with while new requests see the new one. A failed
+    reload keeps serving the old model, and the watcher does not retry until
+    the artifacts change again.
+
+    Each entry of `watch_paths` is a path or a tuple of paths that are
+    deployed together; a tuple only triggers a reload once every one of its
+    paths has changed, so a half-copied pair is never loaded.
+    """
+
+    def __init__(self, loader: Callable[[], FakeNewsDetector],
+                 watch_paths: Iterable[Union[str, Sequence[str]]] = (),
+                 poll_interval: Optional[float] = None, initial: Optional[FakeNewsDetector] = None):
+        self.loader = loader
+        self.watch_paths = [(paths,) if isinstance(paths, str) else tuple(paths) for paths in watch_paths]
+        self.poll_interval = poll_interval
+        self._current = initial
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        # Signature of the artifacts last tried, whether or not they loaded
+        self._signature = self._artifact_signature()
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error = None
+        self.loaded_at = time.time() if initial is not None else None
+
+    @property
+    def current(self) -> Optional[FakeNewsDetector]:
+        return self._current
+
+    @property
+    def model_version(self) -> Optional[str]:
+        detector = self._current
+        return detector.model_version if detector is not None else None
+
+    def load(self) -> FakeNewsDetector:
+        """Load a new detector and make it current; raises if loading fails"""
+        with self._reload_lock:
+            signature = self._artifact_signature()
+            self._signature = signature
+            try:
+                detector = self.loader()
+            except Exception as e:
+                self.reload_errors += 1
+                self.last_error = str(e)
+                raise
+
+            self._current = detector
+            self.reloads += 1
+            self.last_error = None
+            self.loaded_at = time.time()
+            return detector
+
+    def reload_in_background(self) -> threading.Thread:
+        """Start a reload on a background thread and return the thread"""
+        thread = threading.Thread(target=self._safe_reload, name='model-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def _safe_reload(self):
+        try:
+            detector = self.load()
+            print(f"Model reloaded (version {detector.model_version})")
+        except Exception as e:
+            print(f"Warning: Model reload failed, keeping current model: {e}")
+
+    def _artifact_signature(self) -> Tuple:
+        return tuple(tuple(map(self._path_signature, paths)) for paths in self.watch_paths)
+
+    @staticmethod
+    def _path_signature(path: str) -> Tuple:
+        try:
+            stat = os.stat(path)
+            return path, stat.st_mtime_ns, stat.st_size, stat.st_ino
+        except OSError:
+            return path, None
+
+    def check_for_changes(self) -> bool:
+        """Reload synchronously if any watched artifact changed; returns True on a swap"""
+        signature = self._artifact_signature()
+        if not any(all(new != old for new, old in zip(current, tried))
+                   for current, tried in zip(signature, self._signature)):
+            return False
+        try:
+            self.load()
+        except Exception as e:
+            print(f"Warning: Model reload failed, keeping current model: {e}")
+            return False
+        print(f"Model reloaded (version {self.model_version})")
+        return True
+
+    def start_watching(self):
+        """Poll the watched artifact paths every `poll_interval` seconds"""
+        if self._watcher is not None or not self.poll_interval or not self.watch_paths:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name='model-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check_for_changes()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def stats(self) -> Dict[str, any]:
+        """Return the active model version and reload counters"""
+        return {
+            'model_version': self.model_version,
+            'loaded_at': self.loaded_at,
+            'reloads': self.reloads,
+            'reload_errors': self.reload_errors,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,203 @@
+"""MinHash/LSH index for spotting near-duplicate texts.
+
+Each text is reduced to its word shingles (n-grams) and summarized by a
+MinHash signature; the fraction of equal signature slots estimates the Jaccard
+similarity of two shingle sets. Signatures are split into bands and every
+band is hashed into a bucket, so a lookup only compares the entries that
+share at least one bucket with the query instead of scanning the index.
+
+The index is a bounded LRU: inserting beyond `max_entries` evicts the least
+recently matched entry together with its buckets. Words are hashed with the
+built-in hash(), so signatures are only comparable within one process.
+
+`score()` uses the index as a verdict cache: each batch is scored once per
+near-duplicate cluster and later copies reuse the stored verdict.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from prediction_cache import CacheStats
+
+_SHIFT = np.uint64(32)
+_LOW_BITS = np.uint64(0xFFFFFFFF)
+# Odd multiplier combining word hashes into n-gram hashes
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class NearDuplicateIndex(CacheStats):
+    """Bounded, thread-safe MinHash/LSH index mapping similar texts to stored values"""
+
+    def __init__(self, max_entries: int = 10000, threshold: float = 0.7, num_perm: int = 64,
+                 bands: int = 16, shingle_size: int = 2, seed: int = 1):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Multiply-shift hashing: the high 32 bits of (a * x + b) mod 2**64, odd a
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 64, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 64, size=(num_perm, 1), dtype=np.uint64)
+
+        # entry key -> (signature, value); buckets map (band, band hash) -> entry keys
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self._init_stats()
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        """64-bit hashes of a text's word n-grams; short texts fall back to their words"""
+        words = np.fromiter(map(hash, text.split()), dtype=np.int64).view(np.uint64)
+        n = min(self.shingle_size, len(words))
+        hashes = words[:len(words) - n + 1].copy()
+        for offset in range(1, n):
+            hashes = hashes * _MIX + words[offset:len(words) - n + 1 + offset]
+        return hashes
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it has no words"""
+        return self.signatures([text])[0]
+
+    def signatures(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """MinHash signatures of many texts, hashed in one vectorized pass"""
+        shingles = [self._shingle_hashes(text) for text in texts]
+        counts = np.array([len(hashes) for hashes in shingles])
+        nonempty = np.flatnonzero(counts)
+        signatures = [None] * len(texts)
+        if not len(nonempty):
+            return signatures
+
+        # Fold to 32 bits, then take the minimum of every hash function per
+        # text; repeated shingles cannot change a minimum, so no dedupe is needed
+        hashes = np.concatenate(shingles)
+        hashes = (hashes ^ (hashes >> _SHIFT)) & _LOW_BITS
+        permuted = ((self._a * hashes + self._b) >> _SHIFT).astype(np.uint32)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+        minima = np.ascontiguousarray(np.minimum.reduceat(permuted, starts, axis=1).T)
+        for i, signature in zip(nonempty, minima):
+            signatures[i] = signature
+        return signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        data = signature.tobytes()
+        width = len(data) // self.bands
+        return [(band, data[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+    def find(self, signature: Optional[np.ndarray]) -> Optional[Tuple[Hashable, any, float]]:
+        """Return (key, value, similarity) of the most similar entry above threshold"""
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+
+            keys = list(candidates)
+            if keys:
+                stacked = np.array([self._entries[key][0] for key in keys])
+                similarities = np.count_nonzero(stacked == signature, axis=1) / self.num_perm
+                best = int(similarities.argmax())
+            if not keys or similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            key = keys[best]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return key, self._entries[key][1], float(similarities[best])
+
+    def add(self, signature: Optional[np.ndarray], value) -> Optional[int]:
+        """Index a signature with its value, evicting the least recently used entries"""
+        if signature is None:
+            return None
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = (signature, value)
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return key
+
+    def discard(self, key: Optional[int]):
+        """Remove the entry returned by add(), if it is still indexed"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: int):
+        signature, _ = self._entries.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def score(self, texts: List[str], score_batch: Callable[[List[str]], List[Dict[str, any]]],
+              model_version: Optional[str] = None) -> List[Dict[str, any]]:
+        """Score texts once per near-duplicate cluster, reusing verdicts already indexed.
+
+        `score_batch` scores the first text of each new cluster in one call.
+        Indexed verdicts of another `model_version` are evicted and rescored.
+        """
+        results = [None] * len(texts)
+        clusters = {}
+        for i, signature in enumerate(self.signatures(texts)):
+            match = self.find(signature)
+            if match is not None:
+                key, cluster, _ = match
+                if cluster['model_version'] != model_version:
+                    # Verdict of a previous model; only this entry is dropped,
+                    # so other requests' pending clusters are left alone
+                    self.discard(key)
+                elif cluster['result'] is not None:
+                    results[i] = dict(cluster['result'])
+                    continue
+                elif id(cluster) in clusters:
+                    # A copy of an item earlier in this batch
+                    clusters[id(cluster)][2].append(i)
+                    continue
+
+            cluster = {'model_version': model_version, 'result': None}
+            clusters[id(cluster)] = (cluster, self.add(signature, cluster), [i])
+
+        if clusters:
+            representatives = list(clusters.values())
+            try:
+                scored = score_batch([texts[indices[0]] for _, _, indices in representatives])
+            except Exception:
+                # Don't leave unscored clusters behind to shadow later copies
+                for _, key, _ in representatives:
+                    self.discard(key)
+                raise
+            for (cluster, _, indices), result in zip(representatives, scored):
+                for i in indices:
+                    results[i] = dict(result)
+                cluster['model_version'] = result.get('model_version', model_version)
+                cluster['result'] = result
+        return results
+
+    def clear(self):
+        """Drop all entries; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self.max_entries
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from prediction_cache import LRUCache
+
+
+class NewsSource(ABC):
+    """A pluggable upstream that returns news items for a query"""
+
+    name = 'News Source'
+
+    @abstractmethod
+    def fetch(self, session: requests.Session, query: str, timeout: float) -> List[Dict[str, str]]:
+        """Return items with title, description, url, source and published_at"""
+
+    def trending(self, session: requests.Session, timeout: float) -> List[Dict[str, str]]:
+        """Return the source's current top stories, in rank order"""
+        return []
+
+
+class HackerNewsSource(NewsSource):
+    """Stories from the Hacker News Algolia search API"""
+
+    name = 'Hacker News'
+
+    def __init__(self, base_url: str = 'https://hn.algolia.com/api/v1/search', hits_per_page: int = 10,
+                 trending_size: int = 50):
+        self.base_url = base_url
+        self.hits_per_page = hits_per_page
+        self.trending_size = trending_size
+
+    def fetch(self, session: requests.Session, query: str, timeout: float) -> List[Dict[str, str]]:
+        return self._search(session, {'query': query, 'tags': 'story', 'hitsPerPage': self.hits_per_page}, timeout)
+
+    def trending(self, session: requests.Session, timeout: float) -> List[Dict[str, str]]:
+        return self._search(session, {'tags': 'front_page', 'hitsPerPage': self.trending_size}, timeout)
+
+    def _search(self, session: requests.Session, params: Dict, timeout: float) -> List[Dict[str, str]]:
+        results = []
+        for hit in get_json(session, self.base_url, params, timeout).get('hits', []):
+            results.append({
+                'title': (hit.get('title') or '')[:200],
+                'description': f"Points: {hit.get('points', 0)} | By: {hit.get('author', 'unknown')}",
+                'url': hit.get('url') or f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}",
+                'source': self.name,
+                'published_at': ''
+            })
+        return results
+
+
+def get_json(session: requests.Session, url: str, params: Dict, timeout: float) -> Dict:
+    """GET a JSON document, giving up once the whole response takes over timeout seconds.
+
+    requests applies its timeout to each socket read, so an upstream that
+    trickles bytes could otherwise hold the calling thread indefinitely.
+    """
+    deadline = time.monotonic() + timeout
+    with session.get(url, params=params, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        body = bytearray()
+        # read1() returns whatever has arrived, so the deadline is checked between socket reads
+        while True:
+            chunk = response.raw.read1(64 * 1024, decode_content=True)
+            if not chunk:
+                break
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"no complete response within {timeout}s")
+            body += chunk
+    return json.loads(body)
+
+
+class FixtureNewsSource(NewsSource):
+    """Items from a local JSON file, standing in for an upstream in tests and demos"""
+
+    name = 'Fixture'
+
+    def __init__(self, path: str):
+        with open(path, encoding='utf-8') as f:
+            self.items = [
+                dict({'description': '', 'url': '#', 'source': self.name, 'published_at': ''}, **item)
+                for item in json.load(f)
+            ]
+
+    def fetch(self, session: requests.Session, query: str, timeout: float) -> List[Dict[str, str]]:
+        query = query.lower()
+        return [dict(item) for item in self.items
+                if query in item['title'].lower() or query in item['description'].lower()]
+
+    def trending(self, session: requests.Session, timeout: float) -> List[Dict[str, str]]:
+        return [dict(item) for item in self.items]
+
+
+class NewsFetcher:
+    """Fan a query out to several sources concurrently over pooled connections.
+
+    All sources are queried in parallel and the whole fetch is bounded by
+    `deadline` seconds, so latency is that of the slowest source (capped by
+    the deadline) rather than the sum. Sources that fail or miss the deadline
+    are skipped. Complete responses are cached per query for `cache_ttl`
+    seconds.
+
+    Each fan-out runs on its own threads, so a source that is still hanging
+    after the deadline never holds a thread that later fetches need.
+    """
+
+    def __init__(self, sources: Sequence[NewsSource], deadline: float = 5.0,
+                 cache_ttl: Optional[float] = 300, cache_size: int = 256,
+                 pool_size: int = 10):
+        self.sources = list(sources)
+        self.deadline = deadline
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0'
+        adapter = HTTPAdapter(pool_connections=max(len(self.sources), 1), pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size else None
+        self.errors = {source.name: 0 for source in self.sources}
+        self._errors_lock = threading.Lock()
+
+    def fetch(self, query: str) -> List[Dict[str, str]]:
+        """Return the combined items of all sources, in source order"""
+        if self.cache is not None:
+            cached = self.cache.get(query)
+            if cached is not None:
+                return [dict(item) for item in cached]
+
+        results, complete = self._fan_out('fetch', query)
+
+        # Partial results are not cached so a flaky source is retried next time
+        if complete and self.cache is not None:
+            self.cache.put(query, [dict(item) for item in results])
+
+        return results
+
+    def fetch_trending(self) -> List[Dict[str, str]]:
+        """Return the combined top stories of all sources, uncached"""
+        return self._fan_out('trending')[0]
+
+    def _fan_out(self, method: str, *args) -> Tuple[List[Dict[str, str]], bool]:
+        """Call a source method on every source; returns (items, whether all succeeded)"""
+        executor = ThreadPoolExecutor(max_workers=max(len(self.sources), 1), thread_name_prefix='news-fetch')
+        try:
+            futures = [
+                executor.submit(getattr(source, method), self.session, *args, self.deadline)
+                for source in self.sources
+            ]
+            wait(futures, timeout=self.deadline)
+        finally:
+            # Sources past the deadline finish in the background and are ignored
+            executor.shutdown(wait=False)
+
+        results = []
+        complete = True
+        for source, future in zip(self.sources, futures):
+            if not future.done():
+                future.cancel()
+                self._record_error(source, f"no response within {self.deadline}s")
+                complete = False
+            elif future.exception() is not None:
+                self._record_error(source, future.exception())
+                complete = False
+            else:
+                results.extend(future.result())
+        return results, complete
+
+    def _record_error(self, source: NewsSource, error):
+        with self._errors_lock:
+            self.errors[source.name] = self.errors.get(source.name, 0) + 1
+        print(f"{source.name} Error: {error}")
+
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
@@ -0,0 +1,151 @@
+"""Out-of-core training for FakeNewsDetector.
+
+`train_streaming` reads a labelled JSONL, CSV or TSV corpus from disk in chunks,
+preprocesses and hashes each chunk in a pool of worker processes, and fits
+an SGD logistic regression with `partial_fit`, so memory is bounded by the
+chunk size instead of the corpus size. A HashingVectorizer needs no fitted
+vocabulary, which is what makes single-pass, parallel vectorization possible.
+
+About `test_size` of the documents (chosen by a hash of their text, so
+duplicates never straddle the split) are held out and scored in a final
+pass, reporting the same metrics as `FakeNewsDetector.train`.
+"""
+import collections
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from corpus_io import chunked, detect_format, read_corpus
+
+HASHING_FEATURES = 2 ** 20
+
+# Per-process featurizer state, set up once by the pool initializer
+_worker_detector = None
+_worker_vectorizer = None
+
+
+def make_vectorizer(n_features: int = HASHING_FEATURES):
+    """Stateless vectorizer used for streaming training"""
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2')
+
+
+def _init_worker(tokenizer: str, stop_words: frozenset, vectorizer):
+    global _worker_detector, _worker_vectorizer
+    from fake_news_detector import FakeNewsDetector
+    _worker_detector = FakeNewsDetector(tokenizer=tokenizer, cache_size=0)
+    _worker_detector.stop_words = set(stop_words)
+    _worker_vectorizer = vectorizer
+
+
+def _featurize(texts: List[str]):
+    return _worker_vectorizer.transform(list(_worker_detector.preprocess_many(texts)))
+
+
+def is_held_out(text: str, test_size: float) -> bool:
+    """Deterministically assign a document to the evaluation split"""
+    return zlib.crc32(text.encode('utf-8')) % 10000 < test_size * 10000
+
+
+def _ordered_map(submit: Callable, items: Iterable, max_in_flight: int) -> Iterator:
+    """Yield (item, result) in order, with at most max_in_flight futures pending"""
+    pending = collections.deque()
+    for item in items:
+        pending.append((item, submit(item)))
+        if len(pending) >= max_in_flight:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+
+def train_streaming(detector, corpus_path: str, fmt: Optional[str] = None, text_field: str = 'text',
+                    label_field: str = 'label', chunk_size: int = 10000, epochs: int = 1,
+                    test_size: float = 0.2, workers: Optional[int] = None,
+                    n_features: int = HASHING_FEATURES, log=sys.stderr) -> Dict[str, float]:
+    """Fit `detector` out-of-core on a labelled corpus file and return metrics"""
+    from sklearn.linear_model import SGDClassifier
+
+    fmt = fmt or detect_format(corpus_path)
+    vectorizer = make_vectorizer(n_features)
+    model = SGDClassifier(loss='log_loss', random_state=42)
+    rng = np.random.default_rng(42)
+
+    initargs = (detector.tokenizer, frozenset(detector.stop_words), vectorizer)
+    if workers == 0:
+        _init_worker(*initargs)
+        executor = None
+    else:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=initargs
+        )
+    max_in_flight = 2 * (workers or 1)
+
+    def submit(records):
+        texts = [record.text for record in records]
+        if executor is None:
+            future = Future()
+            future.set_result(_featurize(texts))
+            return future
+        return executor.submit(_featurize, texts)
+
+    def split_chunks(held_out: bool) -> Iterator[List]:
+        with open(corpus_path, newline='' if fmt != 'jsonl' else None, encoding='utf-8') as f:
+            records = (
+                record for record in read_corpus(f, fmt, text_field, None, label_field)
+                if record.error is None and is_held_out(record.text, test_size) == held_out
+            )
+            yield from chunked(records, chunk_size)
+
+    start = time.perf_counter()
+    try:
+        seen = 0
+        for epoch in range(epochs):
+            for records, X in _ordered_map(submit, split_chunks(held_out=False), max_in_flight):
+                y = np.array([record.label for record in records])
+                # Chunks often come from files sorted by source; shuffle within each
+                order = rng.permutation(len(y))
+                model.partial_fit(X[order], y[order], classes=np.array([0, 1]))
+                seen += len(y)
+            print(f"Epoch {epoch + 1}/{epochs}: {seen:,} documents "
+                  f"({seen / (time.perf_counter() - start):,.0f} docs/sec)", file=log)
+        if not seen:
+            raise ValueError(f"No labelled training documents found in {corpus_path}")
+
+        # Confusion counts keep evaluation memory constant as well
+        tp = fp = tn = fn = 0
+        for records, X in _ordered_map(submit, split_chunks(held_out=True), max_in_flight):
+            y_true = np.array([record.label for record in records])
+            y_pred = model.predict(X)
+            tp += int(np.sum((y_pred == 1) & (y_true == 1)))
+            fp += int(np.sum((y_pred == 1) & (y_true != 1)))
+            tn += int(np.sum((y_pred != 1) & (y_true != 1)))
+            fn += int(np.sum((y_pred != 1) & (y_true == 1)))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    detector.vectorizer = vectorizer
+    detector.model = model
+    detector._model_changed()
+
+    total = tp + fp + tn + fn
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        'accuracy': (tp + tn) / total if total else 0.0,
+        'precision': precision,
+        'recall': recall,
+        'f1_score': 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    }
@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+from admission import ConcurrencyLimiter, Deadline, TokenBucketLimiter, combine_chunk_results, split_text
+from test_helpers import FakeClock
+
+
+def verdict(probability_fake):
+    return {'is_fake': probability_fake > 0.5, 'confidence': max(probability_fake, 1 - probability_fake),
+            'probability_fake': probability_fake, 'probability_real': 1 - probability_fake,
+            'model_version': 'v1'}
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+    def test_burst_then_refill(self):
+        """Test that a client gets its burst, is told how long to wait, then refills"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=2, burst=3, clock=clock)
+        self.assertEqual([limiter.acquire('a') for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(limiter.acquire('a'), 0.5)
+        # Other clients have their own bucket
+        self.assertEqual(limiter.acquire('b'), 0)
+
+        clock.now = 0.5
+        self.assertEqual(limiter.acquire('a'), 0)
+        self.assertGreater(limiter.acquire('a'), 0)
+        self.assertEqual(limiter.stats(), {'allowed': 5, 'rejected': 2, 'clients': 2})
+
+    def test_clients_are_bounded(self):
+        """Test that the least recently seen clients are forgotten"""
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=2, clock=FakeClock())
+        for client in ('a', 'b', 'c'):
+            limiter.acquire(client)
+        self.assertEqual(limiter.stats()['clients'], 2)
+        self.assertEqual(limiter.acquire('a'), 0)
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    def test_sheds_beyond_waiting_room(self):
+        """Test that requests beyond the active and waiting limits are rejected at once"""
+        limiter = ConcurrencyLimiter(max_active=1, max_waiting=1)
+        self.assertTrue(limiter.acquire())
+
+        admitted = []
+        waiter = threading.Thread(target=lambda: admitted.append(limiter.acquire(timeout=5)))
+        waiter.start()
+        while limiter.stats()['waiting'] == 0:
+            pass
+        self.assertFalse(limiter.acquire(timeout=5))
+
+        limiter.release()
+        waiter.join()
+        self.assertEqual(admitted, [True])
+        self.assertFalse(limiter.acquire(timeout=0.01))
+        stats = limiter.stats()
+        self.assertEqual((stats['active'], stats['rejected'], stats['timed_out']), (1, 1, 1))
+
+
+class TestDeadline(unittest.TestCase):
+    def test_deadline(self):
+        clock = FakeClock()
+        deadline = Deadline(2, clock=clock)
+        self.assertEqual(deadline.remaining(), 2)
+        clock.now = 3
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired())
+        self.assertIsNone(Deadline(0).remaining())
+        self.assertFalse(Deadline(None).expired())
+
+
+class TestChunking(unittest.TestCase):
+    def test_split_text_breaks_between_words(self):
+        """Test that chunks respect the size limit without cutting words"""
+        text = ' '.join(f"word{i}" for i in range(100))
+        chunks, truncated = split_text(text, 40, 100)
+        self.assertFalse(truncated)
+        self.assertEqual(' '.join(chunks), text)
+        self.assertTrue(all(len(chunk) <= 40 for chunk in chunks))
+
+        chunks, truncated = split_text(text, 40, 2)
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(truncated)
+        self.assertEqual(split_text('short text', 40, 2), (['short text'], False))
+        # A word longer than a chunk is cut
+        self.assertEqual(split_text('x' * 10, 4, 5)[0], ['xxxx', 'xxxx', 'xx'])
+
+    def test_combine_chunk_results(self):
+        """Test that chunk probabilities are averaged by chunk length"""
+        combined = combine_chunk_results([verdict(0.9), verdict(0.3)], [1, 3])
+        self.assertAlmostEqual(combined['probability_fake'], 0.45)
+        self.assertAlmostEqual(combined['confidence'], 0.55)
+        self.assertFalse(combined['is_fake'])
+        self.assertEqual(combined['model_version'], 'v1')
+
+
+if __name__ == '__main__':
+    unittest.main()
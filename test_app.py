@@ -0,0 +1,296 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Trending stories come from a local fixture instead of Hacker News
+TRENDING_STORIES = [
+    {'title': "Central bank raises interest rates again", 'description': "Markets react"},
+    {'title': "Telescope images reveal a distant galaxy", 'description': "Astronomers publish photos"},
+]
+with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as fixture:
+    json.dump(TRENDING_STORIES, fixture)
+
+os.environ.setdefault('MODEL_WATCH_INTERVAL', '0')
+os.environ.setdefault('TRENDING_FIXTURE', fixture.name)
+os.environ.setdefault('TRENDING_REFRESH_INTERVAL', '3600')
+
+import app as flask_app
+from api_common import RequestError, iter_ndjson_texts
+
+
+class TestAdminReload(unittest.TestCase):
+    def setUp(self):
+        self.client = flask_app.app.test_client()
+
+    def test_reload_requires_configured_token(self):
+        """Test that /admin/reload is refused without a configured, matching token"""
+        with mock.patch.object(flask_app.model_registry, 'reload_in_background') as reload:
+            with mock.patch.dict(os.environ):
+                os.environ.pop('ADMIN_TOKEN', None)
+                self.assertEqual(self.client.post('/admin/reload').status_code, 403)
+            with mock.patch.dict(os.environ, {'ADMIN_TOKEN': 'secret'}):
+                self.assertEqual(self.client.post('/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code,
+                                 403)
+                self.assertEqual(self.client.post('/admin/reload', headers={'X-Admin-Token': 'secret'}).status_code,
+                                 202)
+        reload.assert_called_once_with()
+
+class TestBatchAnalyze(unittest.TestCase):
+    def setUp(self):
+        self.client = flask_app.app.test_client()
+        self.texts = [f"Aliens built pyramid number {i} says ancient theory" for i in range(300)]
+
+    def test_json_batch_has_no_count_limit(self):
+        """Test that JSON batches larger than the old 10-text cap are accepted"""
+        response = self.client.post('/batch-analyze', json={'texts': self.texts[:50] + ['  ']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['results']), 50)
+
+    def test_empty_batch(self):
+        """Test that a batch with no non-blank texts succeeds with no results"""
+        for texts in ([], ['  ']):
+            response = self.client.post('/batch-analyze', json={'texts': texts})
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertEqual(data['results'], [])
+            self.assertEqual(data['model_version'], flask_app.model_registry.model_version)
+
+    def test_ndjson_request_streams_results(self):
+        """Test that an NDJSON body is scored in chunks and streamed back in order"""
+        lines = [json.dumps({'id': f"doc-{i}", 'text': text}) for i, text in enumerate(self.texts)]
+        lines[5] = json.dumps(self.texts[5])
+        lines.insert(10, '')
+        body = '\n'.join(lines) + '\n'
+
+        with mock.patch.object(flask_app, 'BATCH_CHUNK_SIZE', 64):
+            response = self.client.post('/batch-analyze', data=body, content_type='application/x-ndjson',
+                                        buffered=False)
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.mimetype, 'application/x-ndjson')
+            chunks = [chunk for chunk in response.response if chunk]
+        # One write per scored chunk
+        self.assertEqual(len(chunks), 5)
+
+        results = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        self.assertEqual([result['index'] for result in results], list(range(len(self.texts))))
+        self.assertEqual(results[0]['id'], 'doc-0')
+        self.assertNotIn('id', results[5])
+        self.assertIn(results[0]['label'], ('FAKE NEWS', 'REAL NEWS'))
+
+    def test_json_request_can_ask_for_ndjson(self):
+        """Test that JSON requests accepting NDJSON get a streamed response"""
+        response = self.client.post('/batch-analyze', json={'texts': self.texts[:3]},
+                                    headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 3)
+
+    def test_byte_limit(self):
+        """Test that bodies over BATCH_MAX_BYTES are rejected"""
+        with mock.patch.object(flask_app, 'BATCH_MAX_BYTES', 1000):
+            response = self.client.post('/batch-analyze', json={'texts': self.texts})
+            self.assertEqual(response.status_code, 413)
+
+            # Bodies without a declared length are cut off while reading
+            body = io.BytesIO(json.dumps({'texts': self.texts}).encode())
+            response = self.client.post('/batch-analyze', input_stream=body, content_type='application/json',
+                                        environ_overrides={'CONTENT_LENGTH': '', 'wsgi.input_terminated': True})
+            self.assertEqual(response.status_code, 413)
+            self.assertLessEqual(body.tell(), 1001)
+
+            body = io.BytesIO(b''.join(json.dumps(text).encode() + b'\n' for text in self.texts))
+            with self.assertRaises(RequestError) as raised:
+                list(iter_ndjson_texts(body, 1000))
+            self.assertEqual(raised.exception.status, 413)
+            self.assertLessEqual(body.tell(), 1001)
+
+            # A single line without a newline is not buffered in full
+            body = io.BytesIO(b'"' + b'x' * 100000)
+            with self.assertRaises(RequestError):
+                list(iter_ndjson_texts(body, 1000))
+            self.assertEqual(body.tell(), 1001)
+
+    def test_invalid_ndjson_line(self):
+        """Test that a malformed line ends the stream with an error after every record before it"""
+        body = '\n'.join([json.dumps(text) for text in self.texts[:5]] + ['{not json'] + [json.dumps(self.texts[5])])
+        with mock.patch.object(flask_app, 'BATCH_CHUNK_SIZE', 4):
+            response = self.client.post('/batch-analyze', data=body, content_type='application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([line['index'] for line in lines[:-1]], list(range(5)))
+        self.assertEqual(lines[-1], {'error': 'Line 6 is not valid JSON', 'status': 400})
+
+
+class TestExplain(unittest.TestCase):
+    def setUp(self):
+        self.client = flask_app.app.test_client()
+
+    def test_explain_matches_analyze(self):
+        """Test that /explain returns the /analyze verdict plus its top terms"""
+        text = "BREAKING: Scientists find miracle cure for cancer hidden in common household item"
+        analysis = self.client.post('/analyze', json={'text': text}).get_json()
+        response = self.client.post('/explain', json={'text': text, 'top_k': 3})
+        self.assertEqual(response.status_code, 200)
+
+        explanation = response.get_json()
+        self.assertEqual(explanation['model_version'], analysis['model_version'])
+        result = explanation['result']
+        self.assertEqual(result['label'], analysis['result']['label'])
+        self.assertEqual(result['probability_fake'], analysis['result']['probability_fake'])
+        self.assertEqual(len(result['top_terms']), 3)
+        self.assertEqual(set(result['top_terms'][0]), {'term', 'tfidf', 'contribution'})
+
+    def test_explain_validation(self):
+        """Test that /explain validates its text and top_k"""
+        text = "Aliens built the pyramids, says ancient theory"
+        for payload in ({}, {'text': 'short'}, {'text': text, 'top_k': 0},
+                        {'text': text, 'top_k': 'ten'}, {'text': text, 'top_k': 101}):
+            response = self.client.post('/explain', json=payload)
+            self.assertEqual(response.status_code, 400, payload)
+            self.assertIn('error', response.get_json())
+
+
+class TestSearchNewsNearDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.client = flask_app.app.test_client()
+        flask_app.near_duplicates.clear()
+
+    def news(self, *titles):
+        return [{'title': title, 'description': 'Officials confirm the report', 'url': '#',
+                 'source': 'Wire', 'published_at': ''} for title in titles]
+
+    def test_near_duplicates_reuse_verdicts(self):
+        """Test that syndicated copies are scored once and share the verdict"""
+        first = self.news("Aliens have landed in a major city, government officials say",
+                          "UPDATE: Aliens have landed in a major city, government officials say",
+                          "Regional airline adds new winter routes")
+        second = self.news("Reuters - Aliens have landed in a major city, government officials say")
+
+        with mock.patch.object(flask_app, 'score_texts', wraps=flask_app.score_texts) as score_texts, \
+                mock.patch.object(flask_app.news_fetcher, 'fetch', side_effect=[first, second]):
+            results = self.client.post('/search-news', json={'query': 'aliens'}).get_json()['results']
+            self.assertEqual(len(score_texts.call_args.args[0]), 2)
+            self.assertEqual(results[0]['probability_fake'], results[1]['probability_fake'])
+
+            repeat = self.client.post('/search-news', json={'query': 'aliens again'}).get_json()['results']
+            self.assertEqual(score_texts.call_count, 1)
+            self.assertEqual(repeat[0]['probability_fake'], results[0]['probability_fake'])
+
+
+class TestSearchNewsEmpty(unittest.TestCase):
+    def test_no_usable_results(self):
+        """Test that upstream results without titles give an empty result list, not an error"""
+        client = flask_app.app.test_client()
+        with mock.patch.object(flask_app.news_fetcher, 'fetch', return_value=[{'title': '  ', 'description': ''}]):
+            response = client.post('/search-news', json={'query': 'zzzz unmatched query'})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual((data['total_results'], data['results']), (0, []))
+        self.assertEqual(data['model_version'], flask_app.model_registry.model_version)
+
+
+class TestTrendingSearch(unittest.TestCase):
+    def setUp(self):
+        self.client = flask_app.app.test_client()
+        flask_app.trending_refresher.refresh()
+
+    def test_trending_search_is_precomputed(self):
+        """Test that trending topics are answered without upstream calls or scoring"""
+        with mock.patch.object(flask_app, 'score_texts') as score_texts, \
+                mock.patch.object(flask_app.news_fetcher, 'fetch') as fetch:
+            data = self.client.post('/search-news', json={'query': 'Interest Rates'}).get_json()
+        fetch.assert_not_called()
+        score_texts.assert_not_called()
+        self.assertTrue(data['precomputed'])
+        self.assertEqual([item['title'] for item in data['results']], [TRENDING_STORIES[0]['title']])
+        self.assertEqual(data['model_version'], flask_app.model_registry.model_version)
+
+    def test_fallback_news_verdicts_are_precomputed(self):
+        """Test that sample fallback news is not searched but reuses precomputed verdicts"""
+        with mock.patch.object(flask_app, 'score_texts') as score_texts, \
+                mock.patch.object(flask_app.news_fetcher, 'fetch', return_value=[]) as fetch:
+            data = self.client.post('/search-news', json={'query': 'climate'}).get_json()
+        fetch.assert_called_once_with('climate')
+        score_texts.assert_not_called()
+        self.assertFalse(data['precomputed'])
+        self.assertEqual(data['results'][0]['source'], 'Climate News')
+
+
+class TestAdmissionControl(unittest.TestCase):
+    def setUp(self):
+        self.client = flask_app.app.test_client()
+
+    def test_oversized_body_is_rejected(self):
+        """Test that bodies over MAX_REQUEST_BYTES get a JSON 413"""
+        with mock.patch.object(flask_app, 'MAX_REQUEST_BYTES', 100):
+            response = self.client.post('/analyze', json={'text': 'breaking news ' * 20})
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('error', response.get_json())
+
+        # Bodies without a Content-Length (chunked) are cut off while reading
+        body = io.BytesIO(json.dumps({'text': 'breaking news ' * 70}).encode())
+        with mock.patch.object(flask_app, 'MAX_REQUEST_BYTES', 100):
+            response = self.client.post('/analyze', input_stream=body, content_type='application/json',
+                                        environ_overrides={'CONTENT_LENGTH': '', 'wsgi.input_terminated': True})
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('error', response.get_json())
+        self.assertLessEqual(body.tell(), 101)
+
+    def test_long_text_is_scored_in_chunks(self):
+        """Test that long articles are split, scored in one batch and truncated"""
+        text = ' '.join(f"Scientists confirm miracle cure number {i}" for i in range(40))
+        with mock.patch.object(flask_app, 'TEXT_CHUNK_CHARS', 200), \
+                mock.patch.object(flask_app, 'MAX_TEXT_CHUNKS', 3), \
+                mock.patch.object(flask_app, 'score_texts', wraps=flask_app.score_texts) as score_texts:
+            response = self.client.post('/analyze', json={'text': text})
+        data = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((data['chunks'], data['truncated']), (3, True))
+        self.assertEqual(len(score_texts.call_args.args[0]), 3)
+
+    def test_rate_limited_client_gets_retry_after(self):
+        """Test that a client over its token bucket gets a 429 with Retry-After"""
+        limiter = flask_app.TokenBucketLimiter(rate=0.5, burst=1)
+        with mock.patch.object(flask_app, 'rate_limiter', limiter):
+            first = self.client.post('/analyze', json={'text': 'Local council approves budget'})
+            second = self.client.post('/analyze', json={'text': 'Local council approves budget'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 429)
+        self.assertEqual(second.headers['Retry-After'], '2')
+
+    def test_busy_server_sheds_requests(self):
+        """Test that requests beyond the concurrency limit are rejected and slots are released"""
+        limiter = flask_app.ConcurrencyLimiter(max_active=1)
+        with mock.patch.object(flask_app, 'concurrency_limiter', limiter):
+            limiter.acquire()
+            response = self.client.post('/analyze', json={'text': 'Local council approves budget'})
+            self.assertEqual(response.status_code, 503)
+            self.assertIn('Retry-After', response.headers)
+            limiter.release()
+
+            response = self.client.post('/analyze', json={'text': 'Local council approves budget'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(limiter.stats()['active'], 0)
+
+    def test_batch_past_deadline_is_partial(self):
+        """Test that a batch running past its deadline returns the texts scored so far"""
+        texts = [f"Aliens built pyramid number {i} says ancient theory" for i in range(10)]
+        checks = iter([None, None, flask_app.RequestError('Request deadline exceeded', 503)])
+
+        def check_deadline():
+            error = next(checks)
+            if error is not None:
+                raise error
+
+        with mock.patch.object(flask_app, 'BATCH_CHUNK_SIZE', 4), \
+                mock.patch.object(flask_app, 'check_deadline', check_deadline):
+            response = self.client.post('/batch-analyze', json={'texts': texts})
+        data = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(data['partial'])
+        self.assertEqual((len(data['results']), data['total']), (8, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import unittest
+
+from asgi_app import InferenceApp
+from news_sources import NewsFetcher, NewsSource
+
+
+class StaticSource(NewsSource):
+    name = 'Static'
+
+    def fetch(self, session, query, timeout):
+        return [
+            {'title': 'Aliens built the pyramids', 'description': 'ancient astronaut theory confirmed',
+             'url': '#', 'source': self.name, 'published_at': ''},
+            {'title': 'Aliens built the PYRAMIDS ', 'description': 'duplicate title',
+             'url': '#', 'source': self.name, 'published_at': ''},
+        ]
+
+
+async def call(app, method, path, payload, part_size=None):
+    """Send one HTTP request through the ASGI app and return (status, json)"""
+    body = json.dumps(payload).encode('utf-8')
+    part_size = part_size or len(body) or 1
+    parts = [body[i:i + part_size] for i in range(0, len(body), part_size)] or [b'']
+    messages = [{'type': 'http.request', 'body': part, 'more_body': True} for part in parts]
+    messages[-1]['more_body'] = False
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path}, receive, send)
+    body = b''.join(message.get('body', b'') for message in sent[1:])
+    return sent[0]['status'], json.loads(body)
+
+
+class TestAsgiApp(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fetcher = NewsFetcher([StaticSource()])
+        cls.app = InferenceApp('vectorizer.pkl', 'fake_news_model.pkl', workers=1, news_fetcher=fetcher)
+        cls.app.startup()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.shutdown()
+
+    def request(self, method, path, payload, part_size=None):
+        return asyncio.run(call(self.app, method, path, payload, part_size))
+
+    def test_analyze(self):
+        """Test that /analyze scores text in a worker process"""
+        status, body = self.request('POST', '/analyze', {'text': 'Aliens have landed in New York City!'})
+        self.assertEqual(status, 200)
+        self.assertTrue(body['success'])
+        self.assertIn(body['result']['label'], ('FAKE NEWS', 'REAL NEWS'))
+        self.assertAlmostEqual(body['result']['probability_fake'] + body['result']['probability_real'], 100, places=1)
+        self.assertTrue(body['model_version'])
+        self.assertEqual((body['chunks'], body['truncated']), (1, False))
+
+    def test_analyze_long_text(self):
+        """Test that long texts are scored in bounded chunks like the Flask app"""
+        app = InferenceApp(text_chunk_chars=20, max_text_chunks=2)
+        app.pool, app.model_version = self.app.pool, self.app.model_version
+        status, body = asyncio.run(call(app, 'POST', '/analyze', {'text': 'Aliens have landed in New York City! ' * 5}))
+        self.assertEqual(status, 200)
+        self.assertEqual((body['chunks'], body['truncated']), (2, True))
+
+    def test_body_size_limits(self):
+        """Test that bodies sent in many parts are joined and capped per route"""
+        status, body = self.request('POST', '/analyze', {'text': 'Aliens have landed in New York City!'}, part_size=3)
+        self.assertEqual(status, 200)
+        self.assertIn(body['result']['label'], ('FAKE NEWS', 'REAL NEWS'))
+
+        app = InferenceApp(max_body_bytes=200, max_request_bytes=50)
+        app.pool = self.app.pool
+        status, body = asyncio.run(call(app, 'POST', '/analyze', {'text': 'x' * 100}, part_size=10))
+        self.assertEqual((status, body), (413, {'error': 'Request body exceeds 50 bytes'}))
+        status, body = asyncio.run(call(app, 'POST', '/batch-analyze', {'texts': ['x' * 100]}, part_size=10))
+        self.assertEqual(status, 200)
+        status, body = asyncio.run(call(app, 'POST', '/batch-analyze', {'texts': ['x' * 300]}, part_size=10))
+        self.assertEqual((status, body), (413, {'error': 'Request body exceeds 200 bytes'}))
+
+    def test_validation_errors(self):
+        """Test that invalid payloads get the same errors as the Flask app"""
+        self.assertEqual(self.request('POST', '/analyze', {'text': 'short'}),
+                         (400, {'error': 'Text is too short for analysis (minimum 10 characters)'}))
+        self.assertEqual(self.request('POST', '/batch-analyze', {'texts': 'not a list'}),
+                         (400, {'error': 'Texts must be a list'}))
+        self.assertEqual(self.request('POST', '/search-news', {}),
+                         (400, {'error': 'No search query provided'}))
+        self.assertEqual(self.request('GET', '/missing', {})[0], 404)
+
+    def test_batch_analyze(self):
+        """Test that blank texts are skipped in /batch-analyze"""
+        status, body = self.request('POST', '/batch-analyze', {'texts': ['Aliens built the pyramids', '  ', 'x' * 150]})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body['results']), 2)
+        self.assertEqual(body['model_version'], self.app.model_version)
+        self.assertEqual(body['results'][1]['text'], 'x' * 100 + '...')
+
+    def test_search_news(self):
+        """Test that upstream items are deduplicated and scored"""
+        status, body = self.request('POST', '/search-news', {'query': 'Aliens'})
+        self.assertEqual(status, 200)
+        self.assertEqual(body['query'], 'aliens')
+        self.assertEqual(body['total_results'], 1)
+        self.assertEqual(body['model_version'], self.app.model_version)
+        self.assertEqual(body['results'][0]['source'], 'Static')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
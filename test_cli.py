@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import cli
+from corpus_io import read_corpus
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+
+
+class TestScoreCorpus(unittest.TestCase):
+    def setUp(self):
+        self.texts, labels = create_sample_dataset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.bundle = self.path('model.bundle')
+        self.detector = FakeNewsDetector()
+        self.detector.train(self.texts, labels)
+        self.detector.save_model(self.bundle)
+
+        self.input = self.path('articles.jsonl')
+        with open(self.input, 'w') as f:
+            for i, text in enumerate(self.texts * 3):
+                f.write(json.dumps({'id': f"doc-{i}", 'text': text}) + '\n')
+            f.write('not json\n')
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def score(self, output, **kwargs):
+        kwargs.setdefault('workers', 0)
+        kwargs.setdefault('chunk_size', 4)
+        return cli.score_corpus(self.input, output, self.bundle, log=io.StringIO(), **kwargs)
+
+    def read_output(self, output):
+        with open(output) as f:
+            return [json.loads(line) for line in f]
+
+    def test_scores_records_in_order(self):
+        """Test that every record is scored in input order, errors included"""
+        output = self.path('scores.jsonl')
+        stats = self.score(output)
+
+        rows = self.read_output(output)
+        self.assertEqual(stats['records'], len(self.texts) * 3 + 1)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual([row['index'] for row in rows], list(range(len(rows))))
+        for row, text in zip(rows, self.texts * 3):
+            expected = self.detector.predict(text)
+            self.assertEqual(row['is_fake'], expected['is_fake'])
+            self.assertAlmostEqual(row['probability_fake'], expected['probability_fake'])
+            self.assertEqual(row['model_version'], self.detector.model_version)
+        self.assertIn('error', rows[-1])
+        self.assertFalse(os.path.exists(output + cli.CHECKPOINT_SUFFIX))
+
+    def test_resume_after_interruption(self):
+        """Test that --resume continues from the checkpoint without duplicates"""
+        expected = self.path('expected.jsonl')
+        self.score(expected)
+
+        output = self.path('scores.jsonl')
+        calls = []
+        format_results = cli.format_results
+
+        def interrupt(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return format_results(*args)
+
+        with mock.patch('cli.format_results', side_effect=interrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.score(output)
+        self.assertEqual(cli.read_checkpoint(output)['records'], 8)
+
+        # A partial write after the last checkpoint is discarded
+        with open(output, 'a') as f:
+            f.write('{"index": 8, "trunc')
+        self.score(output, resume=True)
+        self.assertEqual(self.read_output(output), self.read_output(expected))
+
+    def test_resume_without_output_starts_over(self):
+        """Test that a checkpoint whose output file is gone restarts from the beginning"""
+        expected, output = self.path('expected.jsonl'), self.path('scores.jsonl')
+        self.score(expected)
+        cli.write_checkpoint(output, {'input': os.path.abspath(self.input), 'input_size': os.path.getsize(self.input),
+                                      'records': 8, 'output_bytes': 100})
+        self.score(output, resume=True)
+        self.assertEqual(self.read_output(output), self.read_output(expected))
+
+    def test_process_pool_matches_in_process(self):
+        """Test that pooled scoring gives the same ordered output"""
+        expected, output = self.path('expected.jsonl'), self.path('pooled.jsonl')
+        self.score(expected)
+        self.score(output, workers=2)
+        self.assertEqual(self.read_output(output), self.read_output(expected))
+
+    def test_csv_input(self):
+        """Test that CSV corpora with a header row are supported"""
+        self.input = self.path('articles.csv')
+        with open(self.input, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'text'])
+            writer.writerow(['1', 'Breaking news, "quoted"\nacross lines'])
+            writer.writerow(['2', self.texts[0]])
+
+        output = self.path('scores.jsonl')
+        self.score(output)
+        rows = self.read_output(output)
+        self.assertEqual([row['id'] for row in rows], ['1', '2'])
+        self.assertNotIn('error', rows[0])
+
+    def test_tsv_input(self):
+        """Test that .tsv files are read tab-separated"""
+        self.input = self.path('articles.tsv')
+        with open(self.input, 'w', newline='') as f:
+            writer = csv.writer(f, delimiter='\t')
+            writer.writerow(['id', 'text'])
+            writer.writerow(['1', 'Breaking news, with commas, everywhere'])
+            writer.writerow(['2', self.texts[0]])
+
+        output = self.path('scores.jsonl')
+        self.score(output)
+        rows = self.read_output(output)
+        self.assertEqual([row['id'] for row in rows], ['1', '2'])
+        self.assertNotIn('error', rows[0])
+
+    def test_read_corpus_skips_finished_records(self):
+        """Test that skipped records keep their indexes"""
+        jsonl = '{"text": "a"}\n\nbad\n{"text": "c"}\n'
+        records = list(read_corpus(io.StringIO(jsonl), 'jsonl', skip=2))
+        self.assertEqual([(record.index, record.text) for record in records], [(2, 'c')])
+        records = list(read_corpus(io.StringIO('text\na\nb\nc\n'), 'csv', skip=1))
+        self.assertEqual([(record.index, record.text) for record in records], [(1, 'b'), (2, 'c')])
+
+    def test_read_corpus_reports_bad_records(self):
+        """Test that unreadable JSONL records become error records"""
+        records = list(read_corpus(io.StringIO('{"text": "ok"}\n\n[1]\n{"id": 5}\n'), 'jsonl'))
+        self.assertEqual([record.index for record in records], [0, 1, 2])
+        self.assertIsNone(records[0].error)
+        self.assertEqual(records[2].id, '5')
+        self.assertTrue(all(record.error for record in records[1:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from compiled_model import compile_model, export_compiled, load_compiled, save_compiled
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+
+
+def random_texts(count, seed=7):
+    """Raw texts mixing known words, unknown words, case, digits and Unicode"""
+    texts, _ = create_sample_dataset()
+    words = ' '.join(texts).split() + ['Zebra', 'naïve', 'Straße', '中文', 'x', '42', 'A-B', '']
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+class TestCompiledModel(unittest.TestCase):
+    def setUp(self):
+        self.texts, self.labels = create_sample_dataset()
+        self.detector = FakeNewsDetector()
+        self.detector.train(self.texts, self.labels)
+
+    def assert_equivalent(self, vectorizer, model, texts):
+        compiled_vectorizer, compiled_model = compile_model(vectorizer, model)
+        expected = model.predict_proba(vectorizer.transform(texts))
+        actual = compiled_model.predict_proba(compiled_vectorizer.transform(texts))
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+
+        expected_rows = vectorizer.transform(texts).toarray()
+        rows = compiled_vectorizer.transform(texts)
+        dense = np.zeros(rows.shape)
+        for i in range(rows.shape[0]):
+            start, end = rows.indptr[i], rows.indptr[i + 1]
+            dense[i, rows.indices[start:end]] = rows.data[start:end]
+        np.testing.assert_allclose(dense, expected_rows, rtol=0, atol=1e-12)
+
+    def test_matches_trained_model(self):
+        """Test that compiled scoring reproduces predict_proba within 1e-9"""
+        corpus = self.texts + random_texts(500)
+        self.assert_equivalent(self.detector.vectorizer, self.detector.model, corpus)
+        processed = list(self.detector.preprocess_many(corpus))
+        self.assert_equivalent(self.detector.vectorizer, self.detector.model, processed)
+
+    def test_matches_shipped_model(self):
+        """Test equivalence on the bundled pickled artifacts"""
+        vectorizer = joblib.load('vectorizer.pkl')
+        model = joblib.load('fake_news_model.pkl')
+        self.assert_equivalent(vectorizer, model, random_texts(500, seed=11))
+
+    def test_vectorizer_options(self):
+        """Test sublinear tf, binary counts, no idf and l1 norm"""
+        corpus = random_texts(200, seed=3)
+        for params in ({'sublinear_tf': True}, {'binary': True, 'norm': 'l1'},
+                       {'use_idf': False, 'ngram_range': (1, 3)}, {'norm': None, 'lowercase': False}):
+            vectorizer = TfidfVectorizer(**params)
+            model = LogisticRegression(max_iter=1000).fit(vectorizer.fit_transform(corpus), [i % 2 for i in range(200)])
+            with self.subTest(params=params):
+                self.assert_equivalent(vectorizer, model, random_texts(100, seed=5))
+
+    def test_unsupported_configurations(self):
+        """Test that custom analyzers and multiclass models are rejected"""
+        vectorizer = TfidfVectorizer(stop_words='english').fit(self.texts)
+        with self.assertRaises(ValueError):
+            compile_model(vectorizer, self.detector.model)
+
+        vectorizer = TfidfVectorizer().fit(self.texts)
+        model = LogisticRegression(max_iter=1000).fit(vectorizer.transform(self.texts), [i % 3 for i in range(20)])
+        with self.assertRaises(ValueError):
+            compile_model(vectorizer, model)
+
+    def test_save_load_and_detector_integration(self):
+        """Test the .npz round trip and loading it into a detector"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.npz')
+            self.detector.save_compiled(path)
+            vectorizer, model = load_compiled(path)
+            self.assertEqual(vectorizer.n_features, len(self.detector.vectorizer.vocabulary_))
+
+            compiled = FakeNewsDetector()
+            compiled.load_compiled(path)
+            self.assertIsNotNone(compiled.model_version)
+            for text in self.texts + ['', '!!!']:
+                expected = self.detector.predict(text)
+                actual = compiled.predict(text)
+                self.assertEqual(actual['is_fake'], expected['is_fake'])
+                self.assertAlmostEqual(actual['probability_fake'], expected['probability_fake'], places=9)
+
+            self.detector.save_model(os.path.join(directory, 'v.pkl'), os.path.join(directory, 'm.pkl'))
+            export_compiled(os.path.join(directory, 'v.pkl'), os.path.join(directory, 'm.pkl'),
+                            os.path.join(directory, 'exported.npz'))
+            _, exported_model = load_compiled(os.path.join(directory, 'exported.npz'))
+            np.testing.assert_array_equal(exported_model.coef_, model.coef_)
+
+    def test_long_tokens_use_bounded_memory(self):
+        """Test that a huge token neither matches nor inflates the lookup array"""
+        compiled_vectorizer, compiled_model = compile_model(self.detector.vectorizer, self.detector.model)
+        article = ' '.join(self.texts * 20)
+        texts = [f"{article} {'x' * 20000} {self.texts[i]}" for i in range(2)]
+
+        tracemalloc.start()
+        rows = compiled_vectorizer.transform(texts)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, 20 * 2 ** 20)
+
+        expected = self.detector.model.predict_proba(self.detector.vectorizer.transform(texts))
+        np.testing.assert_allclose(compiled_model.predict_proba(rows), expected, rtol=0, atol=1e-9)
+
+    def test_train_after_load_compiled(self):
+        """Test that a detector holding a compiled model can be retrained"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.npz')
+            self.detector.save_compiled(path)
+            detector = FakeNewsDetector()
+            detector.load_compiled(path)
+            compiled_version = detector.model_version
+
+        detector.train(self.texts, self.labels)
+        self.assertIsInstance(detector.vectorizer, TfidfVectorizer)
+        self.assertIsInstance(detector.model, LogisticRegression)
+        self.assertNotEqual(detector.model_version, compiled_version)
+        self.assertEqual(detector.predict(self.texts[0]), self.detector.predict(self.texts[0]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,3 +1,6 @@
+import random
+import subprocess
+import sys
 import unittest
 import numpy as np
 from fake_news_detector import FakeNewsDetector, create_sample_dataset
@@ -21,6 +24,62 @@ class TestFakeNewsDetector(unittest.TestCase):
         for input_text, expected_output in test_cases:
             result = self.detector.preprocess_text(input_text)
             self.assertEqual(result, expected_output)
+        
+        nltk_detector = FakeNewsDetector(tokenizer='nltk')
+        for input_text, expected_output in test_cases:
+            self.assertEqual(nltk_detector.preprocess_text(input_text), expected_output)
+    
+    def test_fast_preprocessing_matches_nltk(self):
+        """Test that the fast tokenizer reproduces the NLTK pipeline exactly"""
+        nltk_detector = FakeNewsDetector(tokenizer='nltk')
+        fast_detector = FakeNewsDetector(tokenizer='fast')
+        
+        corpus = list(self.texts) + [
+            "Numbers 12345 should be removed",
+            "We cannot stop, gonna wanna gotta gimme lemme more",
+            "mail me at a@http://example.com b or www.example.org/path now",
+            "Tabs\tand\nnewlines\u00a0and\u2028odd\x1cspaces",
+            "Caf\u00e9 na\u00efve \u0130stanbul \u212aelvin stra\u00dfe",
+        ]
+        
+        # Randomized corpus mixing words, contractions, URLs, emails,
+        # digits, punctuation and Unicode letters/whitespace
+        rng = random.Random(1234)
+        pieces = [
+            'Breaking', 'news', 'the', 'and', 'cannot', 'gonna', 'WANNA',
+            'gotta', 'gimme', 'lemme', 'Aliens', "don't", "it's", 'http://x.co/a?b=1',
+            'https://t.co', 'www.site.com', 'user@mail.com', '@', 'a@', '@b',
+            '2024', '0.25%', '!!!', '...', '--', '(', ')', '"', "'", '$5',
+            '\u00e9t\u00e9', '\u0130', '\u212a', '\u00df', '\u4e2d\u6587',
+            ' ', '  ', '\t', '\n', '\u00a0', '\u3000', '\x1f',
+        ]
+        for _ in range(2000):
+            corpus.append(''.join(
+                rng.choice(pieces) + rng.choice(['', ' ', ' '])
+                for _ in range(rng.randint(0, 20))
+            ))
+        
+        for text in corpus:
+            self.assertEqual(
+                fast_detector.preprocess_text(text),
+                nltk_detector.preprocess_text(text),
+                msg=repr(text)
+            )
+        
+        self.assertEqual(
+            list(fast_detector.preprocess_many(corpus)),
+            [nltk_detector.preprocess_text(text) for text in corpus]
+        )
+    
+    def test_import_is_offline_and_lightweight(self):
+        """Test that importing the module loads neither NLTK nor sklearn"""
+        code = (
+            "import sys, fake_news_detector; "
+            "print(sorted(m for m in ('nltk', 'sklearn', 'joblib') if m in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), '[]')
+        self.assertIn('the', self.detector.stop_words)
     
     def test_train_model(self):
         """Test model training functionality"""
@@ -64,6 +123,125 @@ class TestFakeNewsDetector(unittest.TestCase):
             # Check that probabilities sum to 1
             self.assertAlmostEqual(result['probability_fake'] + result['probability_real'], 1.0, places=2)
     
+    def test_predict_batch(self):
+        """Test that batch prediction matches the model's own predict_proba"""
+        self.detector.train(self.texts, self.labels)
+        
+        test_texts = [
+            "Scientists discover a new planet made entirely of gold in our solar system.",
+            "The Federal Reserve announced a 0.25% interest rate hike today.",
+            "",
+        ]
+        
+        results = self.detector.predict_batch(test_texts)
+        self.assertEqual(len(results), len(test_texts))
+        processed = [self.detector.preprocess_text(text) for text in test_texts]
+        features = self.detector.vectorizer.transform(processed)
+        probabilities = self.detector.model.predict_proba(features)
+        predictions = self.detector.model.predict(features)
+        for result, (probability_real, probability_fake), prediction in zip(results, probabilities, predictions):
+            self.assertEqual(result['is_fake'], bool(prediction == 1))
+            self.assertAlmostEqual(result['probability_fake'], probability_fake)
+            self.assertAlmostEqual(result['probability_real'], probability_real)
+            self.assertAlmostEqual(result['confidence'], max(probability_fake, probability_real))
+        
+        self.assertEqual(self.detector.predict_batch([]), [])
+        self.assertEqual(self.detector.predict_processed(processed), results)
+    
+    def test_prediction_cache(self):
+        """Test that repeated texts are served from the prediction cache"""
+        self.detector.train(self.texts, self.labels)
+        
+        first = self.detector.predict("Aliens built the pyramids!")
+        # Same preprocessed text, so this is a cache hit
+        second = self.detector.predict("aliens built the PYRAMIDS")
+        self.assertEqual(first, second)
+        
+        stats = self.detector.cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        
+        # Mutating a returned result must not affect the cache
+        second['is_fake'] = None
+        self.assertEqual(self.detector.predict("Aliens built the pyramids"), first)
+        
+        uncached = FakeNewsDetector(cache_size=0)
+        uncached.train(self.texts, self.labels)
+        self.assertEqual(uncached.cache_stats(), {})
+        self.assertAlmostEqual(uncached.predict("Aliens built the pyramids")['probability_fake'],
+                               first['probability_fake'])
+    
+    def test_explain(self):
+        """Test that term contributions add up to the predicted log-odds"""
+        self.detector.train(self.texts, self.labels)
+        text = "Aliens built the pyramids, ancient astronaut theory confirmed by secret documents"
+        
+        explanation = self.detector.explain(text, top_k=1000)
+        prediction = self.detector.predict(text)
+        self.assertAlmostEqual(explanation['probability_fake'], prediction['probability_fake'])
+        self.assertEqual(explanation['is_fake'], prediction['is_fake'])
+        
+        log_odds = explanation['intercept'] + sum(item['contribution'] for item in explanation['contributions'])
+        self.assertAlmostEqual(1 / (1 + np.exp(-log_odds)), prediction['probability_fake'])
+        self.assertIn('aliens', [item['term'] for item in explanation['contributions']])
+        
+        top = self.detector.explain(text, top_k=3)['contributions']
+        self.assertEqual(top, explanation['contributions'][:3])
+        magnitudes = [abs(item['contribution']) for item in explanation['contributions']]
+        self.assertEqual(magnitudes, sorted(magnitudes, reverse=True))
+        
+        # Compiled and hashed (streaming-trained) models name their features too
+        from sklearn.linear_model import LogisticRegression
+        from compiled_model import compile_model
+        from streaming_training import make_vectorizer
+        
+        compiled = FakeNewsDetector()
+        compiled.vectorizer, compiled.model = compile_model(self.detector.vectorizer, self.detector.model)
+        compiled._model_changed()
+        self.assertEqual([item['term'] for item in compiled.explain(text, top_k=3)['contributions']],
+                         [item['term'] for item in top])
+        
+        hashed = FakeNewsDetector()
+        hashed.vectorizer = make_vectorizer()
+        hashed.model = LogisticRegression()
+        hashed.model.fit(hashed.vectorizer.transform(list(hashed.preprocess_many(self.texts))), self.labels)
+        hashed._model_changed()
+        terms = [item['term'] for item in hashed.explain(text, top_k=1000)['contributions']]
+        self.assertIn('aliens', terms)
+        self.assertIn('aliens built', terms)
+        
+        self.assertEqual(self.detector.explain('', top_k=5)['contributions'], [])
+    
+    def test_model_version_changes_with_artifacts(self):
+        """Test that loading different artifacts changes the model version"""
+        self.detector.train(self.texts, self.labels)
+        self.detector.predict("Aliens built the pyramids")
+        trained_version = self.detector.model_version
+        self.assertIsNotNone(trained_version)
+        
+        # Retraining on the same data gives the same fingerprint
+        retrained = FakeNewsDetector()
+        retrained.train(self.texts, self.labels)
+        self.assertEqual(retrained.model_version, trained_version)
+        
+        other = FakeNewsDetector()
+        other.train(self.texts[:8] + self.texts[10:18], self.labels[:8] + self.labels[10:18])
+        other.save_model('test_vectorizer.pkl', 'test_model.pkl')
+        try:
+            self.detector.load_model('test_vectorizer.pkl', 'test_model.pkl')
+        finally:
+            import os
+            os.remove('test_vectorizer.pkl')
+            os.remove('test_model.pkl')
+        
+        self.assertNotEqual(self.detector.model_version, trained_version)
+        self.assertEqual(self.detector.model_version, other.model_version)
+        self.assertEqual(len(self.detector.cache), 0)
+        self.assertEqual(
+            self.detector.predict("Aliens built the pyramids"),
+            other.predict("Aliens built the pyramids")
+        )
+    
     def test_save_and_load_model(self):
         """Test model saving and loading functionality"""
         # Train the model
@@ -0,0 +1,95 @@
+import mmap
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import fake_news_detector
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from feature_cache import FeatureCache
+
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.texts, self.labels = create_sample_dataset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = FeatureCache(self.directory.name)
+        self.addCleanup(self.cache.close)
+
+    def test_repeat_training_skips_preprocessing(self):
+        """Test that a repeat run loads cached matrices and matches an uncached run"""
+        uncached = FakeNewsDetector()
+        expected_metrics = uncached.train(self.texts, self.labels)
+
+        first = FakeNewsDetector()
+        self.assertEqual(first.train(self.texts, self.labels, feature_cache=self.cache), expected_metrics)
+        self.assertEqual(self.cache.stats()['matrix_misses'], 1)
+
+        second = FakeNewsDetector()
+        with mock.patch.object(FakeNewsDetector, 'preprocess_many', side_effect=AssertionError):
+            metrics = second.train(self.texts, self.labels, feature_cache=self.cache)
+        self.assertEqual(metrics, expected_metrics)
+        self.assertEqual(self.cache.stats()['matrix_hits'], 1)
+        self.assertEqual(second.model_version, uncached.model_version)
+        self.assertEqual(second.predict(self.texts[0]), uncached.predict(self.texts[0]))
+
+    def test_cached_matrices_are_memory_mapped(self):
+        """Test that cached CSR arrays are opened with mmap"""
+        FakeNewsDetector().train(self.texts, self.labels, feature_cache=self.directory.name)
+        entries = os.listdir(os.path.join(self.directory.name, 'matrices'))
+        self.assertEqual(len(entries), 1)
+
+        matrices, _ = self.cache.load_matrices(entries[0])
+        for array in (matrices['train'].data, matrices['train'].indices):
+            base = array
+            while not isinstance(base, mmap.mmap):
+                base = base.base
+                self.assertIsNotNone(base, "array is not backed by a memory map")
+            self.assertFalse(array.flags.writeable)
+        self.assertEqual(matrices['train'].shape[0] + matrices['test'].shape[0], len(self.texts))
+
+    def test_fingerprint_covers_preprocessing_patterns(self):
+        """Test that changing any cleaning pattern of either tokenizer changes the fingerprint"""
+        for tokenizer, name in (('fast', 'URL_PATTERN'), ('nltk', 'NLTK_URL_PATTERN'),
+                                ('nltk', 'NLTK_NON_ALPHA_PATTERN'), ('nltk', 'WHITESPACE_PATTERN')):
+            with self.subTest(tokenizer=tokenizer, pattern=name):
+                detector = FakeNewsDetector(tokenizer=tokenizer)
+                fingerprint = detector.preprocessing_fingerprint()
+                with mock.patch.object(fake_news_detector, name, re.compile(r'changed')):
+                    self.assertNotEqual(detector.preprocessing_fingerprint(), fingerprint)
+                self.assertEqual(detector.preprocessing_fingerprint(), fingerprint)
+
+    def test_stopword_change_invalidates(self):
+        """Test that changing the stopword set misses both cache layers"""
+        detector = FakeNewsDetector()
+        detector.train(self.texts, self.labels, feature_cache=self.cache)
+        detector.preprocess_text('warm up')
+
+        changed = FakeNewsDetector()
+        changed.stop_words = changed.stop_words - {'the'}
+        self.assertNotEqual(changed.preprocessing_fingerprint(), detector.preprocessing_fingerprint())
+        changed.train(self.texts, self.labels, feature_cache=self.cache)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['matrix_misses'], 2)
+        self.assertEqual(stats['text_hits'], 0)
+        self.assertEqual(stats['text_misses'], 2 * len(self.texts))
+
+    def test_text_cache_is_per_document(self):
+        """Test that preprocessed text is reused across different corpora"""
+        detector = FakeNewsDetector()
+        self.assertEqual(self.cache.preprocess(detector, self.texts[:10]),
+                         [detector.preprocess_text(text) for text in self.texts[:10]])
+        processed = self.cache.preprocess(detector, self.texts[5:15] + self.texts[5:6])
+        self.assertEqual(processed, [detector.preprocess_text(text) for text in self.texts[5:15] + self.texts[5:6]])
+        stats = self.cache.stats()
+        self.assertEqual(stats['text_hits'], 6)
+        self.assertEqual(stats['text_misses'], 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,11 @@
+"""Shared test doubles"""
+
+
+class FakeClock:
+    """Manually advanced clock; set `now` to move time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,64 @@
+import unittest
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from metrics import MetricFamily, MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_quantiles(self):
+        """Test that quantiles are interpolated within the right bucket"""
+        histogram = self.registry.histogram('latency_seconds', 'Latency', buckets=(0.01, 0.1, 1.0))
+        for value in [0.005] * 50 + [0.05] * 45 + [0.5] * 5:
+            histogram.observe(value)
+
+        self.assertLessEqual(histogram.quantile(0.5), 0.01)
+        self.assertTrue(0.01 < histogram.quantile(0.95) <= 0.1)
+        self.assertTrue(0.1 < histogram.quantile(0.99) <= 1.0)
+        self.assertIsNone(histogram.quantile(0.5, 'unknown'))
+        self.assertEqual(histogram.summary()['latency_seconds']['count'], 100)
+
+    def test_prometheus_text_format(self):
+        """Test counter, histogram and collector exposition"""
+        requests = self.registry.counter('requests_total', 'Requests', ('route', 'status'))
+        requests.inc('/analyze', '200')
+        requests.inc('/analyze', '200')
+        histogram = self.registry.histogram('size', 'Batch size', buckets=(1, 4))
+        histogram.observe(3)
+        histogram.observe(10)
+        self.registry.register_collector(lambda: [
+            MetricFamily('cache_hit_rate', 'gauge', 'Hit rate', [({'cache': 'say "hi"'}, 0.5)])
+        ])
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('# TYPE requests_total counter', lines)
+        self.assertIn('requests_total{route="/analyze",status="200"} 2', lines)
+        self.assertIn('# TYPE size histogram', lines)
+        self.assertIn('size_bucket{le="1"} 0', lines)
+        self.assertIn('size_bucket{le="4"} 1', lines)
+        self.assertIn('size_bucket{le="+Inf"} 2', lines)
+        self.assertIn('size_sum 13', lines)
+        self.assertIn('size_count 2', lines)
+        self.assertIn('cache_hit_rate{cache="say \\"hi\\""} 0.5', lines)
+
+    def test_detector_stage_hooks(self):
+        """Test that predict_batch reports each stage to the observer"""
+        texts, labels = create_sample_dataset()
+        detector = FakeNewsDetector()
+        detector.train(texts, labels)
+        stages = []
+        detector.stage_observer = lambda stage, seconds: stages.append((stage, seconds))
+
+        detector.predict_batch(texts[:3])
+        self.assertEqual([stage for stage, _ in stages], ['preprocess', 'cache_lookup', 'transform', 'predict_proba'])
+        self.assertTrue(all(seconds >= 0 for _, seconds in stages))
+
+        stages.clear()
+        detector.predict_batch(texts[:3])
+        self.assertEqual([stage for stage, _ in stages], ['preprocess', 'cache_lookup'])
+
+
+if __name__ == '__main__':
+    unittest.main()
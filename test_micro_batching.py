@@ -0,0 +1,139 @@
+import threading
+import time
+import unittest
+
+from micro_batching import MicroBatcher, QueueFullError
+
+
+class RecordingPredictor:
+    """Fake predict_batch that records batch sizes"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def __call__(self, texts):
+        time.sleep(self.delay)
+        self.batch_sizes.append(len(texts))
+        return [{'text': text} for text in texts]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def make_batcher(self, predictor, **kwargs):
+        batcher = MicroBatcher(predictor, **kwargs)
+        self.addCleanup(batcher.close, 5)
+        return batcher
+
+    def test_concurrent_requests_are_batched(self):
+        """Test that concurrent submissions share one batch and get their own results"""
+        predictor = RecordingPredictor()
+        batcher = self.make_batcher(predictor, max_wait_ms=200, max_batch_size=8)
+
+        futures = [batcher.submit(f"text {i}") for i in range(8)]
+        results = [future.result(5) for future in futures]
+
+        self.assertEqual(results, [{'text': f"text {i}"} for i in range(8)])
+        self.assertEqual(predictor.batch_sizes, [8])
+        self.assertEqual(batcher.stats()['mean_batch_size'], 8)
+
+    def test_max_batch_size(self):
+        """Test that batches never exceed max_batch_size"""
+        predictor = RecordingPredictor()
+        batcher = self.make_batcher(predictor, max_wait_ms=200, max_batch_size=3)
+
+        futures = [batcher.submit(str(i)) for i in range(7)]
+        for future in futures:
+            future.result(5)
+
+        self.assertEqual(sum(predictor.batch_sizes), 7)
+        self.assertLessEqual(max(predictor.batch_sizes), 3)
+
+    def test_max_wait_bounds_latency(self):
+        """Test that a lone request is scored once max_wait_ms elapses"""
+        batcher = self.make_batcher(RecordingPredictor(), max_wait_ms=20, max_batch_size=100)
+        start = time.perf_counter()
+        self.assertEqual(batcher.predict('alone', timeout=5), {'text': 'alone'})
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_queue_full_backpressure(self):
+        """Test that submissions beyond max_queue are rejected"""
+        predictor = RecordingPredictor(delay=0.3)
+        batcher = self.make_batcher(predictor, max_wait_ms=0, max_batch_size=1, max_queue=2)
+
+        batcher.submit('in flight')
+        time.sleep(0.1)
+        batcher.submit('queued 1')
+        batcher.submit('queued 2')
+        with self.assertRaises(QueueFullError):
+            batcher.submit('rejected')
+        self.assertEqual(batcher.stats()['rejected'], 1)
+
+    def test_errors_propagate_to_callers(self):
+        """Test that a failing batch fails every caller in it"""
+        def failing(texts):
+            raise RuntimeError('model exploded')
+
+        batcher = self.make_batcher(failing, max_wait_ms=50)
+        futures = [batcher.submit('a'), batcher.submit('b')]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(5)
+
+    def test_short_results_fail_unmatched_callers(self):
+        """Test that callers without a result get an error instead of hanging"""
+        batcher = self.make_batcher(lambda texts: [{'text': texts[0]}], max_wait_ms=100)
+        first, second = batcher.submit('a'), batcher.submit('b')
+        self.assertEqual(first.result(5), {'text': 'a'})
+        with self.assertRaises(RuntimeError):
+            second.result(5)
+
+    def test_timed_out_texts_are_not_scored(self):
+        """Test that a text whose caller timed out is cancelled and skipped"""
+        predictor = RecordingPredictor(delay=0.2)
+        batcher = self.make_batcher(predictor, max_wait_ms=0, max_batch_size=1)
+        busy = batcher.submit('in flight')
+        time.sleep(0.05)
+        with self.assertRaises(TimeoutError):
+            batcher.predict('abandoned', timeout=0.01)
+        self.assertEqual(batcher.predict('next', timeout=5), {'text': 'next'})
+
+        self.assertEqual(busy.result(5), {'text': 'in flight'})
+        self.assertEqual(predictor.batch_sizes, [1, 1])
+        self.assertEqual(batcher.stats()['cancelled'], 1)
+
+    def test_close(self):
+        """Test that close finishes queued work, even with a full queue, and refuses new texts"""
+        predictor = RecordingPredictor(delay=0.1)
+        batcher = MicroBatcher(predictor, max_wait_ms=0, max_batch_size=1, max_queue=2)
+        futures = [batcher.submit('in flight')]
+        time.sleep(0.05)
+        futures += [batcher.submit('queued 1'), batcher.submit('queued 2')]
+
+        batcher.close(5)
+        self.assertEqual([future.result(0) for future in futures],
+                         [{'text': 'in flight'}, {'text': 'queued 1'}, {'text': 'queued 2'}])
+        with self.assertRaises(RuntimeError):
+            batcher.submit('too late')
+        batcher.close(5)
+
+    def test_threaded_callers(self):
+        """Test many threads calling predict concurrently"""
+        predictor = RecordingPredictor(delay=0.005)
+        batcher = self.make_batcher(predictor, max_wait_ms=5, max_batch_size=16)
+        results = {}
+
+        def call(i):
+            results[i] = batcher.predict(f"t{i}", timeout=10)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(64)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {i: {'text': f"t{i}"} for i in range(64)})
+        self.assertLess(len(predictor.batch_sizes), 64)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from model_bundle import MANIFEST_NAME, migrate, read_bundle, read_manifest, write_bundle
+
+
+class TestModelBundle(unittest.TestCase):
+    def setUp(self):
+        self.texts, self.labels = create_sample_dataset()
+        self.detector = FakeNewsDetector()
+        self.detector.train(self.texts, self.labels)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'model.bundle')
+
+    def test_save_and_load_bundle(self):
+        """Test that a bundle round trip preserves predictions and version"""
+        self.detector.save_model(self.path)
+
+        manifest = read_manifest(self.path)
+        self.assertEqual(manifest['model_version'], self.detector.model_version)
+        self.assertEqual(set(manifest['arrays']), {'terms', 'idf', 'coef', 'intercept', 'classes'})
+
+        loaded = FakeNewsDetector()
+        loaded.load_model(self.path)
+        self.assertEqual(loaded.model_version, self.detector.model_version)
+        for text in self.texts:
+            expected = self.detector.predict(text)
+            actual = loaded.predict(text)
+            self.assertEqual(actual['is_fake'], expected['is_fake'])
+            self.assertAlmostEqual(actual['probability_fake'], expected['probability_fake'], places=9)
+
+    def test_arrays_are_memory_mapped(self):
+        """Test that weights are memory-mapped read-only"""
+        self.detector.save_model(self.path)
+        vectorizer, model = read_bundle(self.path)
+        for array in (vectorizer.terms, vectorizer.idf_, model.coef_):
+            self.assertIsInstance(array, np.memmap)
+            self.assertFalse(array.flags.writeable)
+
+        vectorizer, _ = read_bundle(self.path, mmap=False)
+        self.assertNotIsInstance(vectorizer.terms, np.memmap)
+
+    def test_checksum_mismatch(self):
+        """Test that a corrupted array file is rejected"""
+        self.detector.save_model(self.path)
+        coef_path = os.path.join(self.path, 'coef.npy')
+        with open(coef_path, 'r+b') as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b'\x00' * 8)
+
+        with self.assertRaises(ValueError):
+            read_bundle(self.path)
+        read_bundle(self.path, verify=False)
+
+    def test_unsupported_format_version(self):
+        """Test that bundles from a newer format are refused"""
+        self.detector.save_model(self.path)
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['format_version'] = 99
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        with self.assertRaises(ValueError):
+            FakeNewsDetector().load_model(self.path)
+
+    def test_overwrite_existing_bundle(self):
+        """Test that writing over a bundle replaces it without leftovers"""
+        self.detector.save_model(self.path)
+        other = FakeNewsDetector()
+        other.train(self.texts[:8] + self.texts[10:18], self.labels[:8] + self.labels[10:18])
+        write_bundle(self.path, other.vectorizer, other.model, other.model_version)
+
+        self.assertEqual(read_manifest(self.path)['model_version'], other.model_version)
+
+        # The path is swapped atomically; only the current and previous versions are kept
+        self.assertTrue(os.path.islink(self.path))
+        write_bundle(self.path, self.detector.vectorizer, self.detector.model, self.detector.model_version)
+        self.assertEqual(read_manifest(self.path)['model_version'], self.detector.model_version)
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+    def test_bundles_sharing_a_prefix(self):
+        """Test that saving one bundle never removes versions of a bundle whose name extends it"""
+        other = os.path.join(self.directory.name, 'model.bundle-v2')
+        write_bundle(other, self.detector.vectorizer, self.detector.model, 'other')
+        for version in ('a', 'b', 'c'):
+            write_bundle(self.path, self.detector.vectorizer, self.detector.model, version)
+
+        self.assertEqual(read_manifest(other)['model_version'], 'other')
+        read_bundle(other)
+        self.assertEqual(read_manifest(self.path)['model_version'], 'c')
+
+    def test_replaces_unversioned_bundle(self):
+        """Test that a plain bundle directory from before versioning is replaced"""
+        self.detector.save_model(self.path)
+        os.rename(os.path.realpath(self.path), self.path + '.tmp')
+        os.remove(self.path)
+        os.rename(self.path + '.tmp', self.path)
+
+        write_bundle(self.path, self.detector.vectorizer, self.detector.model, 'v2')
+        self.assertTrue(os.path.islink(self.path))
+        self.assertEqual(read_manifest(self.path)['model_version'], 'v2')
+
+    def test_migrate_from_pickles(self):
+        """Test converting the pickled artifacts into a bundle"""
+        vectorizer_path = os.path.join(self.directory.name, 'v.pkl')
+        model_path = os.path.join(self.directory.name, 'm.pkl')
+        self.detector.save_model(vectorizer_path, model_path)
+
+        version = migrate(vectorizer_path, model_path, self.path)
+        self.assertEqual(version, self.detector.model_version)
+
+        loaded = FakeNewsDetector()
+        loaded.load_model(self.path)
+        self.assertEqual(loaded.predict(self.texts[0]), self.detector.predict(self.texts[0]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
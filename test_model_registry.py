@@ -0,0 +1,132 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from model_registry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.texts, self.labels = create_sample_dataset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'model.bundle')
+        self.manifest = os.path.join(self.path, 'manifest.json')
+
+    def save(self, labels):
+        detector = FakeNewsDetector()
+        detector.train(self.texts, labels)
+        detector.save_model(self.path)
+        # Make sure the swap is visible even on coarse mtime filesystems
+        stat = os.stat(self.manifest)
+        os.utime(self.manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        return detector.model_version
+
+    def loader(self):
+        detector = FakeNewsDetector()
+        detector.load_model(self.path)
+        return detector
+
+    def test_swaps_model_when_artifacts_change(self):
+        """Test that a changed bundle is picked up and served"""
+        first_version = self.save(self.labels)
+        registry = ModelRegistry(self.loader, watch_paths=[self.manifest])
+        registry.load()
+        self.assertEqual(registry.model_version, first_version)
+        self.assertFalse(registry.check_for_changes())
+
+        second_version = self.save([1 - label for label in self.labels])
+        self.assertNotEqual(first_version, second_version)
+        self.assertTrue(registry.check_for_changes())
+        self.assertEqual(registry.model_version, second_version)
+        self.assertEqual(registry.stats()['reloads'], 2)
+
+    def test_in_flight_reference_keeps_old_model(self):
+        """Test that a detector taken before a swap keeps scoring on the old model"""
+        first_version = self.save(self.labels)
+        registry = ModelRegistry(self.loader, watch_paths=[self.manifest])
+        registry.load()
+        in_flight = registry.current
+        expected = in_flight.predict(self.texts[0])
+
+        self.save([1 - label for label in self.labels])
+        registry.reload_in_background().join()
+
+        self.assertIsNot(registry.current, in_flight)
+        self.assertEqual(in_flight.model_version, first_version)
+        self.assertEqual(in_flight.predict(self.texts[0]), expected)
+        self.assertNotEqual(registry.current.predict(self.texts[0])['is_fake'], expected['is_fake'])
+
+    def test_failed_reload_keeps_current_model(self):
+        """Test that a broken artifact leaves the old model serving"""
+        version = self.save(self.labels)
+        registry = ModelRegistry(self.loader, watch_paths=[self.manifest])
+        registry.load()
+
+        with open(self.manifest, 'w') as f:
+            f.write('{not json')
+        self.assertFalse(registry.check_for_changes())
+        self.assertEqual(registry.model_version, version)
+        stats = registry.stats()
+        self.assertEqual(stats['reload_errors'], 1)
+        self.assertIsNotNone(stats['last_error'])
+
+    def test_failed_reload_is_not_retried(self):
+        """Test that a broken artifact is tried once, until it changes again"""
+        self.save(self.labels)
+        registry = ModelRegistry(self.loader, watch_paths=[self.manifest])
+        registry.load()
+
+        with open(self.manifest, 'w') as f:
+            f.write('{not json')
+        self.assertFalse(registry.check_for_changes())
+        self.assertFalse(registry.check_for_changes())
+        self.assertEqual(registry.stats()['reload_errors'], 1)
+
+        version = self.save([1 - label for label in self.labels])
+        self.assertTrue(registry.check_for_changes())
+        self.assertEqual(registry.model_version, version)
+
+    def test_paired_paths_reload_once_both_change(self):
+        """Test that a path pair only reloads after every path in it changed"""
+        first, second = (os.path.join(self.directory.name, name) for name in ('a', 'b'))
+        for path in (first, second):
+            with open(path, 'w') as f:
+                f.write('old')
+        loads = []
+        registry = ModelRegistry(lambda: loads.append(1) or FakeNewsDetector(), watch_paths=[(first, second)])
+
+        with open(first, 'w') as f:
+            f.write('new contents')
+        self.assertFalse(registry.check_for_changes())
+        with open(second, 'w') as f:
+            f.write('new contents')
+        self.assertTrue(registry.check_for_changes())
+        self.assertEqual(len(loads), 1)
+
+    def test_watcher_polls_for_changes(self):
+        """Test that the background watcher reloads without being asked"""
+        self.save(self.labels)
+        registry = ModelRegistry(self.loader, watch_paths=[self.manifest], poll_interval=0.01)
+        registry.load()
+        reloaded = threading.Event()
+        original_load = registry.load
+
+        def load():
+            detector = original_load()
+            reloaded.set()
+            return detector
+
+        registry.load = load
+        registry.start_watching()
+        self.addCleanup(registry.stop)
+
+        version = self.save([1 - label for label in self.labels])
+        self.assertTrue(reloaded.wait(5))
+        self.assertEqual(registry.model_version, version)
+
+
+if __name__ == '__main__':
+    unittest.main()
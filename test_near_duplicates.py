@@ -0,0 +1,72 @@
+import unittest
+
+from near_duplicates import NearDuplicateIndex
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NearDuplicateIndex(max_entries=3)
+
+    def test_finds_near_duplicates(self):
+        """Test that lightly edited copies match and unrelated texts do not"""
+        original = "aliens landed major city government officials confirm extraterrestrial contact"
+        self.index.add(self.index.signature(original), 'aliens')
+
+        key, value, similarity = self.index.find(self.index.signature(original + " reuters"))
+        self.assertEqual(value, 'aliens')
+        self.assertGreaterEqual(similarity, self.index.threshold)
+        self.assertIsNone(self.index.find(self.index.signature("tech giants report record quarterly earnings")))
+        self.assertIsNone(self.index.find(self.index.signature("")))
+
+        stats = self.index.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_bounded_lru_eviction(self):
+        """Test that the least recently matched entry is evicted with its buckets"""
+        texts = ["stock markets rally record highs", "new deep sea species discovered",
+                 "space station conducts experiments", "school district implements curriculum"]
+        signatures = [self.index.signature(text) for text in texts]
+        keys = [self.index.add(signature, i) for i, signature in enumerate(signatures[:3])]
+        self.assertEqual(self.index.find(signatures[0])[1], 0)
+
+        self.index.add(signatures[3], 3)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.stats()['evictions'], 1)
+        self.assertIsNone(self.index.find(signatures[1]))
+        self.assertEqual(self.index.find(signatures[0])[1], 0)
+
+        self.index.discard(keys[0])
+        self.assertIsNone(self.index.find(signatures[0]))
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.stats()['evictions'], 1)
+
+    def test_score_reuses_cluster_verdicts(self):
+        """Test that each cluster is scored once and stale verdicts are evicted one by one"""
+        index = NearDuplicateIndex()
+        story = "aliens landed major city government officials confirm extraterrestrial contact"
+        other = "tech giants report record quarterly earnings beating analyst expectations"
+        calls = []
+
+        def score_batch(version):
+            def score(texts):
+                calls.append(list(texts))
+                return [{'text': text, 'model_version': version} for text in texts]
+            return score
+
+        results = index.score([story, story + " reuters", other], score_batch('v1'), 'v1')
+        self.assertEqual(calls, [[story, other]])
+        self.assertEqual(results[1], {'text': story, 'model_version': 'v1'})
+
+        index.score([story + " ap"], score_batch('v1'), 'v1')
+        self.assertEqual(len(calls), 1)
+
+        # A new model rescores the stale cluster without clearing the others
+        results = index.score([story], score_batch('v2'), 'v2')
+        self.assertEqual(calls[-1], [story])
+        self.assertEqual(results[0]['model_version'], 'v2')
+        self.assertEqual(len(index), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
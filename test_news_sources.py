@@ -0,0 +1,181 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from news_sources import FixtureNewsSource, HackerNewsSource, NewsFetcher, NewsSource
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve Hacker News shaped responses; /slow, /trickle and /error paths misbehave"""
+
+    def do_GET(self):
+        self.server.request_count += 1
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        query = params.get('query', params.get('tags', ['']))[0]
+
+        if parsed.path.startswith('/slow'):
+            time.sleep(float(parsed.path.rsplit('/', 1)[-1]))
+        if parsed.path.startswith('/trickle'):
+            # Send a byte at a time, always within the client's read timeout
+            stop = time.monotonic() + float(parsed.path.rsplit('/', 1)[-1])
+            self.send_response(200)
+            self.send_header('Content-Length', '100000')
+            self.end_headers()
+            try:
+                while time.monotonic() < stop:
+                    self.wfile.write(b' ')
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+            return
+        if parsed.path.startswith('/error'):
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = json.dumps({'hits': [
+            {'title': f"{query} story {i}", 'points': i, 'author': 'stub', 'objectID': str(i)}
+            for i in range(3)
+        ]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestNewsFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server.request_count = 0
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.request_count = 0
+
+    def make_fetcher(self, paths, **kwargs):
+        sources = [HackerNewsSource(self.base_url + path) for path in paths]
+        fetcher = NewsFetcher(sources, **kwargs)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def test_fetch_parses_hits(self):
+        """Test that hits are converted to news items"""
+        fetcher = self.make_fetcher(['/search'])
+        results = fetcher.fetch('climate')
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['title'], 'climate story 0')
+        self.assertEqual(results[0]['source'], 'Hacker News')
+        self.assertEqual(results[0]['url'], 'https://news.ycombinator.com/item?id=0')
+
+    def test_responses_are_cached_per_query(self):
+        """Test that repeated queries are served from the response cache"""
+        fetcher = self.make_fetcher(['/search'], cache_ttl=60)
+        first = fetcher.fetch('climate')
+        first[0]['title'] = 'mutated'
+        second = fetcher.fetch('climate')
+        fetcher.fetch('markets')
+
+        self.assertEqual(second[0]['title'], 'climate story 0')
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_sources_are_fetched_concurrently(self):
+        """Test that total latency is the slowest source, not the sum"""
+        fetcher = self.make_fetcher(['/slow/0.4', '/slow/0.4', '/slow/0.4'], deadline=2)
+        start = time.perf_counter()
+        results = fetcher.fetch('space')
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(results), 9)
+        self.assertLess(elapsed, 1.0)
+
+    def test_deadline_and_errors_skip_sources(self):
+        """Test that slow or failing sources are skipped and not cached"""
+        fetcher = self.make_fetcher(['/search', '/slow/1.5', '/error'], deadline=0.5)
+        start = time.perf_counter()
+        results = fetcher.fetch('health')
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([item['title'] for item in results], [f"health story {i}" for i in range(3)])
+        self.assertLess(elapsed, 1.2)
+        self.assertEqual(sum(fetcher.errors.values()), 2)
+        self.assertEqual(len(fetcher.cache), 0)
+
+    def test_hung_source_does_not_starve_fetches(self):
+        """Test that a source trickling its response is abandoned and frees its thread"""
+        fetcher = self.make_fetcher(['/trickle/5', '/search'], deadline=0.3, cache_size=0)
+        for i in range(6):
+            start = time.perf_counter()
+            results = fetcher.fetch(f"query{i}")
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertEqual([item['title'] for item in results], [f"query{i} story {j}" for j in range(3)])
+        self.assertEqual(fetcher.errors['Hacker News'], 6)
+
+        time.sleep(0.5)
+        self.assertEqual([thread for thread in threading.enumerate() if thread.name.startswith('news-fetch')], [])
+
+    def test_fetch_trending(self):
+        """Test that trending stories are fetched from every source, uncached"""
+        fetcher = self.make_fetcher(['/search', '/error'], cache_ttl=60)
+        fetcher.fetch_trending()
+        results = fetcher.fetch_trending()
+
+        self.assertEqual([item['title'] for item in results], [f"front_page story {i}" for i in range(3)])
+        self.assertEqual(self.server.request_count, 4)
+        self.assertEqual(fetcher.errors['Hacker News'], 2)
+
+    def test_custom_source(self):
+        """Test that any NewsSource subclass can be plugged in"""
+        class StaticSource(NewsSource):
+            name = 'Static'
+
+            def fetch(self, session, query, timeout):
+                return [{'title': query, 'description': '', 'url': '#', 'source': self.name, 'published_at': ''}]
+
+        fetcher = NewsFetcher([StaticSource()])
+        self.addCleanup(fetcher.close)
+        self.assertEqual(fetcher.fetch('markets')[0]['source'], 'Static')
+        # Sources without a trending feed contribute nothing to it
+        self.assertEqual(StaticSource().trending(fetcher.session, 1), [])
+
+        # fetch() is abstract, so an incomplete source fails at construction
+        with self.assertRaises(TypeError):
+            NewsSource()
+
+
+class TestFixtureNewsSource(unittest.TestCase):
+    def test_fixture_items(self):
+        """Test that a JSON fixture serves searches and trending stories"""
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump([{'title': 'Rates rise', 'description': 'Central bank'}, {'title': 'Galaxy found'}], f)
+        self.addCleanup(os.remove, f.name)
+
+        source = FixtureNewsSource(f.name)
+        self.assertEqual([item['title'] for item in source.fetch(None, 'central', 1)], ['Rates rise'])
+        trending = source.trending(None, 1)
+        self.assertEqual(len(trending), 2)
+        self.assertEqual(trending[1], {'title': 'Galaxy found', 'description': '', 'url': '#',
+                                       'source': 'Fixture', 'published_at': ''})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
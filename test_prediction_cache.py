@@ -0,0 +1,76 @@
+import threading
+import unittest
+from prediction_cache import PredictionCache
+from test_helpers import FakeClock
+
+
+class TestPredictionCache(unittest.TestCase):
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses"""
+        cache = PredictionCache(max_size=2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', {'is_fake': True})
+        self.assertEqual(cache.get('a'), {'is_fake': True})
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = PredictionCache(max_size=2)
+        cache.put('a', {'v': 1})
+        cache.put('b', {'v': 2})
+        cache.get('a')
+        cache.put('c', {'v': 3})
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'v': 1})
+        self.assertEqual(cache.get('c'), {'v': 3})
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are evicted on access"""
+        clock = FakeClock()
+        cache = PredictionCache(max_size=10, ttl=5, clock=clock)
+        cache.put('a', {'v': 1})
+
+        clock.now = 4.9
+        self.assertEqual(cache.get('a'), {'v': 1})
+        clock.now = 5.0
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_configuration(self):
+        """Test that non-positive sizes and TTLs are rejected"""
+        with self.assertRaises(ValueError):
+            PredictionCache(max_size=0)
+        with self.assertRaises(ValueError):
+            PredictionCache(ttl=0)
+
+    def test_concurrent_access(self):
+        """Test that concurrent puts and gets keep the cache bounded"""
+        cache = PredictionCache(max_size=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.put((offset, i), {'v': i})
+                cache.get((offset, i - 1))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats['size'], 50)
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 500)
+        self.assertEqual(stats['evictions'], 8 * 500 - 50)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from corpus_io import read_corpus
+from fake_news_detector import FakeNewsDetector, create_sample_dataset
+from streaming_training import is_held_out
+
+
+class TestStreamingTraining(unittest.TestCase):
+    def setUp(self):
+        texts, labels = create_sample_dataset()
+        self.texts = [f"{text} {variant}" for variant in ('today', 'report', 'update', 'story')
+                      for text in texts]
+        self.labels = labels * 4
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.corpus = os.path.join(self.directory.name, 'labelled.jsonl')
+        with open(self.corpus, 'w') as f:
+            for text, label in zip(self.texts, self.labels):
+                f.write(json.dumps({'text': text, 'label': label}) + '\n')
+            f.write(json.dumps({'text': 'no label here'}) + '\n')
+            f.write(json.dumps({'text': 'label out of range', 'label': 2}) + '\n')
+
+    def train(self, **options):
+        detector = FakeNewsDetector()
+        options.setdefault('workers', 0)
+        metrics = detector.train_streaming(self.corpus, chunk_size=8, epochs=5, log=io.StringIO(), **options)
+        return detector, metrics
+
+    def test_train_streaming(self):
+        """Test that streaming training fits a usable model and reports metrics"""
+        detector, metrics = self.train()
+        self.assertEqual(set(metrics), {'accuracy', 'precision', 'recall', 'f1_score'})
+        for value in metrics.values():
+            self.assertGreaterEqual(value, 0)
+            self.assertLessEqual(value, 1)
+
+        result = detector.predict(self.texts[0])
+        self.assertIn('is_fake', result)
+        self.assertIsNotNone(detector.model_version)
+        train_texts = [t for t in self.texts if not is_held_out(t, 0.2)]
+        train_labels = [l for t, l in zip(self.texts, self.labels) if not is_held_out(t, 0.2)]
+        correct = sum(r['is_fake'] == bool(l) for r, l in zip(detector.predict_batch(train_texts), train_labels))
+        self.assertGreater(correct / len(train_texts), 0.9)
+
+    def test_labels_must_be_binary(self):
+        """Test that labels other than 0/1 become error records"""
+        body = 'text,label\na,1\nb,0.0\nc,2\nd,1.5\ne,yes\nf,\n'
+        records = list(read_corpus(io.StringIO(body), 'csv', label_field='label'))
+        self.assertEqual([record.label for record in records[:2]], [1, 0])
+        self.assertTrue(all(record.error for record in records[2:]))
+        records = list(read_corpus(io.StringIO('{"text": "a", "label": [1]}\n{"text": "b", "label": 1.0}\n'),
+                                   'jsonl', label_field='label'))
+        self.assertIsNotNone(records[0].error)
+        self.assertEqual(records[1].label, 1)
+
+    def test_process_pool_matches_in_process(self):
+        """Test that parallel preprocessing gives the same model"""
+        local, local_metrics = self.train()
+        pooled, pooled_metrics = self.train(workers=2)
+        self.assertEqual(pooled.model_version, local.model_version)
+        self.assertEqual(pooled_metrics, local_metrics)
+
+    def test_save_and_load_pickles(self):
+        """Test that a streamed model round-trips through the pickle format"""
+        detector, _ = self.train()
+        vectorizer_path = os.path.join(self.directory.name, 'vectorizer.pkl')
+        model_path = os.path.join(self.directory.name, 'model.pkl')
+        detector.save_model(vectorizer_path, model_path)
+
+        loaded = FakeNewsDetector()
+        loaded.load_model(vectorizer_path, model_path)
+        self.assertEqual(loaded.model_version, detector.model_version)
+        self.assertEqual(loaded.predict(self.texts[1]), detector.predict(self.texts[1]))
+
+    def test_held_out_split_is_deterministic(self):
+        """Test that the evaluation split depends only on the text"""
+        held_out = [is_held_out(text, 0.2) for text in self.texts]
+        self.assertEqual(held_out, [is_held_out(text, 0.2) for text in self.texts])
+        self.assertTrue(any(held_out))
+        self.assertFalse(all(held_out))
+
+
+if __name__ == '__main__':
+    unittest.main()
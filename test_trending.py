@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+from test_helpers import FakeClock
+from trending import TrendingRefresher, TrendingStore
+
+
+def story(title):
+    return {'title': title, 'description': '', 'url': '#', 'source': 'Test', 'published_at': ''}
+
+
+def verdict(is_fake, model_version='v1'):
+    return {'is_fake': is_fake, 'confidence': 0.9, 'probability_fake': 0.9 if is_fake else 0.1,
+            'probability_real': 0.1 if is_fake else 0.9, 'model_version': model_version}
+
+
+class TestTrendingStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = TrendingStore(max_items=3, max_age=60, clock=self.clock)
+        self.store.update([story("Election results certified in swing state"),
+                           story("Swing state election recount begins")],
+                          [verdict(False), verdict(True)])
+
+    def test_search_by_title_tokens(self):
+        """Test that every query token must appear in the title, in rank order"""
+        results = self.store.search("election swing", 'v1')
+        self.assertEqual([item['title'] for item, _ in results],
+                         ["Election results certified in swing state", "Swing state election recount begins"])
+        self.assertEqual(results[1][1]['is_fake'], True)
+        self.assertEqual(len(self.store.search("recount", 'v1')), 1)
+        self.assertEqual(self.store.search("election aliens", 'v1'), [])
+        self.assertEqual(self.store.search("!!!", 'v1'), [])
+        self.assertEqual(len(self.store.search("election", 'v1', limit=1)), 1)
+
+        stats = self.store.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 2))
+
+    def test_staleness_model_version_and_eviction(self):
+        """Test that stale, other-model and evicted stories are not served"""
+        self.assertEqual(self.store.search("election", 'v2'), [])
+        self.assertIsNotNone(self.store.lookup("election results certified in  swing state", 'v1'))
+
+        self.clock.now = 61
+        self.assertEqual(self.store.search("election", 'v1'), [])
+        self.assertIsNone(self.store.lookup("Swing state election recount begins", 'v1'))
+
+        self.store.update([story("Markets rally"), story("Swing state election recount begins")],
+                          [verdict(False), verdict(True)])
+        self.store.update([story("Rates unchanged")], [verdict(False)], searchable=False)
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.stats()['evictions'], 1)
+        self.assertEqual([item['title'] for item, _ in self.store.search("election", 'v1')],
+                         ["Swing state election recount begins"])
+        self.assertEqual(self.store.search("rates", 'v1'), [])
+        self.assertIsNotNone(self.store.lookup("Rates unchanged", 'v1'))
+
+
+class TestTrendingRefresher(unittest.TestCase):
+    def test_refresh_scores_trending_and_fallback_items(self):
+        """Test that one refresh scores trending and fallback stories in one batch"""
+        store = TrendingStore()
+        batches = []
+
+        def score(items):
+            batches.append([item['title'] for item in items])
+            return [verdict('fake' in item['title']) for item in items]
+
+        refresher = TrendingRefresher(
+            lambda: [story("Real story"), story("real  STORY"), story("Sample fake story")],
+            score, store, fallback_items=[story("Sample fake story"), story("Sample only story")]
+        )
+        self.assertEqual(refresher.refresh(), 2)
+        self.assertEqual(batches, [["Real story", "Sample fake story", "Sample only story"]])
+        self.assertEqual(len(store.search("story")), 2)
+        self.assertTrue(store.lookup("Sample only story")['is_fake'] is False)
+
+        refresher.fetch = lambda: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            refresher.refresh()
+        stats = refresher.stats()
+        self.assertEqual((stats['refreshes'], stats['refresh_errors']), (1, 1))
+        self.assertEqual(len(store), 3)
+
+    def test_background_refresh(self):
+        """Test that the background thread refreshes immediately and stops cleanly"""
+        refreshed = threading.Event()
+
+        def fetch():
+            refreshed.set()
+            return [story("Background story")]
+
+        refresher = TrendingRefresher(fetch, lambda items: [verdict(False)] * len(items),
+                                      TrendingStore(), interval=60)
+        refresher.start()
+        self.assertTrue(refreshed.wait(5))
+        refresher.stop()
+        self.assertEqual(refresher.refreshes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""Background precomputation of verdicts for trending news stories.
+
+`TrendingRefresher` periodically fetches the current top stories from the
+configured sources, scores them in one batch and hands them to a
+`TrendingStore`. The store indexes stories by the tokens of their titles, so
+a search for a trending topic is answered by intersecting a few posting sets
+instead of calling upstream and the model. Stories not seen in a refresh for
+`max_age` seconds, or scored by another model version, are never served.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prediction_cache import CacheStats
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def title_key(title: str) -> str:
+    return ' '.join(title.lower().split())
+
+
+class TrendingStore(CacheStats):
+    """Bounded, thread-safe store of scored stories, searchable by title tokens"""
+
+    def __init__(self, max_items: int = 1000, max_age: float = 900,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_items <= 0:
+            raise ValueError("max_items must be positive")
+
+        self.max_items = max_items
+        self.max_age = max_age
+        self._clock = clock
+        # title key -> (item, prediction, refreshed_at, (refresh number, rank))
+        self._entries = OrderedDict()
+        self._postings = {}
+        self._refreshes = 0
+        self._lock = threading.Lock()
+        # Searches count as hits or misses
+        self._init_stats()
+
+    def update(self, items: List[Dict[str, str]], predictions: List[Dict[str, any]], searchable: bool = True):
+        """Insert or refresh scored stories; least recently refreshed ones are evicted.
+
+        Stories that are not searchable are only returned by lookup().
+        """
+        now = self._clock()
+        with self._lock:
+            self._refreshes += 1
+            for rank, (item, prediction) in enumerate(zip(items, predictions)):
+                key = title_key(item['title'])
+                if not key:
+                    continue
+                if key in self._entries:
+                    self._remove(key)
+                self._entries[key] = (item, prediction, now, (-self._refreshes, rank))
+                if searchable:
+                    for token in set(TOKEN_PATTERN.findall(key)):
+                        self._postings.setdefault(token, set()).add(key)
+            while len(self._entries) > self.max_items:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        self._entries.pop(key)
+        for token in set(TOKEN_PATTERN.findall(key)):
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[token]
+
+    def _is_current(self, entry, model_version: Optional[str], now: float) -> bool:
+        return now - entry[2] <= self.max_age and (model_version is None or
+                                                   entry[1].get('model_version') == model_version)
+
+    def search(self, query: str, model_version: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Tuple[Dict[str, str], Dict[str, any]]]:
+        """Return fresh (item, prediction) pairs whose titles contain every query token"""
+        tokens = set(TOKEN_PATTERN.findall(query.lower()))
+        now = self._clock()
+        with self._lock:
+            postings = [self._postings.get(token, set()) for token in tokens]
+            keys = set.intersection(*sorted(postings, key=len)) if postings else set()
+            entries = sorted(
+                (entry for entry in map(self._entries.get, keys) if self._is_current(entry, model_version, now)),
+                key=lambda entry: entry[3]
+            )
+            if entries:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return [(dict(item), dict(prediction)) for item, prediction, _, _ in entries[:limit]]
+
+    def lookup(self, title: str, model_version: Optional[str] = None) -> Optional[Dict[str, any]]:
+        """Return the precomputed prediction for a story title, if fresh"""
+        with self._lock:
+            entry = self._entries.get(title_key(title))
+            if entry is None or not self._is_current(entry, model_version, self._clock()):
+                return None
+            return dict(entry[1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self.max_items
+
+
+def _unique_titles(items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Drop items with blank or repeated titles, keeping the first of each"""
+    unique = {}
+    for item in items:
+        key = title_key(item['title'])
+        if key and key not in unique:
+            unique[key] = item
+    return list(unique.values())
+
+
+class TrendingRefresher:
+    """Fetch and score trending stories into a TrendingStore every `interval` seconds.
+
+    `fallback_items` (such as the static sample news) are scored in the same
+    batch but stored for lookup() only, so they never shadow upstream search.
+    """
+
+    def __init__(self, fetch: Callable[[], List[Dict[str, str]]],
+                 score: Callable[[List[Dict[str, str]]], List[Dict[str, any]]],
+                 store: TrendingStore, interval: float = 300,
+                 fallback_items: List[Dict[str, str]] = ()):
+        self.fetch = fetch
+        self.score = score
+        self.store = store
+        self.interval = interval
+        self.fallback_items = list(fallback_items)
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error = None
+        self.last_refresh = None
+
+    def refresh(self) -> int:
+        """Fetch and score one round of stories; returns how many were stored"""
+        try:
+            items = _unique_titles(self.fetch())
+            trending_keys = {title_key(item['title']) for item in items}
+            fallback = [item for item in _unique_titles(self.fallback_items)
+                        if title_key(item['title']) not in trending_keys]
+            predictions = self.score(items + fallback) if items or fallback else []
+        except Exception as e:
+            self.refresh_errors += 1
+            self.last_error = str(e)
+            raise
+        self.store.update(items, predictions[:len(items)])
+        self.store.update(fallback, predictions[len(items):], searchable=False)
+        self.refreshes += 1
+        self.last_error = None
+        self.last_refresh = time.time()
+        return len(items)
+
+    def start(self):
+        """Refresh now and then every `interval` seconds on a background thread"""
+        if self._thread is not None or not self.interval:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='trending-refresh', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: Trending refresh failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, any]:
+        """Return refresh counters and the store's occupancy"""
+        return {
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+            'last_error': self.last_error,
+            'last_refresh': self.last_refresh,
+            'interval': self.interval,
+            'store': self.store.stats(),
+        }